@@ -0,0 +1,88 @@
+"""
+Benchmark: chart figure payload size and build time, with and without tail folding.
+
+For each country cardinality the synthetic dataset is aggregated once, then
+every chart figure is built from the full aggregates and from aggregates
+folded with the configured top-N / minimum-share policy (see the *_TOP_N and
+*_MIN_SHARE settings). Reports the serialized figure size and the time to
+fold, build and serialize each figure.
+
+Usage:
+    python benchmarks/bench_chart_payload.py [--rows 100000] [--countries 50,200,1000]
+                                             [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import plotly.io as pio
+
+from src.services.aggregation import TailPolicy, fold_tail, plan_chart_aggregates
+from src.services.countries import CountryIndex
+from src.services.normalize import normalize_vaccine_data
+from src.services.synthetic import SyntheticSpec, generate_vaccine_data
+from src.ui.components import (
+    _CHART_TAILS, _build_bar_figure, _build_donut_figure, _build_map_figure, _build_sunburst_figure, _get_chart_config,
+)
+
+CHARTS = {
+    "donut": (_build_donut_figure, "by_stage"),
+    "bar": (_build_bar_figure, "by_stage"),
+    "map": (_build_map_figure, "by_country"),
+    "sunburst": (_build_sunburst_figure, "by_country_stage"),
+}
+
+
+def _measure(data, column: str, policy: TailPolicy, build, config: dict, repeat: int):
+    """Return (payload bytes, median ms) of folding, building and serializing a figure."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = pio.to_json(build(fold_tail(data, column, policy), config), validate=False)
+        timings.append((time.perf_counter() - started) * 1000)
+    return len(payload.encode("utf-8")), statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--countries", default="50,200,1000", help="Comma-separated country cardinalities")
+    parser.add_argument("--approaches", type=int, default=8)
+    parser.add_argument("--stages", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    config = _get_chart_config("Dark")
+    print(f"{'countries':>9}  {'chart':<10}{'policy':<18}{'bytes':>10}{'ms':>9}{'folded bytes':>14}{'folded ms':>11}")
+    for countries in (int(count) for count in args.countries.split(",")):
+        spec = SyntheticSpec(
+            rows=args.rows, countries=countries, approaches=args.approaches, stages=args.stages, skew=1.0,
+        )
+        df, _ = normalize_vaccine_data(generate_vaccine_data(spec))
+        aggregates = plan_chart_aggregates(df)
+        codes = CountryIndex.from_frame(df).codes
+
+        for chart, (build, field) in CHARTS.items():
+            column, policy = _CHART_TAILS[chart]
+            data = getattr(aggregates, field)
+            if chart == "map":
+                build = lambda shown, config, data=data: _build_map_figure(
+                    shown, config, codes, tail_folded=shown is not data,
+                )
+            full_bytes, full_ms = _measure(data, column, TailPolicy(), build, config, args.repeat)
+            folded_bytes, folded_ms = _measure(data, column, policy, build, config, args.repeat)
+            label = f"top {policy.top_n}" if policy.top_n else "all"
+            if policy.min_share:
+                label += f", >= {policy.min_share:.1%}"
+            print(
+                f"{countries:>9}  {chart:<10}{label:<18}{full_bytes:>10}{full_ms:>9.1f}"
+                f"{folded_bytes:>14}{folded_ms:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
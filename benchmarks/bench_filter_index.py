@@ -0,0 +1,78 @@
+"""
+Benchmark: bitmap index vs. pandas isin masks for the sidebar filters.
+
+Usage:
+    python benchmarks/bench_filter_index.py [--rows 1000000] [--repeat 20] [--countries 200] [--skew 0]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services.aggregation import filter_frame
+from src.services.filter_index import BitmapIndex
+from src.services.normalize import normalize_vaccine_data
+from src.services.synthetic import SyntheticSpec, generate_vaccine_data
+
+
+def _synthetic_frame(rows: int, countries: int, skew: float, seed: int = 0) -> pd.DataFrame:
+    """Build a normalized synthetic frame with 10 approaches and 7 stages."""
+    spec = SyntheticSpec(rows=rows, countries=countries, approaches=10, stages=7, skew=skew, seed=seed)
+    return normalize_vaccine_data(generate_vaccine_data(spec))[0]
+
+
+def _random_filters(df: pd.DataFrame, rng: np.random.Generator) -> dict:
+    """Select a random half of the values in every dimension."""
+    filters = {}
+    for column in ("Country", "Approach", "Stage"):
+        options = list(df[column].cat.categories)
+        filters[column] = list(rng.choice(options, size=max(1, len(options) // 2), replace=False))
+    return filters
+
+
+def _time(fn, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--countries", type=int, default=200)
+    parser.add_argument("--skew", type=float, default=0.0, help="Zipf exponent of value frequencies")
+    args = parser.parse_args()
+
+    df = _synthetic_frame(args.rows, args.countries, args.skew)
+    rng = np.random.default_rng(1)
+    filters = _random_filters(df, rng)
+
+    started = time.perf_counter()
+    index = BitmapIndex(df)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    expected = filter_frame(df, filters)
+    assert expected.index.equals(index.apply(df, filters).index), "bitmap index disagrees with isin"
+
+    isin_ms = _time(lambda: filter_frame(df, filters), args.repeat)
+    mask_ms = _time(lambda: index.mask(filters), args.repeat)
+    apply_ms = _time(lambda: index.apply(df, filters), args.repeat)
+
+    print(f"rows={args.rows:,} matched={len(expected):,} index build={build_ms:.1f} ms")
+    print(f"{'path':<22}{'median ms':>12}{'min ms':>10}")
+    for name, timings in (("isin masks", isin_ms), ("bitmap mask", mask_ms), ("bitmap mask + take", apply_ms)):
+        print(f"{name:<22}{statistics.median(timings):>12.2f}{min(timings):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
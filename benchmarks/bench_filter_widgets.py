@@ -0,0 +1,88 @@
+"""
+Benchmark: size and speed of the sidebar filters at high cardinality.
+
+Serves synthetic data with many distinct countries and approaches, turns off
+Select All in every filter group so all controls are shown, then reports the
+number of filter widgets, their serialized size, the filter keys held in
+session state, and the time of value edits and of full reruns, driven
+headlessly with Streamlit's AppTest harness.
+
+Usage:
+    python benchmarks/bench_filter_widgets.py [--rows 1000000] [--countries 200]
+                                              [--approaches 50] [--repeat 10]
+"""
+import argparse
+import os
+import pickle
+import statistics
+import time
+from typing import Callable, List
+
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "main.py"))
+FILTER_COLUMNS = ["Country", "Approach", "Stage"]
+
+
+def _time(action: Callable[[], AppTest], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        at = action()
+        timings.append((time.perf_counter() - started) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--countries", type=int, default=200)
+    parser.add_argument("--approaches", type=int, default=50)
+    parser.add_argument("--stages", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    # Read by src/config.py when the app is first run below
+    os.environ.update(
+        MOCK_ROWS=str(args.rows),
+        MOCK_COUNTRIES=str(args.countries),
+        MOCK_APPROACHES=str(args.approaches),
+        MOCK_STAGES=str(args.stages),
+    )
+
+    at = AppTest.from_file(APP_PATH, default_timeout=300).run()
+    for column in FILTER_COLUMNS:
+        at.checkbox(key=f"toggle_all_{column}").uncheck().run()
+
+    widgets = list(at.sidebar.checkbox) + list(at.sidebar.multiselect)
+    widget_bytes = sum(len(widget.proto.SerializeToString()) for widget in widgets)
+    filter_keys = [key for key in at.session_state if key.startswith(("toggle_all_", "filter_", "chk_"))]
+    state_bytes = len(pickle.dumps({key: at.session_state[key] for key in filter_keys}))
+
+    countries = at.multiselect(key="filter_Country")
+    options = countries.options[:args.repeat]
+    state = {"position": 0}
+
+    def edit_countries() -> AppTest:
+        # Add the first `repeat` countries one by one, as a viewer would
+        option = options[state["position"] % len(options)]
+        state["position"] += 1
+        return at.multiselect(key="filter_Country").select(option).run()
+
+    edit_ms = _time(edit_countries, args.repeat)
+    full_ms = _time(at.run, args.repeat)
+
+    print(f"{args.rows} rows, {args.countries} countries, {args.approaches} approaches, {args.stages} stages")
+    print(f"filter widgets:        {len(widgets)} ({widget_bytes} bytes serialized)")
+    print(f"filter state keys:     {len(filter_keys)} ({state_bytes} bytes pickled)")
+    print()
+    print(f"{'interaction':<24}{'median ms':>12}{'p95 ms':>10}")
+    for name, timings in (("value edit", edit_ms), ("full rerun", full_ms)):
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        print(f"{name:<24}{statistics.median(timings):>12.2f}{p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
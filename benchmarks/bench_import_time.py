@@ -0,0 +1,97 @@
+"""
+Benchmark: cold-start import time of src/main.py.
+
+Runs ``python -X importtime -c "import src.main"`` in fresh interpreters,
+summarizes the cost per top-level package, and checks the result against
+benchmarks/baselines/import_time_budget.json: the median total must stay
+under budget and heavy optional modules must not load at startup.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5] [--write-report] [--check]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BUDGET_PATH = os.path.join(ROOT, "benchmarks", "baselines", "import_time_budget.json")
+REPORT_PATH = os.path.join(ROOT, "benchmarks", "baselines", "import_time_report.txt")
+
+
+def _measure() -> Tuple[float, Dict[str, float], List[str]]:
+    """
+    Import src.main once in a fresh interpreter.
+
+    Returns:
+        Tuple of (total ms, self ms per top-level package, imported modules).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    per_package: Dict[str, float] = defaultdict(float)
+    modules: List[str] = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        modules.append(module)
+        per_package[module.split(".")[0]] += int(self_us) / 1000
+        if module == "src.main":
+            total_us = int(cumulative_us)
+    return total_us / 1000, dict(per_package), modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--write-report", action="store_true", help="Update the checked-in report")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero when over budget")
+    args = parser.parse_args()
+
+    with open(BUDGET_PATH, encoding="utf-8") as f:
+        budget = json.load(f)
+
+    totals: List[float] = []
+    packages: Dict[str, List[float]] = defaultdict(list)
+    imported = set()
+    for _ in range(args.runs):
+        total, per_package, modules = _measure()
+        totals.append(total)
+        for package, ms in per_package.items():
+            packages[package].append(ms)
+        imported.update(modules)
+
+    median_total = statistics.median(totals)
+    ranked = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    forbidden = sorted(module for module in budget["forbidden_modules"] if module in imported)
+
+    lines = [
+        f"import src.main: median {median_total:.0f} ms over {args.runs} runs "
+        f"(budget {budget['max_total_ms']} ms)",
+        "",
+        f"{'package':<24}{'self ms (median)':>18}",
+    ]
+    lines += [f"{package:<24}{statistics.median(ms):>18.1f}" for package, ms in ranked[:args.top]]
+    lines += ["", "forbidden modules loaded at startup: " + (", ".join(forbidden) or "none")]
+    report = "\n".join(lines)
+    print(report)
+
+    if args.write_report:
+        with open(REPORT_PATH, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+
+    if args.check and (median_total > budget["max_total_ms"] or forbidden):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
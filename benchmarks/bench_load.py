@@ -0,0 +1,348 @@
+"""
+Benchmark: rerun latency, throughput and memory of one server under concurrent sessions.
+
+For every session count a fresh `streamlit run src/main.py` server is started
+and N simulated browser sessions connect to it over Streamlit's websocket
+protocol. Each session loads the page, then repeatedly waits a random think
+time and makes one sidebar edit, like a viewer would: toggling a filter
+group's Select All, adding or removing one value, or switching the theme.
+Widget reruns are scoped to their fragment exactly as the browser scopes them.
+With FILTER_MODE=BATCHED a session instead changes a few values of one group,
+which stay in the browser, and submits them with Apply or a preset button.
+
+Latency is measured from sending a rerun to the session going idle again,
+including the fragment reruns requested by widget callbacks. Peak RSS of the
+server is read from /proc, so this runs on Linux only.
+
+The server inherits the environment, so the data source is configured as for
+the app itself, e.g. MOCK_ROWS=1000000 or DATA_SOURCE=POSTGRES with the DB_*
+settings. Sessions share the process-wide dataset cache, so the database only
+sees cache reloads; set a short UPDATE_INTERVAL_SECONDS to load it with those.
+
+Usage:
+    python benchmarks/bench_load.py [--sessions 1,10,50] [--interactions 20]
+                                    [--think-time 1.0] [--slo-p95-ms 500]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_PATH = os.path.join(ROOT, "src", "main.py")
+
+# Widget element type -> WidgetState field holding its value
+STATEFUL_WIDGETS = {
+    "checkbox": "bool_value",
+    "radio": "int_value",
+    "multiselect": "string_array_value",
+    "button": "trigger_value",
+}
+RERUN_TIMEOUT_SECONDS = 120
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    """Start the dashboard headlessly and wait until it answers health checks."""
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.enableXsrfProtection", "false",
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Streamlit server exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Streamlit server did not become healthy within 60 s")
+
+
+def _server_memory_mb(pid: int, field: str) -> float:
+    """Read VmRSS or VmHWM of a process from /proc."""
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError(f"{field} not found in /proc/{pid}/status")
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else float("nan")
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+class Session:
+    """One simulated browser tab, tracking the widgets on its page."""
+
+    def __init__(self, websocket, rng: random.Random):
+        self._websocket = websocket
+        self._rng = rng
+        # widget id -> (element type, fragment id), and the values this tab has set
+        self._widgets: Dict[str, Tuple[str, str]] = {}
+        self._values: Dict[str, object] = {}
+        self._options: Dict[str, List[str]] = {}
+        # Buttons clicked for the next rerun only
+        self._triggers: Dict[str, bool] = {}
+        self.edits = 0
+        self.errors = 0
+
+    async def rerun(self, fragment_id: str = "") -> float:
+        """
+        Send a rerun with the current widget values and wait until it settles.
+
+        Args:
+            fragment_id: Fragment to rerun, or "" for a full app rerun.
+
+        Returns:
+            Seconds until the session went idle after its last script run.
+        """
+        message = BackMsg()
+        message.rerun_script.fragment_id = fragment_id
+        values = {**self._values, **self._triggers}
+        self._triggers = {}
+        for widget_id, (kind, _) in self._widgets.items():
+            if widget_id in values:
+                state = message.rerun_script.widget_states.widgets.add()
+                state.id = widget_id
+                if kind == "multiselect":
+                    state.string_array_value.data[:] = values[widget_id]
+                else:
+                    setattr(state, STATEFUL_WIDGETS[kind], values[widget_id])
+
+        started = time.perf_counter()
+        await self._websocket.send(message.SerializeToString())
+        seen: Dict[str, Tuple[str, str]] = {}
+        rendered: Dict[str, object] = {}
+        rerun_fragments = set()
+        finished = False
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(await asyncio.wait_for(self._websocket.recv(), RERUN_TIMEOUT_SECONDS))
+            kind = reply.WhichOneof("type")
+            if kind == "delta":
+                rerun_fragments.add(reply.delta.fragment_id)
+                if reply.delta.WhichOneof("type") == "new_element":
+                    element_type = reply.delta.new_element.WhichOneof("type")
+                    if element_type == "exception":
+                        self.errors += 1
+                    elif element_type in STATEFUL_WIDGETS:
+                        widget = getattr(reply.delta.new_element, element_type)
+                        seen[widget.id] = (element_type, reply.delta.fragment_id)
+                        # Values set from session state replace what the tab holds
+                        if element_type == "checkbox" and (widget.set_value or widget.id not in self._values):
+                            rendered[widget.id] = widget.value if widget.set_value else widget.default
+                        elif element_type == "multiselect":
+                            self._options[widget.id] = list(widget.options)
+                            if widget.set_value or widget.id not in self._values:
+                                rendered[widget.id] = (
+                                    list(widget.raw_values) if widget.set_value
+                                    else [widget.options[i] for i in widget.default]
+                                )
+            elif kind == "script_finished":
+                if reply.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors += 1
+                # A run stopped by a callback's st.rerun is followed by the scoped rerun
+                finished = reply.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN
+            elif kind == "session_status_changed" and finished and not reply.session_status_changed.script_is_running:
+                break
+        elapsed = time.perf_counter() - started
+
+        # Widgets of the fragments that reran are replaced by what they rendered
+        if not fragment_id and "" in rerun_fragments:
+            self._widgets = seen
+        else:
+            self._widgets = {
+                widget_id: widget for widget_id, widget in self._widgets.items() if widget[1] not in rerun_fragments
+            }
+            self._widgets.update(seen)
+        self._values = {widget_id: value for widget_id, value in self._values.items() if widget_id in self._widgets}
+        self._values.update(rendered)
+        return elapsed
+
+    def _widget_keys(self) -> Dict[str, str]:
+        # Keyed widget ids look like "$$ID-<hash>-<key>"
+        return {widget_id.split("-", 2)[-1]: widget_id for widget_id in self._widgets}
+
+    def _change_values(self, widget_id: str, count: int) -> None:
+        """Add or remove random values of a multiselect."""
+        selected = list(self._values[widget_id])
+        options = self._options[widget_id]
+        for option in self._rng.sample(options, min(count, len(options))):
+            if option in selected:
+                selected.remove(option)
+            else:
+                selected.append(option)
+        self._values[widget_id] = selected
+
+    async def interact(self) -> float:
+        """Make one random sidebar edit and return its rerun latency in seconds."""
+        keys = self._widget_keys()
+        selections = [key for key in keys if key.startswith("filter_")]
+        toggles = [key for key in keys if key.startswith("toggle_all_")]
+        presets = [key for key in keys if key.split("_", 1)[0] in ("all", "none", "invert")]
+        roll = self._rng.random()
+        if "apply_filters" in keys and roll < 0.85:
+            # Batched filters: staged edits cost no rerun until the form is submitted
+            column_name = self._rng.choice(selections)[len("filter_"):]
+            count = self._rng.randint(1, 4)
+            self._values[keys[f"toggle_all_{column_name}"]] = False
+            self._change_values(keys[f"filter_{column_name}"], count)
+            self.edits += count
+            widget_id = keys["apply_filters" if roll < 0.7 else self._rng.choice(presets)]
+            self._triggers[widget_id] = True
+            return await self.rerun(self._widgets[widget_id][1])
+
+        if selections and roll < 0.5:
+            widget_id = keys[self._rng.choice(selections)]
+            self._change_values(widget_id, 1)
+        elif toggles and roll < 0.85:
+            widget_id = keys[self._rng.choice(toggles)]
+            self._values[widget_id] = not self._values[widget_id]
+        else:
+            widget_id = keys["theme"]
+            self._values[widget_id] = 1 - self._values.get(widget_id, 0)
+        self.edits += 1
+        return await self.rerun(self._widgets[widget_id][1])
+
+
+async def _simulate(
+    url: str,
+    seed: int,
+    interactions: int,
+    think_time: float,
+    page_loads: List[float],
+    latencies: List[float],
+) -> Tuple[int, int]:
+    """Run one session to completion and return its edit and error counts."""
+    rng = random.Random(seed)
+    await asyncio.sleep(rng.uniform(0, think_time))
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as websocket:
+        session = Session(websocket, rng)
+        page_loads.append(await session.rerun())
+        for _ in range(interactions):
+            await asyncio.sleep(rng.expovariate(1 / think_time) if think_time else 0)
+            latencies.append(await session.interact())
+        return session.edits, session.errors
+
+
+async def _run_sessions(url: str, sessions: int, interactions: int, think_time: float, seed: int) -> Dict:
+    page_loads: List[float] = []
+    latencies: List[float] = []
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(_simulate(url, seed + i, interactions, think_time, page_loads, latencies) for i in range(sessions)),
+        return_exceptions=True,
+    )
+    wall = time.perf_counter() - started
+    failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    if failures:
+        print(f"  {len(failures)} session(s) failed, first: {failures[0]!r}", file=sys.stderr)
+    completed = [outcome for outcome in outcomes if not isinstance(outcome, BaseException)]
+    return {
+        "page_loads": page_loads,
+        "latencies": latencies,
+        "wall": wall,
+        "edits": sum(edits for edits, _ in completed),
+        "errors": sum(errors for _, errors in completed) + len(failures),
+    }
+
+
+def _run_level(port: int, sessions: int, interactions: int, think_time: float, seed: int) -> Dict[str, float]:
+    """Measure one session count against a fresh server."""
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    server = _start_server(port)
+    try:
+        # One page load first, so the dataset load is not counted against the sessions
+        asyncio.run(_run_sessions(url, 1, 0, 0, seed=-1))
+        idle_rss = _server_memory_mb(server.pid, "VmRSS")
+        run = asyncio.run(_run_sessions(url, sessions, interactions, think_time, seed))
+        peak_rss = _server_memory_mb(server.pid, "VmHWM")
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = [seconds * 1000 for seconds in run["latencies"]]
+    return {
+        "sessions": sessions,
+        "edits": run["edits"],
+        "reruns": len(latencies),
+        "throughput": len(latencies) / run["wall"],
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "page_load_p95_ms": _percentile([seconds * 1000 for seconds in run["page_loads"]], 95),
+        "errors": run["errors"],
+        "idle_rss_mb": idle_rss,
+        "peak_rss_mb": peak_rss,
+        "rss_per_session_mb": (peak_rss - idle_rss) / sessions,
+    }
+
+
+def _slo_violations(result: Dict[str, float], slo_p95_ms: Optional[float], slo_p99_ms: Optional[float]) -> List[str]:
+    found = []
+    if result["errors"]:
+        found.append(f"{result['errors']} errors")
+    if slo_p95_ms is not None and result["p95_ms"] > slo_p95_ms:
+        found.append(f"p95 {result['p95_ms']:.0f} > {slo_p95_ms:.0f} ms")
+    if slo_p99_ms is not None and result["p99_ms"] > slo_p99_ms:
+        found.append(f"p99 {result['p99_ms']:.0f} > {slo_p99_ms:.0f} ms")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", default="1,10,50", help="Comma-separated concurrent session counts")
+    parser.add_argument("--interactions", type=int, default=20, help="Sidebar edits per session")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds between edits (0 for none)")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--slo-p95-ms", type=float, help="Exit non-zero when p95 rerun latency exceeds this")
+    parser.add_argument("--slo-p99-ms", type=float, help="Exit non-zero when p99 rerun latency exceeds this")
+    args = parser.parse_args()
+
+    print(
+        f"{'sessions':>8}{'edits':>7}{'reruns':>8}{'reruns/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'load p95':>10}{'errors':>8}{'RSS MB':>8}{'MB/sess':>9}"
+    )
+    violations = []
+    for sessions in (int(count) for count in args.sessions.split(",")):
+        result = _run_level(args.port, sessions, args.interactions, args.think_time, args.seed)
+        print(
+            f"{sessions:>8}{result['edits']:>7}{result['reruns']:>8}{result['throughput']:>10.1f}{result['p50_ms']:>9.0f}"
+            f"{result['p95_ms']:>9.0f}{result['p99_ms']:>9.0f}{result['page_load_p95_ms']:>10.0f}"
+            f"{result['errors']:>8}{result['peak_rss_mb']:>8.0f}{result['rss_per_session_mb']:>9.2f}",
+            flush=True,
+        )
+        violations += [f"{sessions} sessions: {found}" for found in _slo_violations(result, args.slo_p95_ms, args.slo_p99_ms)]
+
+    if args.slo_p95_ms is not None or args.slo_p99_ms is not None:
+        print("\nSLO violations: %s" % ("\n  " + "\n  ".join(violations) if violations else "none"))
+        if violations:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
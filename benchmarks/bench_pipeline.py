@@ -0,0 +1,209 @@
+"""
+Benchmark: per-stage cost of the dashboard rerun pipeline across data sizes.
+
+For every size a fresh process serves MOCK_ROWS synthetic rows (0 means the
+built-in sample rows), times the provider load and the filter/aggregate step
+directly, then drives src/main.py headlessly with Streamlit's AppTest harness
+and times every render_* function and the style injection inside full
+reruns, with a warm and with an empty figure cache. Peak RSS is read from
+/proc, so this runs on Linux only.
+
+Results can be stored as a baseline and checked against it: a stage fails
+when its median exceeds the baseline by more than the threshold ratio and by
+more than a minimum number of milliseconds (to ignore noise on tiny stages).
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 0,10000,1000000] [--repeat 10]
+                                        [--write-baseline] [--check]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_PATH = os.path.join(ROOT, "src", "main.py")
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baselines", "pipeline_baseline.json")
+
+sys.path.append(ROOT)
+
+# Functions wrapped with timers while the app runs: module -> names
+TIMED_FUNCTIONS = {
+    "src.ui.components": ["render_donut_chart", "render_bar_chart", "render_map", "render_sunburst"],
+    "src.ui.styles": ["inject_styles", "inject_switchable_styles"],
+}
+
+
+def _peak_rss_mb() -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmHWM not found in /proc/self/status")
+
+
+def _summary(timings: List[float]) -> Dict[str, float]:
+    p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+    return {"median_ms": statistics.median(timings), "p95_ms": p95, "runs": len(timings)}
+
+
+def _timed(name: str, fn: Callable, timings: Dict[str, List[float]]) -> Callable:
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings[name].append((time.perf_counter() - started) * 1000)
+    return wrapper
+
+
+def _measure(action: Callable[[], object], name: str, repeat: int, timings: Dict[str, List[float]]) -> None:
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        timings[name].append((time.perf_counter() - started) * 1000)
+
+
+def _worker(repeat: int) -> None:
+    """Measure every stage in this process and print the results as JSON."""
+    import importlib
+
+    import numpy as np
+    from streamlit.testing.v1 import AppTest
+
+    from src.services.aggregation import plan_chart_aggregates
+    from src.services.dataset_cache import DatasetCache
+    from src.services.registry import create_provider
+
+    timings: Dict[str, List[float]] = defaultdict(list)
+
+    cache = DatasetCache(lambda: create_provider("MOCK"), ttl_seconds=3600)
+    _measure(cache.refresh, "provider load", repeat, timings)
+    snapshot = cache.get()
+
+    rng = np.random.default_rng(0)
+
+    def filter_and_aggregate() -> None:
+        filters = {
+            column: list(rng.choice(values, size=max(1, len(values) // 2), replace=False))
+            for column, values in ((dim, snapshot.cube.index.values(dim)) for dim in ("Country", "Approach", "Stage"))
+        }
+        plan_chart_aggregates(snapshot.cube.slice(filters))
+
+    _measure(filter_and_aggregate, "filter + aggregate", repeat, timings)
+
+    # Wrap the stage functions; main.py looks them up again on every rerun
+    stage_timings: Dict[str, List[float]] = defaultdict(list)
+    for module_name, names in TIMED_FUNCTIONS.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            setattr(module, name, _timed(name, getattr(module, name), stage_timings))
+
+    from src.ui.components import _figure_cache
+
+    at = AppTest.from_file(APP_PATH, default_timeout=600).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+    for label, before_run in (("warm", lambda: None), ("cold figures", _figure_cache.clear)):
+        stage_timings.clear()
+        for _ in range(repeat):
+            before_run()
+            started = time.perf_counter()
+            at.run()
+            timings[f"full rerun ({label})"].append((time.perf_counter() - started) * 1000)
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+        for name, values in stage_timings.items():
+            timings[f"{name} ({label})"] = list(values)
+
+    print(json.dumps({
+        "rows": len(snapshot.data),
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": {name: _summary(values) for name, values in timings.items()},
+    }))
+
+
+def _run_size(rows: int, repeat: int) -> dict:
+    env = dict(os.environ, MOCK_ROWS=str(rows), DATA_SOURCE="MOCK")
+    result = subprocess.run(
+        [sys.executable, __file__, "--worker", "--repeat", str(repeat)],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark worker for {rows} rows failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _regressions(results: Dict[str, dict], baseline: dict, threshold: float) -> List[str]:
+    """List the stages and sizes that got slower or bigger than the baseline allows."""
+    min_delta_ms = baseline.get("min_delta_ms", 0.0)
+    found = []
+    for size, result in results.items():
+        expected = baseline.get("sizes", {}).get(size)
+        if expected is None:
+            continue
+        for stage, summary in result["stages"].items():
+            before = expected["stages"].get(stage)
+            if before is None:
+                continue
+            now, then = summary["median_ms"], before["median_ms"]
+            if now > then * threshold and now - then > min_delta_ms:
+                found.append(f"{size} rows, {stage}: {then:.2f} -> {now:.2f} ms")
+        if result["peak_rss_mb"] > expected["peak_rss_mb"] * threshold:
+            found.append(f"{size} rows, peak RSS: {expected['peak_rss_mb']:.0f} -> {result['peak_rss_mb']:.0f} MB")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="0,10000,1000000", help="Comma-separated MOCK_ROWS values")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--threshold", type=float, help="Allowed slowdown ratio; defaults to the baseline's")
+    parser.add_argument("--write-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero on regressions against the baseline")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.repeat)
+        return
+
+    results = {size: _run_size(int(size), args.repeat) for size in args.sizes.split(",")}
+
+    for size, result in results.items():
+        print(f"\n{result['rows']} rows (MOCK_ROWS={size}), peak RSS {result['peak_rss_mb']:.0f} MB")
+        print(f"{'stage':<40}{'median ms':>12}{'p95 ms':>10}")
+        for stage, summary in result["stages"].items():
+            print(f"{stage:<40}{summary['median_ms']:>12.2f}{summary['p95_ms']:>10.2f}")
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+    threshold = args.threshold or baseline.get("threshold", 1.3)
+
+    if args.write_baseline:
+        baseline = {
+            "threshold": threshold,
+            "min_delta_ms": baseline.get("min_delta_ms", 10.0),
+            "sizes": {**baseline.get("sizes", {}), **results},
+        }
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+
+    if args.check:
+        regressions = _regressions(results, baseline, threshold)
+        print("\nregressions (threshold x%.2f): %s" % (threshold, "\n  " + "\n  ".join(regressions) if regressions else "none"))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
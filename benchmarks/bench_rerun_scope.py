@@ -0,0 +1,156 @@
+"""
+Benchmark: rerun latency of the dashboard before and after the fragment split.
+
+Drives src/main.py headlessly with Streamlit's AppTest harness and times a
+full-app rerun, a Country filter edit and a theme switch. The same
+interactions are timed on the pre-fragment app, checked out from
+`--baseline-ref` (the repository's first commit by default) into a temporary
+directory and run in its own interpreter, since both trees are the `src`
+package. In the pre-fragment app every interaction reruns the whole script;
+in the current one the filter edit and theme switch only rerun fragments.
+
+Usage:
+    python benchmarks/bench_rerun_scope.py [--repeat 20] [--baseline-ref <commit>]
+                                           [--no-baseline]
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_PATH = os.path.join(ROOT, "src", "main.py")
+INTERACTIONS = ["full-app rerun", "filter edit", "theme switch"]
+
+
+def _time(action: Callable[[], AppTest], repeat: int, between: Callable[[], object] = lambda: None) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        between()
+        started = time.perf_counter()
+        at = action()
+        timings.append((time.perf_counter() - started) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return timings
+
+
+def _measure_current(app_path: str, repeat: int) -> Dict[str, List[float]]:
+    """Time the interactions on the fragment-split app."""
+    at = AppTest.from_file(app_path, default_timeout=60).run()
+    # Warm the dataset, aggregate and figure caches
+    at.run()
+    full_ms = _time(at.run, repeat)
+
+    at.checkbox(key="toggle_all_Country").uncheck().run()
+    state = {"checked": False}
+
+    def toggle_country() -> AppTest:
+        state["checked"] = not state["checked"]
+        countries = at.multiselect(key="filter_Country")
+        return (countries.select("USA") if state["checked"] else countries.unselect("USA")).run()
+
+    filter_ms = _time(toggle_country, repeat)
+    # Switch themes with every country shown again
+    at.checkbox(key="toggle_all_Country").check().run()
+
+    themes = {"value": "Dark"}
+
+    def switch_theme() -> AppTest:
+        themes["value"] = "Light" if themes["value"] == "Dark" else "Dark"
+        return at.radio(key="theme").set_value(themes["value"]).run()
+
+    # The radio is outside the rerun fragments, so redraw it between switches
+    theme_ms = _time(switch_theme, repeat, between=at.run)
+    return dict(zip(INTERACTIONS, (full_ms, filter_ms, theme_ms)))
+
+
+def _measure_baseline(app_path: str, repeat: int) -> Dict[str, List[float]]:
+    """Time the interactions on the pre-fragment app, which has per-option checkboxes."""
+    at = AppTest.from_file(app_path, default_timeout=60).run()
+    at.run()
+    full_ms = _time(at.run, repeat)
+
+    at.checkbox(key="toggle_all_Country").uncheck().run()
+    state = {"checked": False}
+
+    def toggle_country() -> AppTest:
+        state["checked"] = not state["checked"]
+        return at.checkbox(key="chk_Country_USA").set_value(state["checked"]).run()
+
+    filter_ms = _time(toggle_country, repeat)
+    at.checkbox(key="toggle_all_Country").check().run()
+
+    themes = {"value": "Dark"}
+
+    def switch_theme() -> AppTest:
+        themes["value"] = "Light" if themes["value"] == "Dark" else "Dark"
+        return at.radio[0].set_value(themes["value"]).run()
+
+    theme_ms = _time(switch_theme, repeat)
+    return dict(zip(INTERACTIONS, (full_ms, filter_ms, theme_ms)))
+
+
+def _root_commit() -> str:
+    result = subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return result.stdout.split()[-1]
+
+
+def _run_baseline(ref: str, repeat: int) -> Dict[str, List[float]]:
+    """Check out `ref` into a temporary directory and time it in a fresh interpreter."""
+    archive = subprocess.run(["git", "archive", "--format=tar", ref], cwd=ROOT, capture_output=True, check=True)
+    with tempfile.TemporaryDirectory() as tree:
+        with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+            tar.extractall(tree)
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--repeat", str(repeat),
+             "--measure-baseline", os.path.join(tree, "src", "main.py")],
+            cwd=tree, capture_output=True, text=True, check=True,
+        )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def _summary(timings: List[float]) -> str:
+    p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+    return f"{statistics.median(timings):>10.2f}{p95:>10.2f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--baseline-ref", default="", help="Pre-fragment commit; defaults to the first commit")
+    parser.add_argument("--no-baseline", action="store_true", help="Only time the current app")
+    parser.add_argument("--measure-baseline", metavar="APP", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure_baseline:
+        # Child process: report the baseline timings as one JSON line
+        print(json.dumps(_measure_baseline(args.measure_baseline, args.repeat)))
+        return
+
+    baseline = None
+    if not args.no_baseline:
+        ref = args.baseline_ref or _root_commit()
+        print(f"baseline: {ref}")
+        baseline = _run_baseline(ref, args.repeat)
+    current = _measure_current(APP_PATH, args.repeat)
+
+    print(f"{'interaction':<18}{'before median':>14}{'p95':>10}{'after median':>14}{'p95':>10}")
+    for name in INTERACTIONS:
+        before = f"{_summary(baseline[name]):>24}" if baseline else f"{'-':>14}{'-':>10}"
+        print(f"{name:<18}{before}{_summary(current[name]):>24}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: peak memory of a full vs. chunked, streaming dataset load.
+
+Usage:
+    python benchmarks/bench_streaming_load.py [--rows 1000000] [--chunk-size 50000] [--url URL]
+
+Without --url a temporary SQLite database is seeded with synthetic rows; pass
+a postgresql+psycopg2:// URL to measure against a real vaccine_candidates
+table. Each load runs in a fresh process so peak RSS is not shared; /proc is
+used for the baseline, so this runs on Linux only.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import Config
+from src.services.postgres_data import COLUMN_MAP
+from src.services.synthetic import SyntheticSpec, generate_vaccine_data
+
+QUERY = (
+    'SELECT country AS "Country", approach AS "Approach", stage AS "Stage", '
+    'candidate_count AS "Candidates" FROM vaccine_candidates'
+)
+
+
+def _seed_sqlite(path: str, rows: int, seed: int = 0) -> str:
+    """Create a SQLite vaccine_candidates table with synthetic rows."""
+    from sqlalchemy import create_engine
+
+    spec = SyntheticSpec(rows=rows, countries=200, approaches=10, stages=7, skew=0.0, seed=seed)
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    generate_vaccine_data(spec).rename(columns=COLUMN_MAP).to_sql(
+        "vaccine_candidates", engine, index=False, chunksize=200_000,
+    )
+    engine.dispose()
+    return url
+
+
+def _rss_mb(field: str) -> float:
+    """Read VmRSS (current) or VmHWM (peak) of this process, in MB."""
+    # ru_maxrss would include the parent's peak, which survives exec on Linux
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError(f"{field} not found in /proc/self/status")
+
+
+def _worker(mode: str, url: str, chunk_size: int) -> None:
+    """Load the table once in this process and print the measurements as JSON."""
+    from sqlalchemy import create_engine, text
+
+    from src.services.normalize import normalize_vaccine_chunks, normalize_vaccine_data
+    from src.services.postgres_data import read_sql_chunks
+
+    engine = create_engine(url)
+    baseline = _rss_mb("VmRSS")
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        if mode == "full":
+            data, report = normalize_vaccine_data(pd.read_sql(text(QUERY), conn))
+        else:
+            data, report = normalize_vaccine_chunks(read_sql_chunks(conn, QUERY, chunk_size))
+    print(json.dumps({
+        "seconds": time.perf_counter() - started,
+        "rows": report.rows,
+        "baseline_rss_mb": baseline,
+        "peak_rss_mb": _rss_mb("VmHWM"),
+        "raw_mb": report.bytes_before / 2**20,
+        "compact_mb": report.bytes_after / 2**20,
+    }))
+
+
+def _run(mode: str, url: str, chunk_size: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", mode, "--url", url, "--chunk-size", str(chunk_size)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=Config.DB_FETCH_CHUNK_SIZE or 50_000)
+    parser.add_argument("--url", help="Database URL; defaults to a seeded temporary SQLite file")
+    parser.add_argument("--worker", choices=("full", "chunked"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker, args.url, args.chunk_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or _seed_sqlite(os.path.join(tmp, "vaccines.db"), args.rows)
+        results = {
+            "full": _run("full", url, args.chunk_size),
+            f"chunked ({args.chunk_size} rows)": _run("chunked", url, args.chunk_size),
+        }
+
+    first = next(iter(results.values()))
+    print(f"{first['rows']} rows: raw {first['raw_mb']:.1f} MB -> compact {first['compact_mb']:.1f} MB")
+    for name, result in results.items():
+        print(
+            f"{name:>24}: peak RSS {result['peak_rss_mb']:7.1f} MB "
+            f"(+{result['peak_rss_mb'] - result['baseline_rss_mb']:.1f} MB over baseline)   {result['seconds']:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: stylesheet bytes sent to the browser per rerun.
+
+Compares the raw generated stylesheets (what every rerun shipped before
+they were compiled) with the minified, process-cached ones, and counts the
+<style> payload emitted by src/main.py for each kind of interaction.
+
+Usage:
+    python benchmarks/bench_stylesheet_bytes.py
+"""
+import os
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ui.styles import THEMES
+from src.ui.styles.style_manager import (
+    _generate_stylesheet,
+    _generate_switchable_stylesheet,
+    compile_stylesheet,
+    compile_switchable_stylesheet,
+)
+
+APP_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "main.py"))
+
+
+def _style_bytes(at: AppTest) -> int:
+    """Sum the size of the <style> blocks emitted by the last run."""
+    return sum(
+        len(element.value.encode("utf-8"))
+        for element in at.markdown
+        if element.value.startswith("<style>")
+    )
+
+
+def main() -> None:
+    print(f"{'stylesheet':<22}{'raw bytes':>12}{'compiled bytes':>16}")
+    for theme in THEMES:
+        raw = len(f"<style>{_generate_stylesheet(theme)}</style>".encode("utf-8"))
+        print(f"{theme.name:<22}{raw:>12}{len(compile_stylesheet(theme).encode('utf-8')):>16}")
+    raw = len(f"<style>{_generate_switchable_stylesheet(THEMES)}</style>".encode("utf-8"))
+    compiled = len(compile_switchable_stylesheet(THEMES).encode("utf-8"))
+    print(f"{'switchable':<22}{raw:>12}{compiled:>16}")
+
+    at = AppTest.from_file(APP_PATH, default_timeout=60).run()
+    rows = [("full rerun", _style_bytes(at))]
+
+    at.checkbox(key="toggle_all_Country").uncheck().run()
+    rows.append(("filter edit", _style_bytes(at)))
+
+    at.run()
+    at.radio(key="theme").set_value("Light").run()
+    rows.append(("theme switch", _style_bytes(at)))
+
+    print()
+    print(f"{'interaction':<22}{'<style> bytes sent':>20}")
+    for name, sent in rows:
+        print(f"{name:<22}{sent:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,9 @@ Supports environment variable overrides for production deployment.
 import os
 from typing import Literal
 
-DataSourceType = Literal["MOCK", "POSTGRES"]
+DataSourceType = Literal["MOCK", "POSTGRES", "FILE"]
+ThemeModeType = Literal["CLIENT", "SERVER"]
+FilterModeType = Literal["INSTANT", "BATCHED"]
 
 
 class Config:
@@ -16,9 +18,29 @@ class Config:
     PAGE_ICON: str = "💉"
     LAYOUT: str = "wide"
     
-    # Data Source: MOCK or POSTGRES
+    # Theme switching: CLIENT swaps CSS custom properties in the browser,
+    # SERVER re-renders styles and charts for the selected theme
+    THEME_MODE: ThemeModeType = os.getenv("THEME_MODE", "CLIENT").upper()  # type: ignore
+    
+    # Filter edits: INSTANT reruns on every checkbox click, BATCHED stages
+    # edits until Apply or a preset (All / None / Invert) is clicked
+    FILTER_MODE: FilterModeType = os.getenv("FILTER_MODE", "INSTANT").upper()  # type: ignore
+    
+    # Data Source: MOCK, POSTGRES or FILE
     DATA_SOURCE: DataSourceType = os.getenv("DATA_SOURCE", "MOCK").upper()  # type: ignore
     
+    # Mock Data Source: MOCK_ROWS > 0 serves seeded synthetic data instead of the sample rows
+    MOCK_ROWS: int = int(os.getenv("MOCK_ROWS", "0"))
+    MOCK_COUNTRIES: int = int(os.getenv("MOCK_COUNTRIES", "50"))
+    MOCK_APPROACHES: int = int(os.getenv("MOCK_APPROACHES", "8"))
+    MOCK_STAGES: int = int(os.getenv("MOCK_STAGES", "6"))
+    MOCK_SKEW: float = float(os.getenv("MOCK_SKEW", "1.0"))  # Zipf exponent; 0 is uniform
+    MOCK_SEED: int = int(os.getenv("MOCK_SEED", "0"))
+    
+    # File Data Source: .parquet, .arrow/.feather or .csv, reloaded when it changes
+    DATA_FILE_PATH: str = os.getenv("DATA_FILE_PATH", "data/vaccine_candidates.parquet")
+    DATA_FILE_CHUNK_SIZE: int = int(os.getenv("DATA_FILE_CHUNK_SIZE", "65536"))
+    
     # PostgreSQL Configuration
     DB_HOST: str = os.getenv("DB_HOST", "localhost")
     DB_PORT: str = os.getenv("DB_PORT", "5432")
@@ -26,10 +48,67 @@ class Config:
     DB_USER: str = os.getenv("DB_USER", "postgres")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "postgres")
     
+    # PostgreSQL Connection Pool (one engine per process)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS: int = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_FETCH_CHUNK_SIZE: int = int(os.getenv("DB_FETCH_CHUNK_SIZE", "50000"))  # 0 fetches in one go
+    
+    # Incremental refresh: fetch only rows changed since the last load, keyed on
+    # vaccine_candidates.updated_at and the vaccine_candidates_deleted tombstones;
+    # changes are re-read this far back to catch transactions that commit late
+    DB_INCREMENTAL_REFRESH: bool = os.getenv("DB_INCREMENTAL_REFRESH", "false").lower() in ("1", "true", "yes")
+    DB_INCREMENTAL_LOOKBACK_SECONDS: int = int(os.getenv("DB_INCREMENTAL_LOOKBACK_SECONDS", "60"))
+    
     # Cache Settings
-    UPDATE_INTERVAL_SECONDS: int = 3600  # 1 hour
+    UPDATE_INTERVAL_SECONDS: int = int(os.getenv("UPDATE_INTERVAL_SECONDS", "3600"))  # 1 hour
+    FIGURE_CACHE_SIZE: int = int(os.getenv("FIGURE_CACHE_SIZE", "128"))  # Built charts kept in memory
+    
+    # Chart tails: each chart shows its TOP_N largest values (0 shows all) that
+    # hold at least MIN_SHARE of the total, and folds the rest into "Other"
+    DONUT_TOP_N: int = int(os.getenv("DONUT_TOP_N", "8"))
+    DONUT_MIN_SHARE: float = float(os.getenv("DONUT_MIN_SHARE", "0"))
+    BAR_TOP_N: int = int(os.getenv("BAR_TOP_N", "12"))
+    BAR_MIN_SHARE: float = float(os.getenv("BAR_MIN_SHARE", "0"))
+    MAP_TOP_N: int = int(os.getenv("MAP_TOP_N", "0"))
+    MAP_MIN_SHARE: float = float(os.getenv("MAP_MIN_SHARE", "0"))
+    SUNBURST_TOP_N: int = int(os.getenv("SUNBURST_TOP_N", "20"))  # Countries; each keeps its stages
+    SUNBURST_MIN_SHARE: float = float(os.getenv("SUNBURST_MIN_SHARE", "0"))
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "")  # Arrow copy of the dataset for warm starts; empty disables
+    
+    # Background Refresh: reload the dataset off the request path and keep
+    # serving the last good snapshot while a reload runs or fails
+    REFRESH_IN_BACKGROUND: bool = os.getenv("REFRESH_IN_BACKGROUND", "true").lower() in ("1", "true", "yes")
+    REFRESH_FAILURE_THRESHOLD: int = int(os.getenv("REFRESH_FAILURE_THRESHOLD", "3"))
+    REFRESH_RETRY_BASE_SECONDS: float = float(os.getenv("REFRESH_RETRY_BASE_SECONDS", "5"))
+    REFRESH_RETRY_MAX_SECONDS: float = float(os.getenv("REFRESH_RETRY_MAX_SECONDS", "600"))
+    
+    # Diagnostics: stage timings are logged as JSON lines by the src.perf logger
+    # at DEBUG, so they are only written with LOG_LEVEL=DEBUG; PERF_PANEL also
+    # shows them in a collapsed sidebar panel
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    PERF_PANEL: bool = os.getenv("PERF_PANEL", "false").lower() in ("1", "true", "yes")
     
     @classmethod
     def get_database_url(cls) -> str:
         """Get the PostgreSQL connection URL."""
-        return f"postgresql://{cls.DB_USER}:{cls.DB_PASSWORD}@{cls.DB_HOST}:{cls.DB_PORT}/{cls.DB_NAME}"
+        return f"postgresql+psycopg2://{cls.DB_USER}:{cls.DB_PASSWORD}@{cls.DB_HOST}:{cls.DB_PORT}/{cls.DB_NAME}"
+
+    @classmethod
+    def get_source_fingerprint(cls) -> str:
+        """Get the settings that decide which rows DATA_SOURCE serves, e.g. for tagging stored snapshots."""
+        if cls.DATA_SOURCE == "MOCK":
+            settings = [
+                cls.MOCK_ROWS, cls.MOCK_COUNTRIES, cls.MOCK_APPROACHES, cls.MOCK_STAGES, cls.MOCK_SKEW, cls.MOCK_SEED,
+            ]
+        elif cls.DATA_SOURCE == "POSTGRES":
+            # Incremental mode indexes rows by id, so it changes the stored layout too
+            settings = [cls.DB_HOST, cls.DB_PORT, cls.DB_NAME, cls.DB_USER, cls.DB_INCREMENTAL_REFRESH]
+        elif cls.DATA_SOURCE == "FILE":
+            settings = [os.path.abspath(cls.DATA_FILE_PATH)]
+        else:
+            settings = []
+        return "|".join(str(value) for value in [cls.DATA_SOURCE, *settings])
@@ -6,3 +6,12 @@ class VaccineCandidate:
     approach: str
     stage: str
     candidate_count: int
+
+
+# Dataset column holding each VaccineCandidate field
+FIELD_COLUMNS = {
+    "country": "Country",
+    "approach": "Approach",
+    "stage": "Stage",
+    "candidate_count": "Candidates",
+}
@@ -3,31 +3,266 @@ COVID-19 Vaccine Dashboard - Main Application
 
 A Streamlit dashboard for visualizing COVID-19 vaccine candidate data.
 Supports Dark and Light themes with PDF export functionality.
+
+The page is split into keyed fragments so that widget interactions only
+re-execute what depends on them: filter changes rerun the filter groups and
+the charts, and the page header and description column only run on a full
+app rerun. The dataset is reloaded by a background thread, so sessions are
+served the last good snapshot while a reload runs or fails. In CLIENT theme mode a theme change only swaps CSS custom
+properties in the browser; in SERVER mode it reruns the styles and charts.
 """
+import logging
 import streamlit as st
 import sys
 import os
+import time
+from typing import Dict, List, Optional, Tuple
 
 # Add the project root to sys.path for imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from src import perf
 from src.config import Config
-from src.services.mock_data import MockDataProvider
-from src.services.postgres_data import PostgresDataProvider
-from src.ui.sidebar import render_sidebar
-from src.ui.components import render_donut_chart, render_bar_chart, render_map, render_sunburst
-from src.ui.styles import get_theme, inject_styles
+from src.services.registry import create_provider
+from src.services.dataset_cache import DatasetCache, DatasetSnapshot
+from src.services.snapshot_store import SnapshotStore
+from src.services.refresher import BackgroundRefresher, CircuitBreaker
+from src.services.aggregation import ChartAggregates, plan_chart_aggregates
+from src.ui.sidebar import (
+    FilterOptions, get_filter_options, get_filter_selections, get_selected_theme, render_export, render_filters,
+    render_performance_panel, render_settings,
+)
+from src.ui.components import get_figure_cache_stats, render_donut_chart, render_bar_chart, render_map, render_sunburst
+from src.ui.header import format_age, render_status_badges
+from src.ui.styles import THEMES, apply_theme_client_side, get_theme, inject_styles, inject_switchable_styles
+
+# Fragment keys, used to scope reruns triggered by widget callbacks
+CHART_FRAGMENTS = ["donut_chart", "bar_chart", "map_chart", "sunburst_chart"]
+FILTER_FRAGMENT = "filters"
+STYLES_FRAGMENT = "styles"
+THEME_FRAGMENT = "theme"
+HEADER_FRAGMENT = "header"
+PERF_FRAGMENT = "performance"
 
 
 def get_data_provider():
     """Get the appropriate data provider based on configuration."""
+    return create_provider(Config.DATA_SOURCE)
+
+
+@st.cache_resource
+def configure_logging() -> None:
+    """Write the app's log records, including the src.perf stage timings, to stderr."""
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    app_logger = logging.getLogger("src")
+    app_logger.addHandler(handler)
+    app_logger.setLevel(Config.LOG_LEVEL)
+
+
+def _release_dataset_cache(cache: DatasetCache) -> None:
+    """Close the pooled database connections of a dataset cache being dropped."""
     if Config.DATA_SOURCE == "POSTGRES":
-        return PostgresDataProvider()
-    return MockDataProvider()
+        # Imported here so other data sources never load SQLAlchemy
+        from src.services.db_engine import dispose_engine
+        dispose_engine()
 
 
-def main() -> None:
-    """Main application entry point."""
+@st.cache_resource(on_release=_release_dataset_cache)
+def get_dataset_cache() -> DatasetCache:
+    """Get the process-wide dataset cache, warm-started from disk when configured."""
+    store = (
+        SnapshotStore(Config.SNAPSHOT_DIR, Config.DATA_SOURCE, Config.get_source_fingerprint())
+        if Config.SNAPSHOT_DIR else None
+    )
+    cache = DatasetCache(
+        get_data_provider,
+        ttl_seconds=Config.UPDATE_INTERVAL_SECONDS,
+        serve_stale=Config.REFRESH_IN_BACKGROUND,
+        store=store,
+    )
+    cache.restore()
+    return cache
+
+
+@st.cache_resource(on_release=lambda refresher: refresher.stop())
+def get_background_refresher() -> BackgroundRefresher:
+    """Start the process-wide thread that keeps the dataset cache fresh."""
+    breaker = CircuitBreaker(
+        failure_threshold=Config.REFRESH_FAILURE_THRESHOLD,
+        retry_base_seconds=Config.REFRESH_RETRY_BASE_SECONDS,
+        retry_max_seconds=Config.REFRESH_RETRY_MAX_SECONDS,
+    )
+    return BackgroundRefresher(
+        get_dataset_cache(), interval_seconds=Config.UPDATE_INTERVAL_SECONDS, breaker=breaker,
+    ).start()
+
+
+def _load_snapshot() -> DatasetSnapshot:
+    """Get the shared dataset snapshot, stopping the current run on failure."""
+    try:
+        with perf.stage("data.load") as timing:
+            snapshot = get_dataset_cache().get()
+            timing["version"] = snapshot.version
+        return snapshot
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        st.stop()
+
+
+@st.cache_resource(max_entries=4)
+def _get_filter_options(_snapshot: DatasetSnapshot, version: int) -> FilterOptions:
+    """Collect the sidebar filter options once per dataset version."""
+    return get_filter_options(_snapshot.data)
+
+
+@st.cache_resource(max_entries=256)
+def _get_chart_aggregates(
+    _snapshot: DatasetSnapshot,
+    version: int,
+    selections: Tuple[Tuple[str, Tuple[str, ...]], ...],
+) -> ChartAggregates:
+    """
+    Compute the chart aggregates for a filter selection once per dataset version.
+
+    The four chart fragments share the result instead of each slicing the cube.
+    """
+    filtered_df = _snapshot.cube.slice({column: list(values) for column, values in selections})
+    return plan_chart_aggregates(filtered_df)
+
+
+def _current_aggregates(snapshot: Optional[DatasetSnapshot] = None) -> ChartAggregates:
+    """Get the chart aggregates for the current session's filter selection."""
+    snapshot = snapshot or _load_snapshot()
+    with perf.stage("filter"):
+        selections: Dict[str, List[str]] = get_filter_selections(_get_filter_options(snapshot, snapshot.version))
+        key = tuple((column, tuple(values)) for column, values in selections.items())
+        return _get_chart_aggregates(snapshot, snapshot.version, key)
+
+
+def _rerun_scope(keys: List[str]) -> List[str]:
+    """Add the Performance panel to a fragment rerun, when it is shown."""
+    return keys + [PERF_FRAGMENT] if Config.PERF_PANEL else keys
+
+
+def _on_filter_change() -> None:
+    """Rerun only the filter groups and the charts after a filter edit."""
+    st.rerun(_rerun_scope([FILTER_FRAGMENT] + CHART_FRAGMENTS))
+
+
+def _on_theme_change() -> None:
+    """Rerun only what a theme switch affects in the configured theme mode."""
+    if Config.THEME_MODE == "CLIENT":
+        st.rerun(THEME_FRAGMENT)
+    st.rerun(_rerun_scope([STYLES_FRAGMENT] + CHART_FRAGMENTS))
+
+
+@st.fragment(key=STYLES_FRAGMENT)
+def styles_fragment() -> None:
+    """Inject the CSS for the selected theme, or for all themes in CLIENT mode."""
+    with perf.stage("styles.inject", mode=Config.THEME_MODE):
+        if Config.THEME_MODE == "CLIENT":
+            inject_switchable_styles(THEMES)
+        else:
+            inject_styles(get_theme(get_selected_theme()))
+
+
+@st.fragment(key=THEME_FRAGMENT)
+def theme_fragment() -> None:
+    """Activate the selected theme in the browser (CLIENT theme mode only)."""
+    if Config.THEME_MODE == "CLIENT":
+        apply_theme_client_side(get_theme(get_selected_theme()))
+
+
+@st.fragment(key=HEADER_FRAGMENT, run_every=60)
+def header_fragment() -> None:
+    """Render the header badges; reruns every minute to keep the age current."""
+    # Peek instead of loading, so the header never waits on or repeats a
+    # failed first load. A reload in progress is not a delay: only flag
+    # failed reloads, which also covers the breaker being open
+    cache = get_dataset_cache()
+    snapshot = cache.snapshot
+    render_status_badges(
+        snapshot.age_seconds if snapshot is not None else None, cache.stats().last_error is not None,
+    )
+
+
+@st.fragment(key=FILTER_FRAGMENT)
+def filters_fragment() -> None:
+    """Render the sidebar filter groups."""
+    snapshot = _load_snapshot()
+    render_filters(
+        _get_filter_options(snapshot, snapshot.version), on_change=_on_filter_change, mode=Config.FILTER_MODE,
+    )
+
+
+@st.fragment(key="donut_chart")
+def donut_chart_fragment() -> None:
+    """Render the donut chart for the current selection and theme."""
+    render_donut_chart(_current_aggregates().by_stage, get_selected_theme())
+
+
+@st.fragment(key="bar_chart")
+def bar_chart_fragment() -> None:
+    """Render the bar chart for the current selection and theme."""
+    render_bar_chart(_current_aggregates().by_stage, get_selected_theme())
+
+
+@st.fragment(key="map_chart")
+def map_chart_fragment() -> None:
+    """Render the choropleth map for the current selection and theme."""
+    snapshot = _load_snapshot()
+    render_map(_current_aggregates(snapshot).by_country, get_selected_theme(), snapshot.countries.codes)
+
+
+@st.fragment(key="sunburst_chart")
+def sunburst_chart_fragment() -> None:
+    """Render the sunburst chart for the current selection and theme."""
+    render_sunburst(_current_aggregates().by_country_stage, get_selected_theme())
+
+
+@st.fragment(key=PERF_FRAGMENT)
+def performance_fragment() -> None:
+    """Show this session's latest stage timings and the cache counters."""
+    figures = get_figure_cache_stats()
+    cache = get_dataset_cache()
+    dataset = cache.stats()
+    cache_lines = [
+        f"Figure cache: {figures.size}/{figures.max_entries} figures, {figures.hit_rate:.0%} hits",
+        f"Dataset cache: {dataset.hits + dataset.stale_hits} hits, {dataset.misses} misses, "
+        f"last load {dataset.last_refresh_seconds * 1000:.0f} ms",
+    ]
+    snapshot = cache.snapshot
+    if snapshot is not None:
+        memory = snapshot.memory
+        cache_lines.append(
+            f"Dataset memory: {memory.rows:,} rows, {memory.bytes_before / 1024:,.0f} KiB raw, "
+            f"{memory.bytes_after / 1024:,.0f} KiB normalized ({memory.ratio:.0%})"
+        )
+    if Config.REFRESH_IN_BACKGROUND:
+        refresher = get_background_refresher().status()
+        line = (
+            f"Background refresh: {'running' if refresher.running else 'stopped'}, "
+            f"breaker {refresher.breaker_state}, {refresher.consecutive_failures} consecutive failures"
+        )
+        if refresher.last_success_at is not None:
+            line += f", last success {format_age(time.time() - refresher.last_success_at)}"
+        if refresher.last_error:
+            line += f", last error: {refresher.last_error}"
+        cache_lines.append(line)
+    if Config.DATA_SOURCE == "POSTGRES":
+        from src.services.db_engine import get_pool_metrics
+        pool = get_pool_metrics()
+        cache_lines.append(
+            f"DB pool: {pool.checked_out}/{pool.pool_size} checked out, {pool.overflow} overflow, "
+            f"{pool.checkouts} checkouts, wait avg {pool.avg_wait_seconds * 1000:.1f} ms, "
+            f"max {pool.max_wait_seconds * 1000:.1f} ms"
+        )
+    render_performance_panel(perf.session_timings(), cache_lines)
+
+
+def render_page() -> None:
+    """Render the sidebar, styles, header and charts."""
     # --- Page Configuration ---
     st.set_page_config(
         page_title=Config.PAGE_TITLE,
@@ -35,66 +270,69 @@ def main() -> None:
         layout=Config.LAYOUT,
         initial_sidebar_state="expanded"
     )
-    
-    # --- Data Loading ---
-    provider = get_data_provider()
-    
-    try:
-        df = provider.get_vaccine_data()
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        st.stop()
-    
-    # --- Sidebar & Filtering ---
-    selected_countries, selected_approaches, selected_stages, theme_name = render_sidebar(df)
-    
-    filtered_df = df[
-        (df["Country"].isin(selected_countries)) &
-        (df["Approach"].isin(selected_approaches)) &
-        (df["Stage"].isin(selected_stages))
-    ]
-    
+
+    if Config.REFRESH_IN_BACKGROUND:
+        get_background_refresher()
+
+    # --- Sidebar ---
+    with st.sidebar:
+        filters_fragment()
+        render_settings(on_theme_change=_on_theme_change)
+        render_export()
+
     # --- Apply Theme Styles ---
-    theme = get_theme(theme_name)
-    inject_styles(theme)
-    
+    styles_fragment()
+    theme_fragment()
+
     # --- Main Layout ---
     st.title("COVID Vaccine Dashboard")
-    st.markdown("`Published` `Not available` `16 days ago`", unsafe_allow_html=True)
-    
+    header_fragment()
+
     st.markdown("---")
     st.subheader("Overview")
-    
+
     # Row 1: Description + Charts
     row1_col1, row1_col2, row1_col3 = st.columns([1.1, 1.5, 1.3])
-    
+
     with row1_col1:
         st.markdown("""
         ### COVID-19 Vaccine Dashboard
         Everywhere you look, you see negative news about COVID-19. This is to be expected; it's been a brutal year.
-        
+
         *   the sheer volume of attempts to fund the R&D needed
         *   the large number of countries involved
         *   the diversity of vaccine approaches taken
-        
+
         **The Dataset**  
         The dashboard is powered by data maintained by the Milken Institute.
         """)
-    
+
     with row1_col2:
-        render_donut_chart(filtered_df, theme_name)
-    
+        donut_chart_fragment()
+
     with row1_col3:
-        render_bar_chart(filtered_df, theme_name)
-    
+        bar_chart_fragment()
+
     # Row 2: Map + Sunburst
     row2_col1, row2_col2 = st.columns([2, 1])
-    
+
     with row2_col1:
-        render_map(filtered_df, theme_name)
-    
+        map_chart_fragment()
+
     with row2_col2:
-        render_sunburst(filtered_df, theme_name)
+        sunburst_chart_fragment()
+
+
+def main() -> None:
+    """Main application entry point."""
+    configure_logging()
+    with perf.stage("rerun"):
+        render_page()
+
+    # Rendered last, so it includes this run's timings
+    if Config.PERF_PANEL:
+        with st.sidebar:
+            performance_fragment()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+"""
+Rerun instrumentation for the COVID-19 Vaccine Dashboard.
+Times named hot-path stages, logs every measurement as one JSON line at DEBUG
+and keeps each session's latest measurements for the sidebar Performance panel.
+"""
+import json
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = "_perf_timings"
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    """One measurement of a stage."""
+    stage: str
+    ms: float
+    recorded_at: float
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+
+def record(stage_name: str, ms: float, **fields: Any) -> None:
+    """
+    Log a stage measurement and keep it for the session's Performance panel.
+
+    Args:
+        stage_name: Dotted stage name, e.g. 'chart.map.build'.
+        ms: Duration in milliseconds.
+        **fields: Extra JSON-serializable attributes, e.g. payload_bytes.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(json.dumps({"stage": stage_name, "ms": round(ms, 3), **fields}, default=str))
+    # Only script runs have a session; background threads just log
+    if Config.PERF_PANEL and get_script_run_ctx(suppress_warning=True) is not None:
+        timings = st.session_state.setdefault(_SESSION_KEY, {})
+        timings[stage_name] = StageTiming(stage_name, ms, time.time(), fields)
+
+
+@contextmanager
+def stage(stage_name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time the enclosed block as a stage.
+
+    Yields a dict of extra fields that the block can add to, for values only
+    known once the work is done.
+
+    Args:
+        stage_name: Dotted stage name.
+        **fields: Extra attributes known up front.
+    """
+    extra = dict(fields)
+    started = time.perf_counter()
+    try:
+        yield extra
+    finally:
+        record(stage_name, (time.perf_counter() - started) * 1000, **extra)
+
+
+def session_timings() -> Dict[str, StageTiming]:
+    """Get the latest measurement of every stage in the current session."""
+    return dict(st.session_state.get(_SESSION_KEY, {}))
@@ -0,0 +1,158 @@
+"""
+In-memory aggregation helpers for vaccine data.
+Filters and groups frames, plans the rollups shared by the dashboard charts
+and folds their long tails.
+"""
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.services.base_data import MEASURE, Filters, validate_dimensions
+
+OTHER_LABEL = "Other"
+
+
+def filter_frame(df: pd.DataFrame, filters: Optional[Filters] = None) -> pd.DataFrame:
+    """
+    Keep only rows whose dimension values are among the selected ones.
+
+    Args:
+        df: DataFrame with vaccine data.
+        filters: Allowed values per dimension; missing dimensions are not filtered.
+
+    Returns:
+        Filtered DataFrame.
+    """
+    if not filters:
+        return df
+    validate_dimensions(list(filters))
+
+    mask = pd.Series(True, index=df.index)
+    for column, values in filters.items():
+        mask &= df[column].isin(values)
+    return df[mask]
+
+
+def aggregate_frame(
+    df: pd.DataFrame,
+    group_by: Sequence[str],
+    filters: Optional[Filters] = None,
+) -> pd.DataFrame:
+    """
+    Sum Candidates per group after applying the filter selections.
+
+    Args:
+        df: DataFrame with vaccine data.
+        group_by: Dimensions to group by, in output column order.
+        filters: Allowed values per dimension.
+
+    Returns:
+        DataFrame with the group_by columns and a 'Candidates' column.
+    """
+    group_by = list(group_by)
+    validate_dimensions(group_by)
+    filtered = filter_frame(df, filters)
+
+    if not group_by:
+        return pd.DataFrame({MEASURE: [filtered[MEASURE].sum()]})
+    return (
+        filtered.groupby(group_by, observed=True, sort=True)[MEASURE]
+        .sum()
+        .reset_index()
+    )
+
+
+@dataclass(frozen=True)
+class ChartAggregates:
+    """Pre-aggregated inputs for the dashboard charts."""
+    by_stage: pd.DataFrame
+    by_country: pd.DataFrame
+    by_country_stage: pd.DataFrame
+
+    @property
+    def empty(self) -> bool:
+        """Whether the selection matched no data."""
+        return self.by_country_stage.empty
+
+
+def plan_chart_aggregates(df: pd.DataFrame) -> ChartAggregates:
+    """
+    Compute every rollup the charts need from a single group-by.
+
+    The Country x Stage totals feed the sunburst directly, and the Stage and
+    Country totals are re-summed from them rather than from the input rows.
+
+    Args:
+        df: Filtered DataFrame with 'Country', 'Stage' and 'Candidates' columns.
+
+    Returns:
+        ChartAggregates shared by the donut, bar, map and sunburst charts.
+    """
+    by_country_stage = aggregate_frame(df, ["Country", "Stage"])
+    return ChartAggregates(
+        by_stage=aggregate_frame(by_country_stage, ["Stage"]),
+        by_country=aggregate_frame(by_country_stage, ["Country"]),
+        by_country_stage=by_country_stage,
+    )
+
+
+@dataclass(frozen=True)
+class TailPolicy:
+    """Which values of a chart dimension are shown before the rest is folded."""
+    top_n: int = 0  # Largest values kept; 0 keeps all
+    min_share: float = 0.0  # Smallest share of the total a kept value needs
+
+    @property
+    def folds(self) -> bool:
+        """Whether the policy can fold anything."""
+        return self.top_n > 0 or self.min_share > 0
+
+
+def fold_tail(totals: pd.DataFrame, column: str, policy: TailPolicy) -> pd.DataFrame:
+    """
+    Fold the smallest values of a dimension into one "Other" value.
+
+    Values are ranked by their Candidates total across the frame; those past
+    the policy's top N or below its minimum share are relabelled "Other" and
+    re-summed with the remaining dimensions, so a Country x Stage frame keeps
+    one "Other" row per stage.
+
+    Args:
+        totals: Aggregated DataFrame with dimension columns and 'Candidates'.
+        column: Dimension whose tail is folded.
+        policy: Top-N and minimum-share limits.
+
+    Returns:
+        The kept rows in their original order followed by the "Other" rows,
+        with `column` as strings; `totals` itself when nothing is folded.
+    """
+    if not policy.folds or totals.empty:
+        return totals
+
+    codes, uniques = pd.factorize(totals[column])
+    per_value = np.bincount(codes, weights=totals[MEASURE].to_numpy(), minlength=len(uniques))
+    keep = np.ones(len(uniques), dtype=bool)
+    if policy.top_n > 0 and len(uniques) > policy.top_n:
+        # Ties at the cut-off keep the value seen first
+        keep[np.argsort(-per_value, kind="stable")[policy.top_n:]] = False
+    if policy.min_share > 0:
+        keep &= per_value >= policy.min_share * per_value.sum()
+    if keep.all():
+        return totals
+
+    labels = np.asarray(uniques, dtype=object)
+    kept_rows = keep[codes]
+    kept = totals[kept_rows].assign(**{column: labels[codes[kept_rows]]})
+    dimensions = [name for name in totals.columns if name not in (column, MEASURE)]
+    tail = totals[~kept_rows]
+    if dimensions:
+        other = aggregate_frame(tail, dimensions).assign(**{column: OTHER_LABEL})
+    else:
+        other = pd.DataFrame({column: [OTHER_LABEL], MEASURE: [tail[MEASURE].sum()]})
+    folded = pd.concat([kept, other[totals.columns]], ignore_index=True)
+    if OTHER_LABEL in labels[keep]:
+        # A real "Other" value absorbs the folded tail
+        folded = aggregate_frame(folded, dimensions + [column])[totals.columns]
+    return folded
@@ -1,8 +1,84 @@
-from typing import Protocol, List
+from dataclasses import dataclass
+from typing import Hashable, Iterator, Protocol, List, Mapping, Optional, Sequence
 import pandas as pd
 from src.domain.models import VaccineCandidate
 
+# Columns that can be filtered on and grouped by, and the summed measure
+DIMENSIONS = ("Country", "Approach", "Stage")
+MEASURE = "Candidates"
+
+# Selected values per dimension; a missing dimension is not filtered
+Filters = Mapping[str, Sequence[str]]
+
+
+def validate_dimensions(columns: Sequence[str]) -> None:
+    """Raise ValueError if any column is not a known dimension."""
+    unknown = [column for column in columns if column not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown dimension(s): {', '.join(unknown)}. Expected any of {DIMENSIONS}")
+
+
+@dataclass(frozen=True)
+class DataDelta:
+    """Rows changed since a watermark: current values of inserted or updated
+    rows indexed by row id, and the ids of deleted rows."""
+    upserts: pd.DataFrame
+    deleted_ids: pd.Index
+
+
 class DataProvider(Protocol):
     def get_vaccine_data(self) -> pd.DataFrame:
         """Returns the vaccine data as a pandas DataFrame."""
         ...
+
+    def get_aggregated_data(self, group_by: Sequence[str], filters: Optional[Filters] = None) -> pd.DataFrame:
+        """
+        Returns the sum of Candidates grouped by the given dimensions.
+
+        Args:
+            group_by: Dimensions to group by, in output column order.
+            filters: Allowed values per dimension; an empty list matches no rows.
+
+        Returns:
+            DataFrame with the group_by columns and a 'Candidates' column.
+        """
+        ...
+
+
+class ChangeProbingDataProvider(DataProvider, Protocol):
+    """Provider that can tell cheaply whether its data changed since a load."""
+
+    def get_watermark(self) -> Optional[Hashable]:
+        """Returns a cheap token that changes whenever the data changes, or
+        None when changes cannot be detected."""
+        ...
+
+
+class IncrementalDataProvider(ChangeProbingDataProvider, Protocol):
+    """
+    Provider that can report what changed instead of reloading everything.
+
+    get_vaccine_data must index rows by a stable row id when `incremental`
+    is set, so that changes can be merged into a loaded dataset.
+    """
+    incremental: bool
+
+    def get_changes(self, since: Hashable) -> DataDelta:
+        """
+        Returns the rows changed since a watermark.
+
+        Args:
+            since: Watermark returned by get_watermark before the last load.
+
+        Returns:
+            Upserted rows and deleted row ids; may overlap with earlier changes.
+        """
+        ...
+
+
+class ChunkedDataProvider(DataProvider, Protocol):
+    """Provider that can stream its rows instead of returning them at once."""
+
+    def iter_vaccine_data(self) -> Iterator[pd.DataFrame]:
+        """Yields the rows of get_vaccine_data in consecutive chunks."""
+        ...
@@ -0,0 +1,163 @@
+"""
+Country name resolution for the vaccine dataset.
+Maps Country values, including common aliases, to ISO 3166-1 alpha-3 codes.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+# (short name, ISO-3 code) for every ISO 3166-1 country
+ISO3_COUNTRIES: Tuple[Tuple[str, str], ...] = (
+    ("Afghanistan", "AFG"), ("Åland Islands", "ALA"), ("Albania", "ALB"), ("Algeria", "DZA"),
+    ("American Samoa", "ASM"), ("Andorra", "AND"), ("Angola", "AGO"), ("Anguilla", "AIA"),
+    ("Antarctica", "ATA"), ("Antigua and Barbuda", "ATG"), ("Argentina", "ARG"), ("Armenia", "ARM"),
+    ("Aruba", "ABW"), ("Australia", "AUS"), ("Austria", "AUT"), ("Azerbaijan", "AZE"),
+    ("Bahamas", "BHS"), ("Bahrain", "BHR"), ("Bangladesh", "BGD"), ("Barbados", "BRB"),
+    ("Belarus", "BLR"), ("Belgium", "BEL"), ("Belize", "BLZ"), ("Benin", "BEN"),
+    ("Bermuda", "BMU"), ("Bhutan", "BTN"), ("Bolivia", "BOL"), ("Bonaire, Sint Eustatius and Saba", "BES"),
+    ("Bosnia and Herzegovina", "BIH"), ("Botswana", "BWA"), ("Bouvet Island", "BVT"), ("Brazil", "BRA"),
+    ("British Indian Ocean Territory", "IOT"), ("British Virgin Islands", "VGB"), ("Brunei", "BRN"),
+    ("Bulgaria", "BGR"), ("Burkina Faso", "BFA"), ("Burundi", "BDI"), ("Cabo Verde", "CPV"),
+    ("Cambodia", "KHM"), ("Cameroon", "CMR"), ("Canada", "CAN"), ("Cayman Islands", "CYM"),
+    ("Central African Republic", "CAF"), ("Chad", "TCD"), ("Chile", "CHL"), ("China", "CHN"),
+    ("Christmas Island", "CXR"), ("Cocos (Keeling) Islands", "CCK"), ("Colombia", "COL"), ("Comoros", "COM"),
+    ("Congo", "COG"), ("Cook Islands", "COK"), ("Costa Rica", "CRI"), ("Côte d'Ivoire", "CIV"),
+    ("Croatia", "HRV"), ("Cuba", "CUB"), ("Curaçao", "CUW"), ("Cyprus", "CYP"),
+    ("Czechia", "CZE"), ("Democratic Republic of the Congo", "COD"), ("Denmark", "DNK"), ("Djibouti", "DJI"),
+    ("Dominica", "DMA"), ("Dominican Republic", "DOM"), ("Ecuador", "ECU"), ("Egypt", "EGY"),
+    ("El Salvador", "SLV"), ("Equatorial Guinea", "GNQ"), ("Eritrea", "ERI"), ("Estonia", "EST"),
+    ("Eswatini", "SWZ"), ("Ethiopia", "ETH"), ("Falkland Islands", "FLK"), ("Faroe Islands", "FRO"),
+    ("Fiji", "FJI"), ("Finland", "FIN"), ("France", "FRA"), ("French Guiana", "GUF"),
+    ("French Polynesia", "PYF"), ("French Southern Territories", "ATF"), ("Gabon", "GAB"), ("Gambia", "GMB"),
+    ("Georgia", "GEO"), ("Germany", "DEU"), ("Ghana", "GHA"), ("Gibraltar", "GIB"),
+    ("Greece", "GRC"), ("Greenland", "GRL"), ("Grenada", "GRD"), ("Guadeloupe", "GLP"),
+    ("Guam", "GUM"), ("Guatemala", "GTM"), ("Guernsey", "GGY"), ("Guinea", "GIN"),
+    ("Guinea-Bissau", "GNB"), ("Guyana", "GUY"), ("Haiti", "HTI"), ("Heard Island and McDonald Islands", "HMD"),
+    ("Holy See", "VAT"), ("Honduras", "HND"), ("Hong Kong", "HKG"), ("Hungary", "HUN"),
+    ("Iceland", "ISL"), ("India", "IND"), ("Indonesia", "IDN"), ("Iran", "IRN"),
+    ("Iraq", "IRQ"), ("Ireland", "IRL"), ("Isle of Man", "IMN"), ("Israel", "ISR"),
+    ("Italy", "ITA"), ("Jamaica", "JAM"), ("Japan", "JPN"), ("Jersey", "JEY"),
+    ("Jordan", "JOR"), ("Kazakhstan", "KAZ"), ("Kenya", "KEN"), ("Kiribati", "KIR"),
+    ("Kuwait", "KWT"), ("Kyrgyzstan", "KGZ"), ("Laos", "LAO"), ("Latvia", "LVA"),
+    ("Lebanon", "LBN"), ("Lesotho", "LSO"), ("Liberia", "LBR"), ("Libya", "LBY"),
+    ("Liechtenstein", "LIE"), ("Lithuania", "LTU"), ("Luxembourg", "LUX"), ("Macao", "MAC"),
+    ("Madagascar", "MDG"), ("Malawi", "MWI"), ("Malaysia", "MYS"), ("Maldives", "MDV"),
+    ("Mali", "MLI"), ("Malta", "MLT"), ("Marshall Islands", "MHL"), ("Martinique", "MTQ"),
+    ("Mauritania", "MRT"), ("Mauritius", "MUS"), ("Mayotte", "MYT"), ("Mexico", "MEX"),
+    ("Micronesia", "FSM"), ("Moldova", "MDA"), ("Monaco", "MCO"), ("Mongolia", "MNG"),
+    ("Montenegro", "MNE"), ("Montserrat", "MSR"), ("Morocco", "MAR"), ("Mozambique", "MOZ"),
+    ("Myanmar", "MMR"), ("Namibia", "NAM"), ("Nauru", "NRU"), ("Nepal", "NPL"),
+    ("Netherlands", "NLD"), ("New Caledonia", "NCL"), ("New Zealand", "NZL"), ("Nicaragua", "NIC"),
+    ("Niger", "NER"), ("Nigeria", "NGA"), ("Niue", "NIU"), ("Norfolk Island", "NFK"),
+    ("North Korea", "PRK"), ("North Macedonia", "MKD"), ("Northern Mariana Islands", "MNP"), ("Norway", "NOR"),
+    ("Oman", "OMN"), ("Pakistan", "PAK"), ("Palau", "PLW"), ("Palestine", "PSE"),
+    ("Panama", "PAN"), ("Papua New Guinea", "PNG"), ("Paraguay", "PRY"), ("Peru", "PER"),
+    ("Philippines", "PHL"), ("Pitcairn", "PCN"), ("Poland", "POL"), ("Portugal", "PRT"),
+    ("Puerto Rico", "PRI"), ("Qatar", "QAT"), ("Réunion", "REU"), ("Romania", "ROU"),
+    ("Russia", "RUS"), ("Rwanda", "RWA"), ("Saint Barthélemy", "BLM"),
+    ("Saint Helena, Ascension and Tristan da Cunha", "SHN"), ("Saint Kitts and Nevis", "KNA"),
+    ("Saint Lucia", "LCA"), ("Saint Martin", "MAF"), ("Saint Pierre and Miquelon", "SPM"),
+    ("Saint Vincent and the Grenadines", "VCT"), ("Samoa", "WSM"), ("San Marino", "SMR"),
+    ("Sao Tome and Principe", "STP"), ("Saudi Arabia", "SAU"), ("Senegal", "SEN"), ("Serbia", "SRB"),
+    ("Seychelles", "SYC"), ("Sierra Leone", "SLE"), ("Singapore", "SGP"), ("Sint Maarten", "SXM"),
+    ("Slovakia", "SVK"), ("Slovenia", "SVN"), ("Solomon Islands", "SLB"), ("Somalia", "SOM"),
+    ("South Africa", "ZAF"), ("South Georgia and the South Sandwich Islands", "SGS"), ("South Korea", "KOR"),
+    ("South Sudan", "SSD"), ("Spain", "ESP"), ("Sri Lanka", "LKA"), ("Sudan", "SDN"),
+    ("Suriname", "SUR"), ("Svalbard and Jan Mayen", "SJM"), ("Sweden", "SWE"), ("Switzerland", "CHE"),
+    ("Syria", "SYR"), ("Taiwan", "TWN"), ("Tajikistan", "TJK"), ("Tanzania", "TZA"),
+    ("Thailand", "THA"), ("Timor-Leste", "TLS"), ("Togo", "TGO"), ("Tokelau", "TKL"),
+    ("Tonga", "TON"), ("Trinidad and Tobago", "TTO"), ("Tunisia", "TUN"), ("Turkey", "TUR"),
+    ("Turkmenistan", "TKM"), ("Turks and Caicos Islands", "TCA"), ("Tuvalu", "TUV"), ("Uganda", "UGA"),
+    ("Ukraine", "UKR"), ("United Arab Emirates", "ARE"), ("United Kingdom", "GBR"), ("United States", "USA"),
+    ("United States Minor Outlying Islands", "UMI"), ("U.S. Virgin Islands", "VIR"), ("Uruguay", "URY"),
+    ("Uzbekistan", "UZB"), ("Vanuatu", "VUT"), ("Venezuela", "VEN"), ("Vietnam", "VNM"),
+    ("Wallis and Futuna", "WLF"), ("Western Sahara", "ESH"), ("Yemen", "YEM"), ("Zambia", "ZMB"),
+    ("Zimbabwe", "ZWE"),
+)
+
+# Other spellings seen in vaccine trackers and official lists
+COUNTRY_ALIASES: Dict[str, str] = {
+    "USA": "USA", "US": "USA", "United States of America": "USA", "America": "USA",
+    "UK": "GBR", "Great Britain": "GBR", "Britain": "GBR",
+    "England": "GBR", "Scotland": "GBR", "Wales": "GBR", "Northern Ireland": "GBR",
+    "UAE": "ARE", "Russian Federation": "RUS",
+    "Korea": "KOR", "Republic of Korea": "KOR", "Korea, Republic of": "KOR",
+    "DPRK": "PRK", "Korea, Democratic People's Republic of": "PRK",
+    "Czech Republic": "CZE", "Türkiye": "TUR",
+    "Iran, Islamic Republic of": "IRN", "Viet Nam": "VNM", "Lao People's Democratic Republic": "LAO",
+    "Syrian Arab Republic": "SYR", "Ivory Coast": "CIV",
+    "DRC": "COD", "DR Congo": "COD", "Congo, Democratic Republic of the": "COD", "Congo-Kinshasa": "COD",
+    "Republic of the Congo": "COG", "Congo-Brazzaville": "COG",
+    "Cape Verde": "CPV", "Swaziland": "SWZ", "Burma": "MMR", "Macedonia": "MKD", "East Timor": "TLS",
+    "Vatican": "VAT", "Vatican City": "VAT", "Chinese Taipei": "TWN", "Taiwan, Province of China": "TWN",
+    "Macau": "MAC", "Brunei Darussalam": "BRN", "Holland": "NLD", "State of Palestine": "PSE",
+    "Bolivia, Plurinational State of": "BOL", "Venezuela, Bolivarian Republic of": "VEN",
+    "Tanzania, United Republic of": "TZA", "Moldova, Republic of": "MDA",
+    "Micronesia, Federated States of": "FSM",
+}
+
+
+def normalize_country_name(name: str) -> str:
+    """
+    Reduce a country name to a lookup key.
+
+    Accents, case, periods and a leading "The" are dropped, "&" reads as
+    "and", and other punctuation and whitespace runs become single spaces.
+
+    Args:
+        name: Country name as it appears in the data.
+
+    Returns:
+        Lookup key, e.g. "cote d ivoire" for "Côte d'Ivoire".
+    """
+    key = unicodedata.normalize("NFKD", str(name))
+    key = "".join(char for char in key if not unicodedata.combining(char)).casefold()
+    key = re.sub(r"[^\w\s]", " ", key.replace(".", "").replace("&", " and "))
+    key = " ".join(key.split())
+    return key[4:] if key.startswith("the ") else key
+
+
+def _build_lookup() -> Dict[str, str]:
+    lookup = {code.casefold(): code for _, code in ISO3_COUNTRIES}
+    lookup.update((normalize_country_name(name), code) for name, code in ISO3_COUNTRIES)
+    lookup.update((normalize_country_name(name), code) for name, code in COUNTRY_ALIASES.items())
+    return lookup
+
+
+_LOOKUP = _build_lookup()
+
+
+def iso3_code(name: str) -> Optional[str]:
+    """Get the ISO-3 code of a country name, alias or code, or None if unknown."""
+    return _LOOKUP.get(normalize_country_name(name))
+
+
+@dataclass(frozen=True)
+class CountryIndex:
+    """ISO-3 codes of the Country values of one dataset version."""
+    codes: Dict[str, str]
+    unmatched: Tuple[str, ...]
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> "CountryIndex":
+        """Resolve every distinct value once."""
+        codes: Dict[str, str] = {}
+        unmatched = []
+        for value in values:
+            code = iso3_code(value)
+            if code is None:
+                unmatched.append(value)
+            else:
+                codes[value] = code
+        return cls(codes, tuple(sorted(unmatched)))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "CountryIndex":
+        """Resolve the distinct Country values of a dataset."""
+        column = df["Country"]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            return cls.from_values(column.cat.categories)
+        return cls.from_values(column.unique())
@@ -0,0 +1,319 @@
+"""
+Process-wide dataset cache for the COVID-19 Vaccine Dashboard.
+Serves one shared snapshot of the provider data to every session and rerun.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Hashable, Optional
+
+import pandas as pd
+
+from src.services.base_data import DataDelta, DataProvider
+from src.services.countries import CountryIndex
+from src.services.delta import merge_delta
+from src.services.normalize import NormalizationReport, normalize_vaccine_chunks, normalize_vaccine_data
+from src.services.rollup import RollupCube
+from src.services.snapshot_store import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+
+def _index_countries(data: pd.DataFrame) -> CountryIndex:
+    """Resolve the Country values of a new dataset version, logging those left off the map."""
+    countries = CountryIndex.from_frame(data)
+    if countries.unmatched:
+        logger.warning(
+            "%d Country values have no ISO-3 code and are left off the map: %s",
+            len(countries.unmatched), ", ".join(countries.unmatched),
+        )
+    return countries
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """
+    Immutable, versioned view of the vaccine dataset.
+
+    The DataFrame is shared between all sessions and must be treated as
+    read-only; filtering and grouping always produce new frames.
+    """
+    data: pd.DataFrame
+    cube: RollupCube
+    version: int
+    loaded_at: float
+    memory: NormalizationReport
+    countries: CountryIndex  # ISO-3 codes of the Country values, for the map
+    watermark: Optional[Hashable] = None
+    restored: bool = False  # read from a SnapshotStore, not yet revalidated
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds elapsed since the snapshot was loaded."""
+        return time.time() - self.loaded_at
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters describing how the dataset cache has been used."""
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    incremental_refreshes: int = 0
+    unchanged_refreshes: int = 0
+    failures: int = 0
+    last_refresh_seconds: float = 0.0
+    total_refresh_seconds: float = 0.0
+    last_error: Optional[str] = None
+
+
+class DatasetCache:
+    """
+    Thread-safe, TTL-driven cache around a DataProvider.
+
+    Concurrent callers that find the snapshot missing or expired wait for a
+    single reload instead of each querying the provider. Reloads build the
+    new snapshot off to the side and swap it in atomically, so readers never
+    see a partially built one. When a reload fails, the last good snapshot
+    keeps being served.
+
+    With a provider that has `get_watermark`, reloads first compare the
+    provider's watermark with the snapshot's: an unchanged dataset only
+    renews the snapshot, and a changed one is merged from the delta when
+    the provider sets `incremental`, or reloaded in full otherwise.
+    Providers with `iter_vaccine_data` are loaded chunk by chunk. With a
+    SnapshotStore, every loaded dataset is also written to disk, and
+    restore() starts a new process from that copy.
+    """
+
+    def __init__(
+        self,
+        provider_factory: Callable[[], DataProvider],
+        ttl_seconds: float,
+        serve_stale: bool = False,
+        store: Optional[SnapshotStore] = None,
+    ):
+        """
+        Args:
+            provider_factory: Callable building the underlying data provider.
+            ttl_seconds: Maximum snapshot age before it is reloaded.
+            serve_stale: Return an expired snapshot instead of reloading on the
+                caller's thread; used when a BackgroundRefresher keeps it fresh.
+            store: On-disk copy of the latest snapshot, shared across restarts.
+        """
+        self._provider_factory = provider_factory
+        self._provider: Optional[DataProvider] = None
+        self._ttl_seconds = ttl_seconds
+        self._serve_stale = serve_stale
+        self._store = store
+        self._load_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._snapshot: Optional[DatasetSnapshot] = None
+        self._version = 0
+        self._stats = CacheStats()
+
+    @property
+    def ttl_seconds(self) -> float:
+        """Maximum snapshot age before it is considered stale."""
+        return self._ttl_seconds
+
+    @property
+    def snapshot(self) -> Optional[DatasetSnapshot]:
+        """The current snapshot, without triggering a load."""
+        return self._snapshot
+
+    def _is_fresh(self, snapshot: Optional[DatasetSnapshot]) -> bool:
+        # A restored snapshot is stale until the provider has confirmed it
+        return snapshot is not None and not snapshot.restored and snapshot.age_seconds < self._ttl_seconds
+
+    def _count(self, **changes) -> None:
+        with self._stats_lock:
+            self._stats = replace(
+                self._stats,
+                **{name: getattr(self._stats, name) + delta for name, delta in changes.items()},
+            )
+
+    def get(self) -> DatasetSnapshot:
+        """
+        Return the current snapshot, reloading it when it has expired.
+
+        Returns:
+            The shared dataset snapshot.
+
+        Raises:
+            Exception: Whatever the provider raised, if no snapshot was ever loaded.
+        """
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            self._count(hits=1)
+            return snapshot  # type: ignore[return-value]
+        if snapshot is not None and self._serve_stale:
+            self._count(stale_hits=1)
+            return snapshot
+
+        with self._load_lock:
+            # Another session may have reloaded while we were waiting.
+            if self._is_fresh(self._snapshot):
+                self._count(hits=1)
+                return self._snapshot  # type: ignore[return-value]
+            self._count(misses=1)
+            try:
+                return self._load()
+            except Exception:
+                if self._snapshot is None:
+                    raise
+                return self._snapshot
+
+    def refresh(self, if_stale: bool = False) -> DatasetSnapshot:
+        """
+        Force a reload from the provider, regardless of snapshot age.
+
+        Args:
+            if_stale: Keep the current snapshot instead when it is still fresh,
+                e.g. because a session loaded it while we waited for the lock.
+
+        Raises:
+            Exception: Whatever the provider raised; the old snapshot is kept.
+        """
+        with self._load_lock:
+            if if_stale and self._is_fresh(self._snapshot):
+                return self._snapshot  # type: ignore[return-value]
+            return self._load()
+
+    def restore(self) -> Optional[DatasetSnapshot]:
+        """
+        Publish the snapshot saved on disk, if no snapshot is loaded yet.
+
+        The restored snapshot keeps its original load time, version and
+        watermark, and is marked `restored` until the provider confirms it.
+
+        Returns:
+            The restored snapshot, or None if there was nothing to restore.
+        """
+        if self._store is None:
+            return None
+        with self._load_lock:
+            if self._snapshot is not None:
+                return None
+            stored = self._store.load()
+            if stored is None:
+                return None
+            size = int(stored.data.memory_usage(deep=True).sum())
+            if stored.cube_cells is not None:
+                cube = RollupCube(stored.cube_cells)
+            else:
+                cube = RollupCube.from_frame(stored.data)
+            self._version = max(self._version, stored.version)
+            self._snapshot = DatasetSnapshot(
+                data=stored.data,
+                cube=cube,
+                version=stored.version,
+                loaded_at=stored.loaded_at,
+                # The raw size was not stored
+                memory=NormalizationReport(rows=len(stored.data), bytes_before=size, bytes_after=size),
+                countries=_index_countries(stored.data),
+                watermark=stored.watermark,
+                restored=True,
+            )
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot so the next call reloads it."""
+        with self._load_lock:
+            self._snapshot = None
+
+    def stats(self) -> CacheStats:
+        """Return a copy of the cache counters."""
+        with self._stats_lock:
+            return self._stats
+
+    def _load(self) -> DatasetSnapshot:
+        """Load and swap in a new snapshot; the caller holds the load lock."""
+        started = time.perf_counter()
+        previous = self._snapshot
+        kind = "refreshes"
+        try:
+            if self._provider is None:
+                self._provider = self._provider_factory()
+            provider = self._provider
+
+            watermark = provider.get_watermark() if hasattr(provider, "get_watermark") else None
+            probed = watermark is not None and previous is not None and previous.watermark is not None
+            if probed and watermark == previous.watermark:
+                kind = "unchanged_refreshes"
+                snapshot = replace(previous, loaded_at=time.time(), restored=False)
+            elif probed and getattr(provider, "incremental", False):
+                kind = "incremental_refreshes"
+                snapshot = self._merge(previous, provider.get_changes(previous.watermark), watermark)
+            elif hasattr(provider, "iter_vaccine_data"):
+                data, memory = normalize_vaccine_chunks(provider.iter_vaccine_data())
+                snapshot = self._build(data, RollupCube.from_frame(data), memory, watermark)
+            else:
+                data, memory = normalize_vaccine_data(provider.get_vaccine_data())
+                snapshot = self._build(data, RollupCube.from_frame(data), memory, watermark)
+        except Exception as e:
+            with self._stats_lock:
+                self._stats = replace(self._stats, failures=self._stats.failures + 1, last_error=str(e))
+            logger.warning("Dataset reload failed after %.3fs: %s", time.perf_counter() - started, e)
+            raise
+        duration = time.perf_counter() - started
+
+        self._snapshot = snapshot
+        if kind != "unchanged_refreshes":
+            self._persist(snapshot)
+        with self._stats_lock:
+            self._stats = replace(
+                self._stats,
+                **{kind: getattr(self._stats, kind) + 1},
+                last_refresh_seconds=duration,
+                total_refresh_seconds=self._stats.total_refresh_seconds + duration,
+                last_error=None,
+            )
+        if kind == "unchanged_refreshes":
+            logger.info("Dataset version %d unchanged, checked in %.3fs", snapshot.version, duration)
+        else:
+            logger.info(
+                "Loaded dataset version %d (%d rows, %d cube cells, %d bytes, %s) in %.3fs",
+                snapshot.version, len(snapshot.data), len(snapshot.cube), snapshot.memory.bytes_after,
+                "delta" if kind == "incremental_refreshes" else "full", duration,
+            )
+        return snapshot
+
+    def _persist(self, snapshot: DatasetSnapshot) -> None:
+        """Write the snapshot to the store; failures only cost the warm start."""
+        if self._store is None:
+            return
+        try:
+            self._store.save(
+                snapshot.data, snapshot.cube.cells, snapshot.version, snapshot.loaded_at, snapshot.watermark,
+            )
+        except Exception as e:
+            logger.warning("Could not save dataset version %d: %s", snapshot.version, e)
+
+    def _merge(self, previous: DatasetSnapshot, delta: DataDelta, watermark: Hashable) -> DatasetSnapshot:
+        """Build the next snapshot by merging provider changes into the previous one."""
+        upserts, _ = normalize_vaccine_data(delta.upserts)
+        data, cube = merge_delta(previous.data, previous.cube, DataDelta(upserts, delta.deleted_ids))
+        bytes_after = int(data.memory_usage(deep=True).sum())
+        memory = NormalizationReport(
+            rows=len(data),
+            # The raw size of merged rows is not known; assume the previous ratio
+            bytes_before=int(bytes_after / previous.memory.ratio),
+            bytes_after=bytes_after,
+        )
+        logger.info(
+            "Merged %d upserted and %d deleted rows into dataset version %d",
+            len(upserts), len(delta.deleted_ids), previous.version,
+        )
+        return self._build(data, cube, memory, watermark)
+
+    def _build(
+        self, data: pd.DataFrame, cube: RollupCube, memory: NormalizationReport, watermark: Optional[Hashable],
+    ) -> DatasetSnapshot:
+        self._version += 1
+        return DatasetSnapshot(
+            data=data, cube=cube, version=self._version, loaded_at=time.time(),
+            memory=memory, countries=_index_countries(data), watermark=watermark,
+        )
@@ -0,0 +1,143 @@
+"""
+Process-wide SQLAlchemy engine for the PostgreSQL data provider.
+Owns the connection pool and records checkout/wait metrics for sizing it.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Iterator, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
+
+from src.config import Config
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PoolMetrics:
+    """Snapshot of connection pool usage since the engine was created."""
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    invalidations: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    # Live pool state, filled in by get_pool_metrics()
+    pool_size: int = 0
+    checked_out: int = 0
+    overflow: int = 0
+
+    @property
+    def avg_wait_seconds(self) -> float:
+        """Average time spent waiting for a pooled connection."""
+        return self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+
+
+_metrics = PoolMetrics()
+_metrics_lock = threading.Lock()
+
+
+def _bump(**deltas: float) -> None:
+    """Increment the named metric counters."""
+    global _metrics
+    with _metrics_lock:
+        _metrics = replace(
+            _metrics,
+            **{name: getattr(_metrics, name) + delta for name, delta in deltas.items()},
+        )
+
+
+def _record_wait(seconds: float) -> None:
+    global _metrics
+    with _metrics_lock:
+        _metrics = replace(
+            _metrics,
+            total_wait_seconds=_metrics.total_wait_seconds + seconds,
+            max_wait_seconds=max(_metrics.max_wait_seconds, seconds),
+        )
+
+
+def _create_engine() -> Engine:
+    """Create the pooled engine from the configured settings."""
+    connect_args = {}
+    if Config.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = f"-c statement_timeout={Config.DB_STATEMENT_TIMEOUT_MS}"
+
+    engine = create_engine(
+        Config.get_database_url(),
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=Config.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+    event.listen(engine, "connect", lambda *_: _bump(connects=1))
+    event.listen(engine, "checkout", lambda *_: _bump(checkouts=1))
+    event.listen(engine, "checkin", lambda *_: _bump(checkins=1))
+    event.listen(engine, "invalidate", lambda *_: _bump(invalidations=1))
+    return engine
+
+
+def get_engine() -> Engine:
+    """
+    Get the process-wide engine, creating it on first use.
+
+    Returns:
+        The shared SQLAlchemy engine.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine()
+    return _engine
+
+
+@contextmanager
+def connection() -> Iterator[Connection]:
+    """
+    Check a connection out of the shared pool, recording the wait time.
+
+    Yields:
+        A pooled SQLAlchemy connection, returned to the pool on exit.
+    """
+    started = time.perf_counter()
+    with get_engine().connect() as conn:
+        _record_wait(time.perf_counter() - started)
+        yield conn
+
+
+def get_pool_metrics() -> PoolMetrics:
+    """
+    Get pool usage counters together with the live pool state.
+
+    Returns:
+        PoolMetrics snapshot; live fields are zero before the engine exists.
+    """
+    with _metrics_lock:
+        metrics = _metrics
+    if _engine is None:
+        return metrics
+
+    pool = _engine.pool
+    return replace(
+        metrics,
+        pool_size=pool.size(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+    )
+
+
+def dispose_engine() -> None:
+    """Close all pooled connections and drop the shared engine."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
@@ -0,0 +1,34 @@
+"""
+Merging of incremental provider changes into the loaded dataset.
+Replaces changed rows by id and updates the rollup cube from the delta alone.
+"""
+from typing import Tuple
+
+import pandas as pd
+
+from src.services.base_data import DIMENSIONS, DataDelta
+from src.services.normalize import align_categories
+from src.services.rollup import RollupCube
+
+
+def merge_delta(data: pd.DataFrame, cube: RollupCube, delta: DataDelta) -> Tuple[pd.DataFrame, RollupCube]:
+    """
+    Apply provider changes to a normalized dataset and its rollup cube.
+
+    Args:
+        data: Normalized dataset indexed by row id.
+        cube: Rollup cube built from `data`.
+        delta: Normalized upserts and deleted row ids.
+
+    Returns:
+        Tuple of (merged dataset, merged cube); the inputs are left unchanged.
+    """
+    changed = data.index.isin(delta.upserts.index.union(delta.deleted_ids))
+    kept, removed, upserts = align_categories([data[~changed], data[changed], delta.upserts])
+
+    merged = pd.concat([kept, upserts])
+    for dim in DIMENSIONS:
+        merged[dim] = merged[dim].cat.remove_unused_categories()
+
+    dtypes = {dim: merged[dim].dtype for dim in DIMENSIONS}
+    return merged, cube.apply_delta(removed, upserts.astype(dtypes))
@@ -0,0 +1,153 @@
+"""
+File-backed data provider for bulk drops of the vaccine dataset.
+Reads Parquet and Arrow IPC files through memory maps and CSV files with
+pyarrow's streaming parser, materializing only the dashboard columns.
+"""
+import os
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.config import Config
+from src.domain.models import FIELD_COLUMNS
+from src.services.aggregation import aggregate_frame
+from src.services.base_data import DataProvider, Filters
+from src.services.normalize import SchemaError
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# File extension -> format
+FILE_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+    ".csv": "csv",
+}
+
+
+def _column_names(names: Sequence[str]) -> Dict[str, str]:
+    """
+    Map the file columns that hold dataset fields to dataset column names.
+
+    Columns may be named like the dataset ('Candidates') or like the
+    VaccineCandidate fields ('candidate_count'), in any letter case.
+
+    Raises:
+        SchemaError: If a dataset column has no matching file column, or
+            more than one.
+    """
+    wanted = {}
+    for field, column in FIELD_COLUMNS.items():
+        wanted[field.lower()] = column
+        wanted[column.lower()] = column
+    mapping: Dict[str, str] = {}
+    sources: Dict[str, str] = {}
+    for name in names:
+        column = wanted.get(name.lower())
+        if column is None:
+            continue
+        if column in sources:
+            raise SchemaError(f"Columns '{sources[column]}' and '{name}' both map to '{column}'")
+        sources[column] = name
+        mapping[name] = column
+    missing = set(FIELD_COLUMNS.values()) - set(sources)
+    if missing:
+        raise SchemaError(f"Missing column(s): {', '.join(sorted(missing))}")
+    return mapping
+
+
+def _rename_batch(batch: "pa.RecordBatch", mapping: Dict[str, str]) -> "pa.RecordBatch":
+    """Rename a batch's file columns to dataset column names."""
+    return batch.rename_columns([mapping[name] for name in batch.schema.names])
+
+
+class FileDataProvider(DataProvider):
+    """
+    Serves the dataset from a local Parquet, Arrow IPC or CSV file.
+
+    The file's modification time and size act as the watermark, so refreshes
+    of an unchanged file cost a single stat call and a new drop is picked up
+    by the next refresh.
+    """
+
+    def __init__(self, path: Optional[str] = None, chunk_size: Optional[int] = None):
+        """
+        Args:
+            path: Data file; defaults to Config.DATA_FILE_PATH.
+            chunk_size: Rows per Parquet batch; defaults to Config.DATA_FILE_CHUNK_SIZE.
+                CSV files are streamed in pyarrow's parser blocks and Arrow
+                files in the record batches they were written with.
+        """
+        self.path = path or Config.DATA_FILE_PATH
+        self.chunk_size = chunk_size or Config.DATA_FILE_CHUNK_SIZE
+        extension = os.path.splitext(self.path)[1].lower()
+        if extension not in FILE_FORMATS:
+            raise ValueError(
+                f"Unsupported data file '{self.path}'. Expected one of: {', '.join(sorted(FILE_FORMATS))}"
+            )
+        self.format = FILE_FORMATS[extension]
+
+    def get_watermark(self) -> Tuple[int, int]:
+        """Returns the file's modification time (ns) and size."""
+        try:
+            stat = os.stat(self.path)
+        except OSError as e:
+            raise RuntimeError(f"Failed to read data file: {e}")
+        return stat.st_mtime_ns, stat.st_size
+
+    def _batches(self) -> Iterator["pa.RecordBatch"]:
+        """Yield record batches holding only the dataset columns, renamed."""
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        import pyarrow.ipc as ipc
+        import pyarrow.parquet as pq
+
+        # Each reader stays open until the consumer has taken its last batch
+        if self.format == "parquet":
+            with pq.ParquetFile(self.path, memory_map=True) as parquet:
+                mapping = _column_names(parquet.schema_arrow.names)
+                for batch in parquet.iter_batches(batch_size=self.chunk_size, columns=list(mapping)):
+                    yield _rename_batch(batch, mapping)
+        elif self.format == "arrow":
+            with pa.memory_map(self.path, "r") as source:
+                reader = ipc.open_file(source)
+                mapping = _column_names(reader.schema.names)
+                for i in range(reader.num_record_batches):
+                    yield _rename_batch(reader.get_batch(i).select(list(mapping)), mapping)
+        else:
+            with pacsv.open_csv(self.path) as header:
+                mapping = _column_names(header.schema.names)
+            options = pacsv.ConvertOptions(include_columns=list(mapping))
+            with pacsv.open_csv(self.path, convert_options=options) as reader:
+                for batch in reader:
+                    yield _rename_batch(batch, mapping)
+
+    def iter_vaccine_data(self) -> Iterator[pd.DataFrame]:
+        """
+        Streams the file's rows, one DataFrame per record batch.
+
+        A file without rows yields a single empty DataFrame with the dataset
+        columns, so that streaming and whole-file reads agree.
+        """
+        empty = True
+        try:
+            for batch in self._batches():
+                empty = False
+                yield batch.to_pandas()
+        except SchemaError:
+            raise
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Failed to read data file '{self.path}': {e}")
+        if empty:
+            yield pd.DataFrame(columns=list(FIELD_COLUMNS.values()))
+
+    def get_vaccine_data(self) -> pd.DataFrame:
+        """Reads the dataset columns of the whole file."""
+        return pd.concat(self.iter_vaccine_data(), ignore_index=True)
+
+    def get_aggregated_data(self, group_by: Sequence[str], filters: Optional[Filters] = None) -> pd.DataFrame:
+        """Aggregates the file rows in pandas, matching the SQL pushdown."""
+        return aggregate_frame(self.get_vaccine_data(), group_by, filters)
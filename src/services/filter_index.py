@@ -0,0 +1,90 @@
+"""
+Bitmap inverted index for the sidebar filter dimensions.
+Maps every distinct dimension value to a packed bitmap of matching rows.
+"""
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.services.base_data import DIMENSIONS, Filters, validate_dimensions
+
+
+class BitmapIndex:
+    """
+    Per-value row bitmaps for the filter dimensions of one dataset version.
+
+    Applying a selection ORs the bitmaps of the selected values within each
+    dimension and ANDs the dimensions together, touching n/8 bytes per value
+    instead of comparing every row.
+    """
+
+    def __init__(self, df: pd.DataFrame, dimensions: Sequence[str] = DIMENSIONS):
+        """
+        Args:
+            df: DataFrame to index; row positions must stay stable.
+            dimensions: Columns to build bitmaps for.
+        """
+        validate_dimensions(dimensions)
+        self._size = len(df)
+        self._empty = np.zeros((self._size + 7) // 8, dtype=np.uint8)
+        self._bitmaps: Dict[str, Dict[str, np.ndarray]] = {
+            dim: self._build_bitmaps(df[dim]) for dim in dimensions
+        }
+
+    def _build_bitmaps(self, column: pd.Series) -> Dict[str, np.ndarray]:
+        codes, uniques = pd.factorize(column, sort=True)
+        # Group row positions by value code once, then pack each group
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        bitmaps: Dict[str, np.ndarray] = {}
+        for code, value in enumerate(uniques):
+            rows = np.zeros(self._size, dtype=bool)
+            rows[order[bounds[code]:bounds[code + 1]]] = True
+            bitmaps[value] = np.packbits(rows)
+        return bitmaps
+
+    def __len__(self) -> int:
+        return self._size
+
+    def values(self, dimension: str) -> list:
+        """Get the indexed values of a dimension, in sorted order."""
+        return list(self._bitmaps[dimension])
+
+    def mask(self, filters: Optional[Filters] = None) -> np.ndarray:
+        """
+        Get a boolean row mask for the filter selections.
+
+        Args:
+            filters: Allowed values per dimension; unknown values match nothing.
+
+        Returns:
+            Boolean array with one entry per indexed row.
+        """
+        if not filters:
+            return np.ones(self._size, dtype=bool)
+        validate_dimensions(list(filters))
+
+        result: Optional[np.ndarray] = None
+        for dim, values in filters.items():
+            bitmaps = self._bitmaps[dim]
+            selected = [bitmaps[value] for value in values if value in bitmaps]
+            dim_bits = np.bitwise_or.reduce(selected) if selected else self._empty
+            result = dim_bits if result is None else result & dim_bits
+        return np.unpackbits(result, count=self._size).astype(bool)
+
+    def apply(self, df: pd.DataFrame, filters: Optional[Filters] = None) -> pd.DataFrame:
+        """
+        Filter the indexed DataFrame with the filter selections.
+
+        Args:
+            df: The same DataFrame the index was built from.
+            filters: Allowed values per dimension.
+
+        Returns:
+            Filtered DataFrame.
+        """
+        if not filters:
+            return df
+        return df[self.mask(filters)]
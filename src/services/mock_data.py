@@ -1,8 +1,37 @@
 import pandas as pd
-from src.services.base_data import DataProvider
+from typing import Optional, Sequence
+from src.config import Config
+from src.services.aggregation import aggregate_frame
+from src.services.base_data import DataProvider, Filters
+from src.services.synthetic import SyntheticSpec, generate_vaccine_data
+
+
+def _configured_spec() -> Optional[SyntheticSpec]:
+    """Get the synthetic dataset configured through MOCK_ROWS, if any."""
+    if Config.MOCK_ROWS <= 0:
+        return None
+    return SyntheticSpec(
+        rows=Config.MOCK_ROWS,
+        countries=Config.MOCK_COUNTRIES,
+        approaches=Config.MOCK_APPROACHES,
+        stages=Config.MOCK_STAGES,
+        skew=Config.MOCK_SKEW,
+        seed=Config.MOCK_SEED,
+    )
+
 
 class MockDataProvider(DataProvider):
+    def __init__(self, spec: Optional[SyntheticSpec] = None):
+        """
+        Args:
+            spec: Synthetic dataset to serve; defaults to the one configured via
+                MOCK_ROWS, or the built-in sample rows when that is 0.
+        """
+        self.spec = spec or _configured_spec()
+
     def get_vaccine_data(self) -> pd.DataFrame:
+        if self.spec is not None:
+            return generate_vaccine_data(self.spec)
         data = [
             {"Country": "USA", "Approach": "mRNA", "Stage": "Authorized", "Candidates": 2},
             {"Country": "USA", "Approach": "Protein Subunit", "Stage": "Phase III", "Candidates": 5},
@@ -26,3 +55,7 @@ class MockDataProvider(DataProvider):
             {"Country": "Japan", "Approach": "DNA", "Stage": "Phase I/II", "Candidates": 3},
         ]
         return pd.DataFrame(data)
+
+    def get_aggregated_data(self, group_by: Sequence[str], filters: Optional[Filters] = None) -> pd.DataFrame:
+        """Aggregates the mock rows in pandas, matching the SQL pushdown."""
+        return aggregate_frame(self.get_vaccine_data(), group_by, filters)
@@ -0,0 +1,168 @@
+"""
+Normalization of provider output into the compact dataset representation.
+Validates the frame against the VaccineCandidate schema and shrinks dtypes.
+"""
+import logging
+from dataclasses import dataclass, fields
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.domain.models import FIELD_COLUMNS, VaccineCandidate
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaError(ValueError):
+    """Raised when provider data does not match the VaccineCandidate schema."""
+
+
+@dataclass(frozen=True)
+class NormalizationReport:
+    """Memory footprint of a frame before and after normalization."""
+    rows: int
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def ratio(self) -> float:
+        """Normalized size as a fraction of the original size."""
+        return self.bytes_after / self.bytes_before if self.bytes_before else 1.0
+
+
+def _normalize_dimension(series: pd.Series) -> pd.Series:
+    """Convert a string column to an ordered categorical with sorted categories."""
+    if series.isna().any():
+        raise SchemaError(f"Column '{series.name}' contains missing values")
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Recode the categories only, instead of materializing every value as a string
+        used = np.bincount(series.cat.codes.to_numpy(), minlength=len(series.cat.categories)) > 0
+        values = series.cat.rename_categories(series.cat.categories.astype(str))
+        return values.cat.set_categories(sorted(values.cat.categories[used]), ordered=True)
+    values = series.astype(str)
+    return values.astype(pd.CategoricalDtype(sorted(values.unique()), ordered=True))
+
+
+def _normalize_count(series: pd.Series) -> pd.Series:
+    """Convert a count column to the smallest signed integer dtype that fits."""
+    numeric = pd.to_numeric(series, errors="coerce")
+    if numeric.isna().any():
+        raise SchemaError(f"Column '{series.name}' must contain whole numbers only")
+    if (numeric % 1 != 0).any():
+        raise SchemaError(f"Column '{series.name}' must contain whole numbers only")
+    if (numeric < 0).any():
+        raise SchemaError(f"Column '{series.name}' contains negative counts")
+    return pd.to_numeric(numeric.astype("int64"), downcast="integer")
+
+
+def _normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Validate a raw frame and convert its schema columns to compact dtypes."""
+    schema = {FIELD_COLUMNS[field.name]: field.type for field in fields(VaccineCandidate)}
+    missing = [column for column in schema if column not in df.columns]
+    if missing:
+        raise SchemaError(f"Missing column(s): {', '.join(missing)}")
+
+    return pd.DataFrame(
+        {
+            column: _normalize_dimension(df[column]) if field_type in (str, "str") else _normalize_count(df[column])
+            for column, field_type in schema.items()
+        }
+    )
+
+
+def align_categories(frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """
+    Give every categorical column the same sorted categories in all frames.
+
+    Frames with identical categorical dtypes concatenate without falling
+    back to object columns.
+
+    Args:
+        frames: Frames with the same categorical columns.
+
+    Returns:
+        Shallow copies of the frames with recoded categorical columns.
+    """
+    aligned = [frame.copy(deep=False) for frame in frames]
+    if not frames:
+        return aligned
+    columns = [column for column, dtype in frames[0].dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    for column in columns:
+        categories = sorted(set().union(*(frame[column].cat.categories for frame in frames)))
+        dtype = pd.CategoricalDtype(categories, ordered=True)
+        for frame in aligned:
+            frame[column] = frame[column].astype(dtype)
+    return aligned
+
+
+def _log_report(report: NormalizationReport) -> None:
+    logger.info(
+        "Normalized %d rows: %d -> %d bytes (%.0f%%)",
+        report.rows, report.bytes_before, report.bytes_after, report.ratio * 100,
+    )
+
+
+def normalize_vaccine_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, NormalizationReport]:
+    """
+    Validate provider output and convert it to the compact representation.
+
+    String fields of VaccineCandidate become categorical columns and integer
+    fields use the smallest fitting integer dtype. Extra columns are dropped;
+    the index is kept, so providers can supply row ids for incremental refresh.
+
+    Args:
+        df: Raw DataFrame returned by a data provider.
+
+    Returns:
+        Tuple of (normalized DataFrame, memory report).
+
+    Raises:
+        SchemaError: If columns are missing or values do not fit the schema.
+    """
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    normalized = _normalize_frame(df)
+    report = NormalizationReport(
+        rows=len(normalized),
+        bytes_before=bytes_before,
+        bytes_after=int(normalized.memory_usage(deep=True).sum()),
+    )
+    _log_report(report)
+    return normalized, report
+
+
+def normalize_vaccine_chunks(chunks: Iterable[pd.DataFrame]) -> Tuple[pd.DataFrame, NormalizationReport]:
+    """
+    Normalize provider output that arrives in chunks.
+
+    Each raw chunk is converted to the compact representation as soon as it
+    arrives and then released, so at most one raw chunk is held in memory
+    next to the compact rows loaded so far.
+
+    Args:
+        chunks: Raw DataFrames returned by a data provider, in order.
+
+    Returns:
+        Tuple of (normalized DataFrame, memory report).
+
+    Raises:
+        SchemaError: If columns are missing or values do not fit the schema.
+    """
+    parts: List[pd.DataFrame] = []
+    bytes_before = 0
+    for chunk in chunks:
+        bytes_before += int(chunk.memory_usage(deep=True).sum())
+        parts.append(_normalize_frame(chunk))
+    if not parts:
+        raise SchemaError("Provider returned no data chunks")
+
+    # Positional chunk indexes restart at 0; provider row ids are kept as is
+    ignore_index = isinstance(parts[0].index, pd.RangeIndex)
+    normalized = pd.concat(align_categories(parts), ignore_index=ignore_index) if len(parts) > 1 else parts[0]
+    report = NormalizationReport(
+        rows=len(normalized),
+        bytes_before=bytes_before,
+        bytes_after=int(normalized.memory_usage(deep=True).sum()),
+    )
+    _log_report(report)
+    return normalized, report
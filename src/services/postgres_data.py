@@ -1,31 +1,224 @@
 import pandas as pd
-from sqlalchemy import create_engine
-from src.services.base_data import DataProvider
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import String, bindparam, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import TextClause
 from src.config import Config
+from src.services.base_data import DataDelta, DataProvider, Filters, MEASURE, validate_dimensions
+from src.services.db_engine import connection, get_engine
+
+# Dashboard column name -> database column name
+COLUMN_MAP = {
+    "Country": "country",
+    "Approach": "approach",
+    "Stage": "stage",
+    "Candidates": "candidate_count",
+}
+
+# Latest change and latest deletion seen, None while a table is empty, and the
+# probe time while the latest of them is within the lookback window
+Watermark = Tuple[Optional[Any], Optional[Any], Optional[Any]]
+
+_ROW_COLUMNS = """
+        country AS "Country",
+        approach AS "Approach",
+        stage AS "Stage",
+        candidate_count AS "Candidates"
+"""
+_SELECT_ROWS = f"SELECT {_ROW_COLUMNS} FROM vaccine_candidates"
+_SELECT_ROWS_BY_ID = f"SELECT id, {_ROW_COLUMNS} FROM vaccine_candidates"
+
+# Both maxima are answered from the updated_at / deleted_at indexes
+_WATERMARK_QUERY = """
+    SELECT
+        updated_at,
+        deleted_at,
+        CASE WHEN GREATEST(updated_at, deleted_at) > now() - make_interval(secs => :lookback)
+            THEN now() END AS settling_at
+    FROM (
+        SELECT
+            (SELECT MAX(updated_at) FROM vaccine_candidates) AS updated_at,
+            (SELECT MAX(deleted_at) FROM vaccine_candidates_deleted) AS deleted_at
+    ) AS latest
+"""
+
+
+def build_aggregate_query(group_by: Sequence[str], filters: Optional[Filters] = None) -> TextClause:
+    """
+    Build a parameterized GROUP BY query summing candidates.
+
+    Only known dimensions are interpolated into the SQL; selected values are
+    always passed as expanding bind parameters.
+
+    Args:
+        group_by: Dimensions to group by, in output column order.
+        filters: Allowed values per dimension; an empty list matches no rows.
+
+    Returns:
+        SQLAlchemy text clause with its bind parameters attached.
+    """
+    group_by = list(group_by)
+    filters = filters or {}
+    validate_dimensions(group_by + list(filters))
+
+    select_cols = [f'{COLUMN_MAP[col]} AS "{col}"' for col in group_by]
+    select_cols.append(f'SUM({COLUMN_MAP[MEASURE]}) AS "{MEASURE}"')
+
+    where: List[str] = []
+    params: Dict[str, Any] = {}
+    for i, (col, values) in enumerate(filters.items()):
+        name = f"f{i}"
+        where.append(f"{COLUMN_MAP[col]} IN :{name}")
+        params[name] = list(values)
+
+    sql = f"SELECT {', '.join(select_cols)} FROM vaccine_candidates"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if group_by:
+        group_cols = ", ".join(COLUMN_MAP[col] for col in group_by)
+        sql += f" GROUP BY {group_cols} ORDER BY {group_cols}"
+
+    query = text(sql)
+    if params:
+        query = query.bindparams(
+            *(bindparam(name, expanding=True, type_=String()) for name in params)
+        ).bindparams(**params)
+    return query
+
+
+def read_sql_chunks(
+    conn: Connection,
+    sql: str,
+    chunk_size: int,
+    index_col: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a query result as DataFrames of at most `chunk_size` rows.
+
+    Uses a server-side cursor, so neither the driver nor pandas ever buffers
+    more than one chunk of the result.
+
+    Args:
+        conn: Open connection; it must stay open while the chunks are consumed.
+        sql: Query to run.
+        chunk_size: Rows fetched from the server per chunk.
+        index_col: Column to use as the index of each chunk.
+
+    Yields:
+        One DataFrame per fetched chunk.
+    """
+    streaming = conn.execution_options(stream_results=True, max_row_buffer=chunk_size)
+    yield from pd.read_sql(text(sql), streaming, index_col=index_col, chunksize=chunk_size)
+
 
 class PostgresDataProvider(DataProvider):
     def __init__(self):
-        self.db_url = Config.get_database_url()
-        self.engine = create_engine(self.db_url)
+        # The engine and its pool are shared by every provider in the process
+        self.engine = get_engine()
+        self.incremental = Config.DB_INCREMENTAL_REFRESH
+        self.lookback = timedelta(seconds=Config.DB_INCREMENTAL_LOOKBACK_SECONDS)
+        self.chunk_size = Config.DB_FETCH_CHUNK_SIZE
+
+    def _rows_query(self) -> Tuple[str, Optional[str]]:
+        """Get the full-table query and its index column for the current mode."""
+        if self.incremental:
+            return _SELECT_ROWS_BY_ID, "id"
+        return _SELECT_ROWS, None
 
     def get_vaccine_data(self) -> pd.DataFrame:
         """
         Fetches data from the database. 
         Assumes a table 'vaccine_candidates' exists with columns:
         country, approach, stage, candidate_count
+
+        In incremental mode rows are also indexed by their 'id' column.
         """
-        query = """
-            SELECT
-                country AS "Country",
-                approach AS "Approach",
-                stage AS "Stage",
-                candidate_count AS "Candidates"
-            FROM
-                vaccine_candidates
-        """
+        query, index_col = self._rows_query()
         try:
-            return pd.read_sql(query, self.engine)
+            with connection() as conn:
+                return pd.read_sql(text(query), conn, index_col=index_col)
         except Exception as e:
             # Fallback or error handling for production
             # For now, we allow it to crash so the issue is visible, or return empty
             raise RuntimeError(f"Failed to fetch data from Postgres: {e}")
+
+    def iter_vaccine_data(self) -> Iterator[pd.DataFrame]:
+        """
+        Streams the same rows as get_vaccine_data in chunks of `chunk_size` rows.
+
+        With a chunk size of 0 the whole result is returned as a single chunk.
+        """
+        if self.chunk_size <= 0:
+            yield self.get_vaccine_data()
+            return
+        query, index_col = self._rows_query()
+        try:
+            with connection() as conn:
+                yield from read_sql_chunks(conn, query, self.chunk_size, index_col)
+        except Exception as e:
+            raise RuntimeError(f"Failed to stream data from Postgres: {e}")
+
+    def get_aggregated_data(self, group_by: Sequence[str], filters: Optional[Filters] = None) -> pd.DataFrame:
+        """
+        Sums candidates in the database, so only grouped rows are transferred.
+        """
+        query = build_aggregate_query(group_by, filters)
+        try:
+            with connection() as conn:
+                return pd.read_sql(query, conn)
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch aggregated data from Postgres: {e}")
+
+    def get_watermark(self) -> Optional[Watermark]:
+        """
+        Probes for changes with one index-only query; None outside incremental mode.
+
+        Requires an indexed 'updated_at' column maintained on insert and update,
+        and a 'vaccine_candidates_deleted(id, deleted_at)' tombstone table.
+
+        A transaction can commit after one with a later timestamp, so a new
+        row may not move the maxima. While the latest change is younger than
+        the lookback window the watermark also holds the probe time, so each
+        probe counts as a change and get_changes re-reads the window.
+        """
+        if not self.incremental:
+            return None
+        try:
+            with connection() as conn:
+                row = conn.execute(
+                    text(_WATERMARK_QUERY), {"lookback": self.lookback.total_seconds()},
+                ).one()
+        except Exception as e:
+            raise RuntimeError(f"Failed to probe Postgres for changes: {e}")
+        return row.updated_at, row.deleted_at, row.settling_at
+
+    def get_changes(self, since: Watermark) -> DataDelta:
+        """
+        Fetches rows updated and ids deleted since the lookback window before
+        the watermark.
+
+        Rows in the window are fetched again on later refreshes, which is
+        harmless because merging an upsert or deletion twice has no further
+        effect. Changes that commit more than the lookback window after
+        their timestamp are missed until the next full load.
+        """
+        # Watermarks restored from older snapshots have no probe time
+        updated_since, deleted_since = since[:2]
+        upserts_sql = _SELECT_ROWS_BY_ID
+        deleted_sql = "SELECT id FROM vaccine_candidates_deleted"
+        upsert_params: Dict[str, Any] = {}
+        deleted_params: Dict[str, Any] = {}
+        if updated_since is not None:
+            upserts_sql += " WHERE updated_at >= :updated_since"
+            upsert_params["updated_since"] = updated_since - self.lookback
+        if deleted_since is not None:
+            deleted_sql += " WHERE deleted_at >= :deleted_since"
+            deleted_params["deleted_since"] = deleted_since - self.lookback
+        try:
+            with connection() as conn:
+                upserts = pd.read_sql(text(upserts_sql), conn, params=upsert_params, index_col="id")
+                deleted = pd.read_sql(text(deleted_sql), conn, params=deleted_params)
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch changes from Postgres: {e}")
+        return DataDelta(upserts=upserts, deleted_ids=pd.Index(deleted["id"]))
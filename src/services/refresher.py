@@ -0,0 +1,185 @@
+"""
+Background refresh of the shared dataset snapshot.
+Reloads the DatasetCache on a timer so sessions never wait on the provider.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+from src.services.dataset_cache import DatasetCache
+
+logger = logging.getLogger(__name__)
+
+BreakerState = Literal["closed", "open", "half-open"]
+
+
+class CircuitBreaker:
+    """
+    Stops hammering a failing provider with reload attempts.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    reload attempts are skipped, with the wait between attempts doubling
+    from `retry_base_seconds` up to `retry_max_seconds`. Once the wait has
+    passed one trial attempt is allowed (half-open); success closes it.
+    """
+
+    def __init__(self, failure_threshold: int, retry_base_seconds: float, retry_max_seconds: float):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the breaker.
+            retry_base_seconds: Wait before the first trial attempt once open.
+            retry_max_seconds: Upper bound for the backoff between trial attempts.
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def failures(self) -> int:
+        """Consecutive failures since the last success."""
+        return self._failures
+
+    def retry_delay(self) -> float:
+        """Seconds to wait before the next trial attempt while open."""
+        excess = max(0, self._failures - self.failure_threshold)
+        return min(self.retry_max_seconds, self.retry_base_seconds * (2 ** excess))
+
+    @property
+    def state(self) -> BreakerState:
+        """Current breaker state."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.retry_delay():
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a reload attempt may be made now."""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+@dataclass(frozen=True)
+class RefresherStatus:
+    """Snapshot of the background refresher's health."""
+    running: bool
+    breaker_state: BreakerState
+    consecutive_failures: int
+    last_attempt_at: Optional[float]
+    last_success_at: Optional[float]
+    last_error: Optional[str]
+
+
+class BackgroundRefresher:
+    """
+    Daemon thread that reloads a DatasetCache every `interval_seconds`.
+
+    Sessions keep being served the previous snapshot while a reload runs
+    (stale-while-revalidate) and when it fails (stale-if-error); the
+    circuit breaker spaces out attempts while the provider is down.
+    """
+
+    def __init__(self, cache: DatasetCache, interval_seconds: float, breaker: CircuitBreaker):
+        """
+        Args:
+            cache: Cache to keep fresh.
+            interval_seconds: Time between successful reloads.
+            breaker: Circuit breaker guarding reload attempts.
+        """
+        self.cache = cache
+        self.interval_seconds = interval_seconds
+        self.breaker = breaker
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_attempt_at: Optional[float] = None
+        self._last_success_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    def start(self) -> "BackgroundRefresher":
+        """Start the refresh thread if it is not already running."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="dataset-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signal the refresh thread to exit and wait for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def refresh_once(self, if_stale: bool = False) -> bool:
+        """
+        Attempt one reload if the breaker allows it.
+
+        Args:
+            if_stale: Skip the reload when the cached snapshot is still fresh.
+
+        Returns:
+            True if the cache holds a snapshot confirmed by the provider.
+        """
+        if not self.breaker.allow():
+            return False
+        self._last_attempt_at = time.time()
+        try:
+            self.cache.refresh(if_stale=if_stale)
+        except Exception as e:
+            self._last_error = str(e)
+            self.breaker.record_failure()
+            logger.warning(
+                "Background refresh failed (%d consecutive, breaker %s): %s",
+                self.breaker.failures, self.breaker.state, e,
+            )
+            return False
+        self._last_success_at = self._last_attempt_at
+        self._last_error = None
+        self.breaker.record_success()
+        return True
+
+    def _next_delay(self) -> float:
+        """Seconds until the next attempt is due."""
+        if self.breaker.failures == 0:
+            snapshot = self.cache.snapshot
+            # Revalidate a snapshot restored from disk straight away
+            if snapshot is None or snapshot.restored:
+                return 0.0
+            return max(0.0, self.interval_seconds - snapshot.age_seconds)
+        if self.breaker.failures < self.breaker.failure_threshold:
+            return self.breaker.retry_base_seconds
+        return self.breaker.retry_delay()
+
+    def _run(self) -> None:
+        # The first session usually starts the thread while loading the
+        # dataset itself, so don't repeat that load once it has finished
+        first = True
+        while not self._stop.wait(self._next_delay()):
+            self.refresh_once(if_stale=first)
+            first = False
+
+    def status(self) -> RefresherStatus:
+        """Get the refresher's current health."""
+        return RefresherStatus(
+            running=self._thread is not None and self._thread.is_alive(),
+            breaker_state=self.breaker.state,
+            consecutive_failures=self.breaker.failures,
+            last_attempt_at=self._last_attempt_at,
+            last_success_at=self._last_success_at,
+            last_error=self._last_error,
+        )
@@ -0,0 +1,62 @@
+"""
+Registry of data provider back ends, keyed by Config.DATA_SOURCE.
+Provider modules are imported on first use, so unused back ends (and their
+drivers) never load.
+"""
+import importlib
+from typing import Dict, Optional, Type
+
+from src.config import Config
+from src.services.base_data import DataProvider
+
+# DATA_SOURCE name -> "module:ClassName"
+_PROVIDERS: Dict[str, str] = {
+    "MOCK": "src.services.mock_data:MockDataProvider",
+    "POSTGRES": "src.services.postgres_data:PostgresDataProvider",
+    "FILE": "src.services.file_data:FileDataProvider",
+}
+
+
+def register_provider(name: str, target: str) -> None:
+    """
+    Register a provider back end.
+
+    Args:
+        name: DATA_SOURCE value selecting the provider.
+        target: Import path of the provider class, as "module:ClassName".
+    """
+    _PROVIDERS[name.upper()] = target
+
+
+def available_providers() -> list:
+    """Get the registered DATA_SOURCE names."""
+    return sorted(_PROVIDERS)
+
+
+def get_provider_class(name: str) -> Type[DataProvider]:
+    """
+    Import and return the provider class registered under a name.
+
+    Args:
+        name: DATA_SOURCE value, case-insensitive.
+
+    Raises:
+        ValueError: If no provider is registered under the name.
+    """
+    target = _PROVIDERS.get(name.upper())
+    if target is None:
+        raise ValueError(
+            f"Unknown DATA_SOURCE '{name}'. Expected one of: {', '.join(available_providers())}"
+        )
+    module_name, class_name = target.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_provider(name: Optional[str] = None) -> DataProvider:
+    """
+    Build the provider selected by name, or by Config.DATA_SOURCE.
+
+    Args:
+        name: DATA_SOURCE value; defaults to the configured one.
+    """
+    return get_provider_class(name or Config.DATA_SOURCE)()
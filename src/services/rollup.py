@@ -0,0 +1,101 @@
+"""
+Precomputed (Country, Approach, Stage) rollup of the vaccine dataset.
+Answers filtered group-by queries from the cube instead of raw rows.
+"""
+from typing import Dict, Optional, Sequence
+
+import pandas as pd
+
+from src.services.aggregation import aggregate_frame
+from src.services.base_data import DIMENSIONS, MEASURE, Filters
+from src.services.filter_index import BitmapIndex
+
+
+def _recode(df: pd.DataFrame, categories: Dict[str, pd.Index]) -> pd.DataFrame:
+    """Recode categorical columns to new categories; values not in them become missing."""
+    return df.assign(
+        **{column: df[column].cat.set_categories(values, ordered=True) for column, values in categories.items()}
+    )
+
+
+class RollupCube:
+    """
+    Candidates summed per distinct (Country, Approach, Stage) combination.
+
+    The cube is bounded by the dimension cardinalities, so queries cost the
+    same no matter how many raw rows the dataset has.
+    """
+
+    def __init__(self, cells: pd.DataFrame):
+        """
+        Args:
+            cells: One row per dimension combination, with a 'Candidates' total.
+        """
+        self.cells = cells.reset_index(drop=True)
+        self.index = BitmapIndex(self.cells)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "RollupCube":
+        """Build the cube by grouping raw rows once."""
+        return cls(aggregate_frame(df, DIMENSIONS))
+
+    def apply_delta(self, removed: pd.DataFrame, added: pd.DataFrame) -> "RollupCube":
+        """
+        Build the cube for a dataset with some rows replaced.
+
+        Only the cube cells and the changed rows are regrouped, never the
+        full dataset. Cells whose total drops to zero are removed, as are
+        cells for values missing from the categories of `added`.
+
+        Args:
+            removed: Previous values of the rows that were updated or deleted.
+            added: Current values of the rows that were inserted or updated,
+                with the dimension categories of the merged dataset.
+
+        Returns:
+            New cube; this one is left unchanged.
+        """
+        categories = {dim: added[dim].cat.categories for dim in DIMENSIONS}
+        removed_cells = aggregate_frame(_recode(removed, categories), DIMENSIONS)
+        removed_cells[MEASURE] = -removed_cells[MEASURE]
+        cells = aggregate_frame(
+            pd.concat(
+                [_recode(self.cells, categories), removed_cells, aggregate_frame(added, DIMENSIONS)],
+                ignore_index=True,
+            ),
+            DIMENSIONS,
+        )
+        return RollupCube(cells[cells[MEASURE] != 0])
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def slice(self, filters: Optional[Filters] = None) -> pd.DataFrame:
+        """
+        Get the cube cells matching the filter selections.
+
+        Args:
+            filters: Allowed values per dimension.
+
+        Returns:
+            DataFrame with all dimension columns and 'Candidates'.
+        """
+        return self.index.apply(self.cells, filters)
+
+    def query(self, group_by: Sequence[str], filters: Optional[Filters] = None) -> pd.DataFrame:
+        """
+        Sum Candidates per group for the filter selections.
+
+        Args:
+            group_by: Dimensions to group by, in output column order.
+            filters: Allowed values per dimension.
+
+        Returns:
+            DataFrame with the group_by columns and a 'Candidates' column.
+        """
+        return aggregate_frame(self.slice(filters), group_by)
+
+    @property
+    def total(self) -> int:
+        """Sum of Candidates across the whole cube."""
+        return int(self.cells[MEASURE].sum())
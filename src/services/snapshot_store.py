@@ -0,0 +1,183 @@
+"""
+On-disk Arrow IPC copy of the latest dataset snapshot.
+Lets restarted processes and replicas on the same host start from the last
+loaded dataset instead of waiting for a full provider load.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Hashable, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout changes; older files are ignored
+SNAPSHOT_FORMAT = 2
+
+_METADATA_KEY = b"dashboard_snapshot"
+
+
+@dataclass(frozen=True)
+class StoredSnapshot:
+    """Dataset read back from disk, with the tags it was saved with."""
+    data: pd.DataFrame
+    cube_cells: Optional[pd.DataFrame]
+    version: int
+    loaded_at: float
+    watermark: Optional[Hashable]
+
+
+def _encode(value: Any) -> Any:
+    """Convert a watermark to JSON-compatible values, tagging datetimes."""
+    if isinstance(value, (tuple, list)):
+        return {"tuple": [_encode(item) for item in value]}
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Reverse _encode."""
+    if isinstance(value, dict):
+        if "tuple" in value:
+            return tuple(_decode(item) for item in value["tuple"])
+        if "datetime" in value:
+            return datetime.fromisoformat(value["datetime"])
+        if "date" in value:
+            return date.fromisoformat(value["date"])
+    return value
+
+
+class SnapshotStore:
+    """
+    Persists the normalized dataset and its rollup cells as uncompressed
+    Arrow IPC files.
+
+    Files are written to a temporary name and renamed into place, so readers
+    in other processes only ever see complete files; the dataset file is
+    renamed last. Reads memory-map the files and the loaded frames are views
+    of the mapped pages, so processes on one host share one copy of the
+    dataset through the page cache. Files are tagged with a fingerprint of
+    the source settings and ignored when it does not match.
+    """
+
+    def __init__(self, directory: str, name: str, fingerprint: str = ""):
+        """
+        Args:
+            directory: Directory holding the snapshot files; created on first save.
+            name: File name stem, e.g. the data source, so sources never mix.
+            fingerprint: Settings of the source the data comes from, e.g.
+                Config.get_source_fingerprint().
+        """
+        self.directory = directory
+        self.fingerprint = fingerprint
+        self.path = os.path.join(directory, f"{name.lower()}.arrow")
+        self.cube_path = os.path.join(directory, f"{name.lower()}.cube.arrow")
+
+    def _write(self, path: str, frame: pd.DataFrame, tags: dict) -> None:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        table = pa.Table.from_pandas(frame)
+        table = table.replace_schema_metadata({**table.schema.metadata, _METADATA_KEY: json.dumps(tags)})
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            # mkstemp creates owner-only files; workers may run as other users
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _read(self, path: str) -> Optional[Tuple[pd.DataFrame, dict]]:
+        if not os.path.exists(path):
+            return None
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        try:
+            with pa.memory_map(path, "r") as source:
+                table = ipc.open_file(source).read_all()
+                tags = json.loads((table.schema.metadata or {}).get(_METADATA_KEY, b"{}"))
+                if tags.get("format") != SNAPSHOT_FORMAT:
+                    logger.info("Ignoring %s: snapshot format %s", path, tags.get("format"))
+                    return None
+                if tags.get("source") != self.fingerprint:
+                    logger.info("Ignoring %s: saved from another source (%s)", path, tags.get("source"))
+                    return None
+                # Without consolidating blocks every column stays a read-only
+                # view of the mapped file, which outlives the closed handle
+                return table.to_pandas(split_blocks=True), tags
+        except (OSError, ValueError, pa.ArrowException) as e:
+            logger.warning("Ignoring unreadable snapshot %s: %s", path, e)
+            return None
+
+    def save(
+        self,
+        data: pd.DataFrame,
+        cube_cells: pd.DataFrame,
+        version: int,
+        loaded_at: float,
+        watermark: Optional[Hashable],
+    ) -> None:
+        """
+        Write a dataset snapshot, replacing the previous files atomically.
+
+        Args:
+            data: Normalized dataset.
+            cube_cells: Cells of the rollup cube built from `data`.
+            version: Dataset version the snapshot was published as.
+            loaded_at: Unix time the dataset was loaded from the provider.
+            watermark: Provider watermark of the dataset, if any.
+        """
+        started = time.perf_counter()
+        tags = {
+            "format": SNAPSHOT_FORMAT,
+            "source": self.fingerprint,
+            "version": version,
+            "loaded_at": loaded_at,
+            "watermark": _encode(watermark),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        self._write(self.cube_path, cube_cells, tags)
+        self._write(self.path, data, tags)
+        logger.info(
+            "Saved dataset version %d to %s in %.3fs", version, self.path, time.perf_counter() - started,
+        )
+
+    def load(self) -> Optional[StoredSnapshot]:
+        """
+        Read the stored snapshot.
+
+        Returns:
+            The stored snapshot, or None if there is none or it cannot be used.
+            `cube_cells` is None when the cube file belongs to another save.
+        """
+        started = time.perf_counter()
+        stored = self._read(self.path)
+        if stored is None:
+            return None
+        data, tags = stored
+        cube = self._read(self.cube_path)
+        cube_cells = cube[0] if cube is not None and cube[1] == tags else None
+
+        logger.info(
+            "Read dataset version %d (%d rows) from %s in %.3fs",
+            tags["version"], len(data), self.path, time.perf_counter() - started,
+        )
+        return StoredSnapshot(
+            data=data,
+            cube_cells=cube_cells,
+            version=tags["version"],
+            loaded_at=tags["loaded_at"],
+            watermark=_decode(tags["watermark"]),
+        )
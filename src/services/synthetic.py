@@ -0,0 +1,92 @@
+"""
+Seeded synthetic vaccine data for benchmarks and load tests.
+Builds any number of rows with NumPy, directly as categorical codes.
+"""
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.services.countries import ISO3_COUNTRIES, iso3_code
+
+# Real values are used first, so small specs render like the real dataset
+_COUNTRIES = (
+    "USA", "China", "UK", "Germany", "Russia", "India", "Australia", "Canada", "France", "Brazil",
+    "Japan", "South Korea", "Italy", "Spain", "Netherlands", "Belgium", "Switzerland", "Sweden",
+    "Denmark", "Norway", "Finland", "Austria", "Israel", "Turkey", "Iran", "Egypt", "South Africa",
+    "Nigeria", "Kenya", "Argentina", "Chile", "Mexico", "Cuba", "Colombia", "Peru", "Thailand",
+    "Vietnam", "Indonesia", "Malaysia", "Singapore", "Philippines", "Pakistan", "Bangladesh",
+    "Saudi Arabia", "United Arab Emirates", "Kazakhstan", "Poland", "Czech Republic", "Hungary",
+    "Greece", "Portugal", "Ireland", "New Zealand",
+)
+# Then the rest of the ISO countries, so large specs still place on the map
+_COVERED = frozenset(map(iso3_code, _COUNTRIES))
+_COUNTRIES += tuple(name for name, code in ISO3_COUNTRIES if code not in _COVERED)
+_APPROACHES = (
+    "mRNA", "Protein Subunit", "Viral Vector", "Inactivated", "DNA", "Plant-based",
+    "Live Attenuated", "Virus-like Particle",
+)
+_STAGES = ("Pre-clinical", "Phase I", "Phase I/II", "Phase II", "Phase III", "Authorized")
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """
+    Shape of a synthetic dataset.
+
+    `skew` is the Zipf exponent of the value frequencies in every dimension:
+    0 draws values uniformly, 1 makes the k-th value about k times rarer
+    than the first.
+    """
+    rows: int = 100_000
+    countries: int = 50
+    approaches: int = 8
+    stages: int = 6
+    skew: float = 1.0
+    max_candidates: int = 10
+    seed: int = 0
+
+
+def _labels(real: Sequence[str], count: int, prefix: str) -> List[str]:
+    """Take `count` labels, padding the real ones with numbered placeholders."""
+    width = len(str(count))
+    return list(real[:count]) + [f"{prefix} {i:0{width}d}" for i in range(len(real) + 1, count + 1)]
+
+
+def _draw(rng: np.random.Generator, labels: List[str], rows: int, skew: float) -> pd.Categorical:
+    """Draw `rows` values with Zipf-distributed frequencies, as a categorical."""
+    weights = 1.0 / np.arange(1, len(labels) + 1) ** skew
+    codes = rng.choice(len(labels), size=rows, p=weights / weights.sum())
+    return pd.Categorical.from_codes(codes.astype(np.int32), categories=labels)
+
+
+def generate_vaccine_data(spec: SyntheticSpec = SyntheticSpec()) -> pd.DataFrame:
+    """
+    Generate a raw vaccine dataset.
+
+    The same spec always produces the same rows.
+
+    Args:
+        spec: Row count, dimension cardinalities, skew and seed.
+
+    Returns:
+        DataFrame with categorical Country, Approach and Stage columns and
+        integer Candidates between 1 and `spec.max_candidates`.
+
+    Raises:
+        ValueError: If a count is not positive or skew is negative.
+    """
+    counts = (spec.rows, spec.countries, spec.approaches, spec.stages, spec.max_candidates)
+    if min(counts) < 1:
+        raise ValueError(f"Synthetic row count and cardinalities must be positive: {spec}")
+    if spec.skew < 0:
+        raise ValueError(f"Synthetic skew must not be negative: {spec.skew}")
+
+    rng = np.random.default_rng(spec.seed)
+    return pd.DataFrame({
+        "Country": _draw(rng, _labels(_COUNTRIES, spec.countries, "Country"), spec.rows, spec.skew),
+        "Approach": _draw(rng, _labels(_APPROACHES, spec.approaches, "Approach"), spec.rows, spec.skew),
+        "Stage": _draw(rng, _labels(_STAGES, spec.stages, "Stage"), spec.rows, spec.skew),
+        "Candidates": rng.integers(1, spec.max_candidates + 1, spec.rows, dtype=np.int32),
+    })
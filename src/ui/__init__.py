@@ -1,16 +1,35 @@
 """UI package for Streamlit components."""
-from src.ui.sidebar import render_sidebar
+from src.ui.sidebar import (
+    render_filters,
+    render_settings,
+    render_export,
+    get_filter_options,
+    get_filter_selections,
+    get_selected_theme,
+    render_performance_panel,
+)
 from src.ui.components import (
     render_donut_chart,
     render_bar_chart,
     render_map,
     render_sunburst,
+    get_figure_cache_stats,
 )
+from src.ui.header import format_age, render_status_badges
 
 __all__ = [
-    "render_sidebar",
+    "render_filters",
+    "render_settings",
+    "render_export",
+    "get_filter_options",
+    "get_filter_selections",
+    "get_selected_theme",
+    "render_performance_panel",
     "render_donut_chart",
     "render_bar_chart",
     "render_map",
     "render_sunburst",
+    "get_figure_cache_stats",
+    "format_age",
+    "render_status_badges",
 ]
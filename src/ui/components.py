@@ -2,24 +2,170 @@
 Chart components for the COVID-19 Vaccine Dashboard.
 Provides Plotly-based visualizations with theme support.
 """
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 import streamlit as st
-import plotly.express as px
 import pandas as pd
-from typing import Literal
+from typing import TYPE_CHECKING, Callable, Dict, Literal, Mapping, Optional, Tuple
+from src import perf
+from src.config import Config
+from src.services.aggregation import OTHER_LABEL, TailPolicy, fold_tail
+
+# Plotly is imported by the figure builders on first use to keep it off the
+# startup path; module imports are cached, so later calls are a dict lookup.
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 ThemeType = Literal["Dark", "Light"]
 
 
+@dataclass(frozen=True)
+class FigureCacheStats:
+    """Counters describing how the figure cache has been used."""
+    hits: int
+    misses: int
+    size: int
+    max_entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class FigureCache:
+    """
+    Bounded, thread-safe LRU cache of built Plotly figures.
+
+    Figures are keyed by chart name, theme configuration and a content hash
+    of the aggregated input, so unchanged charts skip plotly.express entirely.
+    Cached figures are shared across sessions and must not be mutated. The
+    serialized size of each figure is measured once, when it is built.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._figures: "OrderedDict[str, go.Figure]" = OrderedDict()
+        self._payload_bytes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(chart: str, data: pd.DataFrame, config: dict) -> str:
+        """
+        Build a stable key for a chart's input data and theme configuration.
+
+        Args:
+            chart: Chart identifier.
+            data: Aggregated DataFrame the figure is built from.
+            config: Theme configuration from _get_chart_config.
+
+        Returns:
+            Hex digest identifying the figure.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(chart.encode())
+        digest.update(json.dumps(config, sort_keys=True).encode())
+        digest.update("\x1f".join(map(str, data.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def get_or_build(self, key: str, build: Callable[[], "go.Figure"]) -> "go.Figure":
+        """
+        Return the cached figure for a key, building and storing it on a miss.
+
+        Args:
+            key: Key from make_key.
+            build: Callable building the figure.
+
+        Returns:
+            The cached or freshly built figure.
+        """
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                self._hits += 1
+                return fig
+            self._misses += 1
+
+        import plotly.io as pio
+
+        fig = build()
+        payload_bytes = len(pio.to_json(fig, validate=False))
+        with self._lock:
+            self._figures[key] = fig
+            self._payload_bytes[key] = payload_bytes
+            self._figures.move_to_end(key)
+            while len(self._figures) > self._max_entries:
+                evicted, _ = self._figures.popitem(last=False)
+                self._payload_bytes.pop(evicted, None)
+        return fig
+
+    def payload_bytes(self, key: str) -> Optional[int]:
+        """Get the serialized JSON size of a cached figure, if it is cached."""
+        with self._lock:
+            return self._payload_bytes.get(key)
+
+    def stats(self) -> FigureCacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return FigureCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                size=len(self._figures),
+                max_entries=self._max_entries,
+            )
+
+    def clear(self) -> None:
+        """Drop all cached figures."""
+        with self._lock:
+            self._figures.clear()
+            self._payload_bytes.clear()
+
+
+# Process-wide cache shared by every session
+_figure_cache = FigureCache(Config.FIGURE_CACHE_SIZE)
+
+
+def get_figure_cache_stats() -> FigureCacheStats:
+    """Get hit/miss statistics of the shared figure cache."""
+    return _figure_cache.stats()
+
+
+# Theme-neutral chart colors, restyled in the browser by the stylesheet's
+# custom properties when Config.THEME_MODE is CLIENT
+_CLIENT_THEME_CHART_CONFIG = {
+    "bg_color": "rgba(0,0,0,0)",
+    "template": "none",
+    "font_color": "#808080",
+    "grid_color": "#808080",
+    "land_color": "#808080",
+    "coastline_color": "#808080",
+}
+
+
 def _get_chart_config(theme: ThemeType) -> dict:
     """
     Get common chart configuration based on theme.
-    
+
+    In CLIENT theme mode every theme shares one neutral configuration, so
+    figures (and their cache entries) do not depend on the selected theme.
+
     Args:
         theme: The current theme name.
-        
+
     Returns:
         Dictionary with common chart configuration values.
     """
+    if Config.THEME_MODE == "CLIENT":
+        return dict(_CLIENT_THEME_CHART_CONFIG)
+
     is_dark = theme == "Dark"
     return {
         "bg_color": "rgba(0,0,0,0)",
@@ -31,68 +177,105 @@ def _get_chart_config(theme: ThemeType) -> dict:
     }
 
 
-def render_donut_chart(df: pd.DataFrame, theme: ThemeType = "Dark") -> None:
+# Dimension each chart folds into "Other", and how much of it is shown
+_CHART_TAILS: Dict[str, Tuple[str, TailPolicy]] = {
+    "donut": ("Stage", TailPolicy(Config.DONUT_TOP_N, Config.DONUT_MIN_SHARE)),
+    "bar": ("Stage", TailPolicy(Config.BAR_TOP_N, Config.BAR_MIN_SHARE)),
+    "map": ("Country", TailPolicy(Config.MAP_TOP_N, Config.MAP_MIN_SHARE)),
+    "sunburst": ("Country", TailPolicy(Config.SUNBURST_TOP_N, Config.SUNBURST_MIN_SHARE)),
+}
+
+
+def _render_cached_chart(
+    chart: str,
+    data: pd.DataFrame,
+    theme: ThemeType,
+    build: Callable[[pd.DataFrame, dict], "go.Figure"],
+) -> None:
     """
-    Render a donut chart showing vaccine candidates per phase.
-    
+    Draw a chart, reusing a cached figure when its inputs are unchanged.
+
+    The chart's tail is folded into "Other" only when the figure is built;
+    the policies are fixed per process, so the unfolded input keys the cache.
+
     Args:
-        df: DataFrame with vaccine data containing 'Stage' and 'Candidates' columns.
+        chart: Chart identifier used in the cache key.
+        data: Aggregated DataFrame the figure is built from.
         theme: The current theme ('Dark' or 'Light').
+        build: Function building the figure from data and chart config.
     """
-    st.markdown('<div class="chart-header">Vaccine Candidates per Phase</div>', unsafe_allow_html=True)
-    
-    if df.empty:
-        st.info("No data available")
-        return
-    
     config = _get_chart_config(theme)
-    phase_counts = df.groupby("Stage")["Candidates"].sum().reset_index()
-    
+    column, policy = _CHART_TAILS[chart]
+    built = []
+
+    def build_figure() -> "go.Figure":
+        built.append(chart)
+        return build(fold_tail(data, column, policy), config)
+
+    with perf.stage(f"chart.{chart}.build", rows=len(data)) as timing:
+        key = FigureCache.make_key(chart, data, config)
+        fig = _figure_cache.get_or_build(key, build_figure)
+        timing["cache_hit"] = not built
+    with perf.stage(f"chart.{chart}.serialize", payload_bytes=_figure_cache.payload_bytes(key)):
+        st.plotly_chart(fig, width="stretch")
+
+
+def _build_donut_figure(stage_totals: pd.DataFrame, config: dict) -> "go.Figure":
+    """Build the donut chart figure from Stage totals."""
+    import plotly.express as px
+
     fig = px.pie(
-        phase_counts, 
-        values="Candidates", 
-        names="Stage", 
+        stage_totals,
+        values="Candidates",
+        names="Stage",
         hole=0.6,
         color_discrete_sequence=px.colors.qualitative.Prism
     )
-    
+
     fig.update_traces(textfont_color=config["font_color"])
     fig.update_layout(
         template=config["template"],
-        showlegend=False, 
+        showlegend=False,
         margin=dict(t=0, b=0, l=0, r=0),
         paper_bgcolor=config["bg_color"],
         plot_bgcolor=config["bg_color"],
         font=dict(color=config["font_color"])
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def render_bar_chart(df: pd.DataFrame, theme: ThemeType = "Dark") -> None:
+def render_donut_chart(stage_totals: pd.DataFrame, theme: ThemeType = "Dark") -> None:
     """
-    Render a bar chart showing vaccine candidates per phase.
-    
+    Render a donut chart showing vaccine candidates per phase.
+
     Args:
-        df: DataFrame with vaccine data containing 'Stage' and 'Candidates' columns.
+        stage_totals: Pre-aggregated DataFrame with 'Stage' and 'Candidates' columns.
         theme: The current theme ('Dark' or 'Light').
     """
     st.markdown('<div class="chart-header">Vaccine Candidates per Phase</div>', unsafe_allow_html=True)
-    
-    if df.empty:
+
+    if stage_totals.empty:
         st.info("No data available")
         return
-    
-    config = _get_chart_config(theme)
-    bar_data = df.groupby("Stage")["Candidates"].sum().reset_index().sort_values("Candidates", ascending=False)
-    
+
+    _render_cached_chart("donut", stage_totals, theme, _build_donut_figure)
+
+
+def _build_bar_figure(stage_totals: pd.DataFrame, config: dict) -> "go.Figure":
+    """Build the bar chart figure from Stage totals."""
+    import plotly.express as px
+
+    # Largest first, with the folded tail last
+    is_other = stage_totals["Stage"] == OTHER_LABEL
+    bar_data = pd.concat([stage_totals[~is_other].sort_values("Candidates", ascending=False), stage_totals[is_other]])
+
     fig = px.bar(
-        bar_data, 
-        x="Stage", 
+        bar_data,
+        x="Stage",
         y="Candidates",
         color_discrete_sequence=["#00CC96"]
     )
-    
+
     fig.update_traces(textfont_color=config["font_color"], marker_line_width=0)
     fig.update_layout(
         template=config["template"],
@@ -101,47 +284,82 @@ def render_bar_chart(df: pd.DataFrame, theme: ThemeType = "Dark") -> None:
         plot_bgcolor=config["bg_color"],
         font=dict(color=config["font_color"]),
         xaxis=dict(
-            showgrid=False, 
+            showgrid=False,
             tickfont=dict(color=config["font_color"]),
             title_font=dict(color=config["font_color"])
         ),
         yaxis=dict(
-            showgrid=True, 
-            gridcolor=config["grid_color"], 
+            showgrid=True,
+            gridcolor=config["grid_color"],
             tickfont=dict(color=config["font_color"]),
             title_font=dict(color=config["font_color"])
         )
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def render_map(df: pd.DataFrame, theme: ThemeType = "Dark") -> None:
+def render_bar_chart(stage_totals: pd.DataFrame, theme: ThemeType = "Dark") -> None:
     """
-    Render a choropleth map showing vaccine candidates by country.
-    
+    Render a bar chart showing vaccine candidates per phase.
+
     Args:
-        df: DataFrame with vaccine data containing 'Country' and 'Candidates' columns.
+        stage_totals: Pre-aggregated DataFrame with 'Stage' and 'Candidates' columns.
         theme: The current theme ('Dark' or 'Light').
     """
-    st.markdown('<div class="chart-header">Map of Vaccine Candidates</div>', unsafe_allow_html=True)
-    
-    if df.empty:
+    st.markdown('<div class="chart-header">Vaccine Candidates per Phase</div>', unsafe_allow_html=True)
+
+    if stage_totals.empty:
         st.info("No data available")
         return
-    
-    config = _get_chart_config(theme)
-    map_data = df.groupby("Country")["Candidates"].sum().reset_index()
-    
+
+    _render_cached_chart("bar", stage_totals, theme, _build_bar_figure)
+
+
+def _build_map_figure(
+    country_totals: pd.DataFrame,
+    config: dict,
+    iso3_codes: Optional[Mapping[str, str]] = None,
+    tail_folded: bool = False,
+) -> "go.Figure":
+    """
+    Build the choropleth map figure from Country totals.
+
+    With `iso3_codes` the countries are placed by ISO-3 code, and names
+    sharing a code are shown as one country; otherwise Plotly resolves the
+    names itself. A folded tail and countries without a code are noted below
+    the map.
+
+    Args:
+        country_totals: Pre-aggregated DataFrame with 'Country' and 'Candidates' columns.
+        config: Theme configuration from _get_chart_config.
+        iso3_codes: ISO-3 code of each Country value, from the dataset snapshot.
+        tail_folded: Whether fold_tail folded countries into the "Other" row;
+            otherwise an "Other" value is an ordinary, unplaceable country.
+    """
+    import plotly.express as px
+
+    is_other = (country_totals["Country"] == OTHER_LABEL) & tail_folded
+    if iso3_codes is None:
+        located, unplaced = country_totals[~is_other], 0
+        locations = dict(locations="Country", locationmode="country names")
+    else:
+        codes = country_totals["Country"].map(iso3_codes)
+        on_map = codes.notna() & ~is_other
+        unplaced = int(country_totals.loc[~on_map & ~is_other, "Candidates"].sum())
+        located = (
+            country_totals[on_map].assign(ISO3=codes[on_map])
+            .groupby("ISO3", as_index=False, sort=False)
+            .agg(Country=("Country", ", ".join), Candidates=("Candidates", "sum"))
+        )
+        locations = dict(locations="ISO3", locationmode="ISO-3", hover_name="Country")
     fig = px.choropleth(
-        map_data,
-        locations="Country",
-        locationmode="country names",
+        located,
         color="Candidates",
-        color_continuous_scale="Oranges", 
-        projection="natural earth"
+        color_continuous_scale="Oranges",
+        projection="natural earth",
+        **locations,
     )
-    
+
     fig.update_layout(
         template=config["template"],
         margin=dict(t=0, b=0, l=0, r=0),
@@ -149,6 +367,7 @@ def render_map(df: pd.DataFrame, theme: ThemeType = "Dark") -> None:
             bgcolor=config["bg_color"],
             showlakes=False,
             showocean=False,
+            showland=True,
             landcolor=config["land_color"],
             coastlinecolor=config["coastline_color"]
         ),
@@ -156,42 +375,93 @@ def render_map(df: pd.DataFrame, theme: ThemeType = "Dark") -> None:
         font=dict(color=config["font_color"]),
         coloraxis_colorbar=dict(
             orientation="h",
-            yanchor="top", 
-            y=-0.05, 
-            xanchor="center", 
+            yanchor="top",
+            y=-0.05,
+            xanchor="center",
             x=0.5,
             tickfont=dict(color=config["font_color"]),
             title=dict(font=dict(color=config["font_color"]))
         )
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    notes = []
+    if is_other.any():
+        notes.append(
+            f"{OTHER_LABEL}: {int(country_totals.loc[is_other, 'Candidates'].sum())} candidates in smaller countries"
+        )
+    if unplaced:
+        notes.append(f"{unplaced} candidates in countries that could not be placed on the map")
+    if notes:
+        fig.add_annotation(
+            text="<br>".join(notes),
+            x=0, y=0, xref="paper", yref="paper", showarrow=False, align="left",
+            font=dict(color=config["font_color"]),
+        )
+    return fig
 
 
-def render_sunburst(df: pd.DataFrame, theme: ThemeType = "Dark") -> None:
+def render_map(
+    country_totals: pd.DataFrame, theme: ThemeType = "Dark", iso3_codes: Optional[Mapping[str, str]] = None,
+) -> None:
     """
-    Render a sunburst chart showing country and clinical stages hierarchy.
-    
+    Render a choropleth map showing vaccine candidates by country.
+
     Args:
-        df: DataFrame with vaccine data containing 'Country', 'Stage', and 'Candidates' columns.
+        country_totals: Pre-aggregated DataFrame with 'Country' and 'Candidates' columns.
         theme: The current theme ('Dark' or 'Light').
+        iso3_codes: ISO-3 code of each Country value, resolved once per dataset
+            version; without it Plotly matches the country names on every build.
     """
-    st.markdown('<div class="chart-header">Sunburst of Country & Clinical Stages</div>', unsafe_allow_html=True)
-    
-    if df.empty:
+    st.markdown('<div class="chart-header">Map of Vaccine Candidates</div>', unsafe_allow_html=True)
+
+    if country_totals.empty:
         st.info("No data available")
         return
-    
-    config = _get_chart_config(theme)
-    
-    fig = px.sunburst(
-        df,
-        path=["Country", "Stage"],
-        values="Candidates",
-        color="Country",
-        color_discrete_sequence=px.colors.qualitative.Pastel
+
+    # The codes are fixed per Country value, so the figure cache key needs no change.
+    # fold_tail returns its input when nothing was folded.
+    _render_cached_chart(
+        "map", country_totals, theme,
+        lambda data, config: _build_map_figure(data, config, iso3_codes, tail_folded=data is not country_totals),
     )
-    
+
+
+def _sunburst_trace(country_stage_totals: pd.DataFrame) -> "go.Sunburst":
+    """
+    Build the Country -> Stage sunburst trace from pre-aggregated totals.
+
+    Args:
+        country_stage_totals: DataFrame with 'Country', 'Stage' and 'Candidates' columns.
+
+    Returns:
+        Sunburst trace with one node per country and per country/stage pair.
+    """
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    leaves = country_stage_totals.astype({"Country": str, "Stage": str})
+    countries = leaves.groupby("Country", sort=False)["Candidates"].sum()
+
+    palette = px.colors.qualitative.Pastel
+    country_colors = {country: palette[i % len(palette)] for i, country in enumerate(countries.index)}
+
+    leaf_ids = leaves["Country"] + "/" + leaves["Stage"]
+    return go.Sunburst(
+        ids=list(countries.index) + leaf_ids.tolist(),
+        labels=list(countries.index) + leaves["Stage"].tolist(),
+        parents=[""] * len(countries) + leaves["Country"].tolist(),
+        values=countries.tolist() + leaves["Candidates"].tolist(),
+        branchvalues="total",
+        marker=dict(colors=list(country_colors.values()) + leaves["Country"].map(country_colors).tolist()),
+        hovertemplate="%{label}<br>Candidates=%{value}<extra></extra>",
+    )
+
+
+def _build_sunburst_figure(country_stage_totals: pd.DataFrame, config: dict) -> "go.Figure":
+    """Build the sunburst figure from Country x Stage totals."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(_sunburst_trace(country_stage_totals))
+
     fig.update_traces(insidetextfont=dict(color=config["font_color"]))
     fig.update_layout(
         template=config["template"],
@@ -199,5 +469,21 @@ def render_sunburst(df: pd.DataFrame, theme: ThemeType = "Dark") -> None:
         paper_bgcolor=config["bg_color"],
         font=dict(color=config["font_color"])
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+
+def render_sunburst(country_stage_totals: pd.DataFrame, theme: ThemeType = "Dark") -> None:
+    """
+    Render a sunburst chart showing country and clinical stages hierarchy.
+
+    Args:
+        country_stage_totals: Pre-aggregated DataFrame with 'Country', 'Stage', and 'Candidates' columns.
+        theme: The current theme ('Dark' or 'Light').
+    """
+    st.markdown('<div class="chart-header">Sunburst of Country & Clinical Stages</div>', unsafe_allow_html=True)
+
+    if country_stage_totals.empty:
+        st.info("No data available")
+        return
+
+    _render_cached_chart("sunburst", country_stage_totals, theme, _build_sunburst_figure)
@@ -0,0 +1,42 @@
+"""
+Page header badges for the COVID-19 Vaccine Dashboard.
+Shows how old the served dataset snapshot is and whether reloading it is failing.
+"""
+from typing import Optional
+
+import streamlit as st
+
+
+def format_age(seconds: float) -> str:
+    """
+    Format an age in seconds as a short relative time.
+
+    Args:
+        seconds: Elapsed time in seconds.
+
+    Returns:
+        Text such as 'just now', '5 minutes ago' or '16 days ago'.
+    """
+    seconds = max(0, int(seconds))
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            count = seconds // size
+            return f"{count} {unit}{'s' if count != 1 else ''} ago"
+    return "just now"
+
+
+def render_status_badges(age_seconds: Optional[float], delayed: bool) -> None:
+    """
+    Render the 'Published' badge line with the dataset snapshot age.
+
+    Args:
+        age_seconds: Age of the snapshot being served, or None while no
+            snapshot has been loaded.
+        delayed: Whether the last reload failed, so the snapshot is kept
+            past its refresh interval.
+    """
+    age = "Not available" if age_seconds is None else format_age(age_seconds)
+    badges = f"`Published` `{age}`"
+    if delayed:
+        badges += " `Refresh delayed`"
+    st.markdown(badges, unsafe_allow_html=True)
@@ -1,78 +1,267 @@
 """
 Sidebar component for the COVID-19 Vaccine Dashboard.
 Handles filter controls, theme selection, and PDF export.
+
+Widget values live in st.session_state, so the chart fragments can read the
+current selection without the sidebar being re-rendered. Each filter group is
+a Select All toggle plus one searchable multiselect, so a group costs two
+widgets and two session-state keys however many values it has. In BATCHED
+filter mode the groups sit in a form: edits stay in the browser until Apply or
+a preset is clicked, so any number of edits costs one rerun.
 """
+import time
 import streamlit as st
 import pandas as pd
-from typing import Tuple, List, Literal
+from typing import Any, Callable, Dict, List, Literal, Optional
+from src.config import FilterModeType
+from src.perf import StageTiming
 
 ThemeType = Literal["Dark", "Light"]
+FilterOptions = Dict[str, List[str]]
+
+# (expander label, column name) for each filter group
+FILTER_GROUPS = [
+    ("Country", "Country"),
+    ("Vaccine Approach", "Approach"),
+    ("Clinical Stage", "Stage"),
+]
+
+# (preset, button label) shown above each group in BATCHED filter mode
+FILTER_PRESETS = [
+    ("all", "All"),
+    ("none", "None"),
+    ("invert", "Invert"),
+]
+
+THEME_KEY = "theme"
+FILTER_FORM_KEY = "filter_form"
+APPLY_KEY = "apply_filters"
+
 
+def _get_options(df: pd.DataFrame, column_name: str) -> List[str]:
+    """Get the sorted distinct values of a filter column."""
+    column = df[column_name]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Normalized data has exactly its used values as categories
+        return sorted(column.cat.categories)
+    return sorted(column.unique())
 
-def _checkbox_group(df: pd.DataFrame, label: str, column_name: str) -> List[str]:
+
+def get_filter_options(df: pd.DataFrame) -> FilterOptions:
     """
-    Render a checkbox group with Select All functionality.
-    
+    Get the sorted options of every filter group.
+
+    Meant to be computed once per dataset version and shared by all reruns.
+
     Args:
-        df: DataFrame containing the data.
-        label: Display label for the expander.
-        column_name: Column name to get unique values from.
-        
+        df: DataFrame containing the vaccine data.
+
     Returns:
-        List of selected option values.
+        Sorted distinct values keyed by column name.
     """
-    options = sorted(df[column_name].unique())
-    state_key = f"select_all_state_{column_name}"
-    
+    return {column_name: _get_options(df, column_name) for _, column_name in FILTER_GROUPS}
+
+
+def _toggle_key(column_name: str) -> str:
+    return f"toggle_all_{column_name}"
+
+
+def _selection_key(column_name: str) -> str:
+    return f"filter_{column_name}"
+
+
+def _selects_all(column_name: str) -> bool:
+    return st.session_state.get(_toggle_key(column_name), True)
+
+
+def _apply_preset(
+    options: List[str],
+    column_name: str,
+    preset: str,
+    on_change: Optional[Callable[[], None]] = None,
+) -> None:
+    """Set a group to a preset, on top of the edits submitted with it."""
+    selection_key = _selection_key(column_name)
+    if preset == "invert":
+        current = set(options) if _selects_all(column_name) else set(st.session_state.get(selection_key, ()))
+        st.session_state[selection_key] = [opt for opt in options if opt not in current]
+    elif preset == "none":
+        st.session_state[selection_key] = []
+    st.session_state[_toggle_key(column_name)] = preset == "all"
+    if on_change:
+        on_change()
+
+
+def _filter_group(
+    options: List[str],
+    label: str,
+    column_name: str,
+    on_change: Optional[Callable[[], None]] = None,
+    batched: bool = False,
+) -> None:
+    """
+    Render a Select All toggle and a searchable multiselect for one group.
+
+    In INSTANT mode the multiselect is shown once Select All is off and every
+    edit calls on_change. In BATCHED mode both are always shown inside the
+    filter form, together with preset buttons that submit it.
+
+    Args:
+        options: Sorted option values.
+        label: Display label for the expander.
+        column_name: Column name the options belong to.
+        on_change: Callback invoked when the group's selection changes.
+        batched: Whether the group is rendered inside the filter form.
+    """
+    toggle_key = _toggle_key(column_name)
+    selection_key = _selection_key(column_name)
+    callback = None if batched else on_change
+
+    # Initialize session state, dropping values missing from this dataset version
+    if toggle_key not in st.session_state:
+        st.session_state[toggle_key] = True
+    selected = st.session_state.get(selection_key)
+    if selected:
+        known = set(options)
+        if any(opt not in known for opt in selected):
+            st.session_state[selection_key] = [opt for opt in selected if opt in known]
+
     with st.expander(label, expanded=False):
-        # Initialize session state
-        if state_key not in st.session_state:
-            st.session_state[state_key] = True
-
-        selected_options: List[str] = []
-        
-        # Select All Toggle
-        if st.checkbox("Select All", value=st.session_state[state_key], key=f"toggle_all_{column_name}"):
-            st.session_state[state_key] = True
-            selected_options = list(options)
-        else:
-            st.session_state[state_key] = False
-            # Render individual checkboxes
-            for opt in options:
-                if st.checkbox(str(opt), value=False, key=f"chk_{column_name}_{opt}"):
-                    selected_options.append(opt)
-                    
-    return selected_options
+        if batched:
+            for column, (preset, preset_label) in zip(st.columns(len(FILTER_PRESETS)), FILTER_PRESETS):
+                column.form_submit_button(
+                    preset_label,
+                    key=f"{preset}_{column_name}",
+                    on_click=_apply_preset,
+                    args=(options, column_name, preset, on_change),
+                    width="stretch",
+                )
+        if st.checkbox("Select All", key=toggle_key, on_change=callback) and not batched:
+            return
+        st.multiselect(
+            label,
+            options,
+            key=selection_key,
+            on_change=callback,
+            placeholder="Search values",
+            label_visibility="collapsed",
+            help="Used while Select All is off" if batched else None,
+        )
 
 
-def render_sidebar(df: pd.DataFrame) -> Tuple[List[str], List[str], List[str], ThemeType]:
+def get_selected_options(options: List[str], column_name: str) -> List[str]:
     """
-    Render the sidebar with filters, theme selection, and export options.
-    
+    Get the options currently selected in a filter group.
+
     Args:
-        df: DataFrame containing the vaccine data.
-        
+        options: Sorted option values of the group.
+        column_name: Column name of the filter group.
+
+    Returns:
+        List of selected option values, in option order.
+    """
+    if _selects_all(column_name):
+        return options
+    selected = set(st.session_state.get(_selection_key(column_name), ()))
+    return [opt for opt in options if opt in selected]
+
+
+def get_filter_selections(options: FilterOptions) -> Dict[str, List[str]]:
+    """
+    Get the selection of every filter group that restricts the data.
+
+    Groups in Select All state match every row, so they are left out.
+
+    Args:
+        options: Filter options from get_filter_options.
+
     Returns:
-        Tuple of (selected_countries, selected_approaches, selected_stages, theme).
+        Selected values keyed by column name.
+    """
+    return {
+        column_name: get_selected_options(values, column_name)
+        for column_name, values in options.items()
+        if not _selects_all(column_name)
+    }
+
+
+def get_selected_theme() -> ThemeType:
+    """Get the theme chosen in the sidebar, defaulting to Dark."""
+    return st.session_state.get(THEME_KEY, "Dark")
+
+
+def render_filters(
+    options: FilterOptions,
+    on_change: Optional[Callable[[], None]] = None,
+    mode: FilterModeType = "INSTANT",
+) -> None:
     """
-    with st.sidebar:
-        st.header("Actions")
-        
-        # Filter Controls
-        selected_countries = _checkbox_group(df, "Country", "Country")
-        selected_approaches = _checkbox_group(df, "Vaccine Approach", "Approach")
-        selected_stages = _checkbox_group(df, "Clinical Stage", "Stage")
-        
-        st.markdown("---")
-        
-        # Theme Selection
-        st.subheader("Settings")
-        theme: ThemeType = st.radio("Theme", ["Dark", "Light"], index=0)
-        
-        st.markdown("---")
-        
-        # PDF Export
-        if st.button("Print / Save as PDF"):
-            st.components.v1.html("<script>window.parent.print()</script>", height=0, width=0)
-            
-        return selected_countries, selected_approaches, selected_stages, theme
+    Render the filter groups.
+
+    Args:
+        options: Filter options from get_filter_options.
+        on_change: Callback invoked when any filter changes.
+        mode: INSTANT applies every edit, BATCHED applies staged edits on
+            Apply or a preset.
+    """
+    st.header("Actions")
+    if mode != "BATCHED":
+        for label, column_name in FILTER_GROUPS:
+            _filter_group(options[column_name], label, column_name, on_change)
+        return
+
+    with st.form(FILTER_FORM_KEY, border=False):
+        for label, column_name in FILTER_GROUPS:
+            _filter_group(options[column_name], label, column_name, on_change, batched=True)
+        st.form_submit_button("Apply", key=APPLY_KEY, type="primary", on_click=on_change, width="stretch")
+
+
+def render_settings(on_theme_change: Optional[Callable[[], None]] = None) -> ThemeType:
+    """
+    Render the theme selection.
+
+    Args:
+        on_theme_change: Callback invoked when the theme changes.
+
+    Returns:
+        The selected theme.
+    """
+    st.markdown("---")
+    st.subheader("Settings")
+    return st.radio("Theme", ["Dark", "Light"], index=0, key=THEME_KEY, on_change=on_theme_change)
+
+
+def render_export() -> None:
+    """Render the PDF export button."""
+    st.markdown("---")
+    if st.button("Print / Save as PDF"):
+        st.components.v1.html("<script>window.parent.print()</script>", height=0, width=0)
+
+
+def _format_fields(fields: Dict[str, Any]) -> str:
+    return ", ".join(f"{name}={value}" for name, value in fields.items() if value is not None)
+
+
+def render_performance_panel(timings: Dict[str, StageTiming], cache_lines: List[str]) -> None:
+    """
+    Render the collapsed Performance panel with the latest stage timings.
+
+    Args:
+        timings: Latest measurement per stage, from src.perf.session_timings.
+        cache_lines: Extra one-line cache summaries shown under the table.
+    """
+    st.markdown("---")
+    with st.expander("Performance", expanded=False):
+        if not timings:
+            st.caption("No measurements yet")
+        else:
+            now = time.time()
+            rows = ["| stage | ms | age s | details |", "|---|---:|---:|---|"]
+            for timing in sorted(timings.values(), key=lambda t: t.stage):
+                rows.append(
+                    f"| {timing.stage} | {timing.ms:.1f} | {now - timing.recorded_at:.0f} "
+                    f"| {_format_fields(timing.fields)} |"
+                )
+            st.markdown("\n".join(rows))
+        for line in cache_lines:
+            st.caption(line)
@@ -1,6 +1,6 @@
 """Styles package for CSS and theme management."""
-from src.ui.styles.themes import get_theme, ThemeColors, ThemeType, DARK_THEME, LIGHT_THEME
-from src.ui.styles.style_manager import inject_styles
+from src.ui.styles.themes import get_theme, ThemeColors, ThemeType, DARK_THEME, LIGHT_THEME, THEMES
+from src.ui.styles.style_manager import inject_styles, inject_switchable_styles, apply_theme_client_side
 
 __all__ = [
     "get_theme",
@@ -8,5 +8,8 @@ __all__ = [
     "ThemeType",
     "DARK_THEME",
     "LIGHT_THEME",
+    "THEMES",
     "inject_styles",
+    "inject_switchable_styles",
+    "apply_theme_client_side",
 ]
@@ -2,16 +2,20 @@
 Style manager for injecting CSS into Streamlit.
 Handles theme-aware CSS generation and injection.
 """
+import json
+import re
 import streamlit as st
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Tuple
 
 if TYPE_CHECKING:
     from src.ui.styles.themes import ThemeColors
 
 
+@lru_cache(maxsize=None)
 def _load_css_file(filename: str) -> str:
-    """Load CSS content from a file in the styles directory."""
+    """Load CSS content from a file in the styles directory, once per process."""
     styles_dir = Path(__file__).parent
     css_path = styles_dir / filename
     if css_path.exists():
@@ -19,116 +23,141 @@ def _load_css_file(filename: str) -> str:
     return ""
 
 
-def _generate_theme_css(theme: "ThemeColors") -> str:
-    """Generate theme-specific CSS variables and rules."""
-    # Light theme specific overrides for sidebar toggle
-    light_toggle_override = ""
-    if theme.name == "Light":
-        light_toggle_override = f'''
+# Attribute on the parent document that selects the active theme client-side
+THEME_ATTRIBUTE = "data-dashboard-theme"
+
+
+def _theme_variables(theme: "ThemeColors") -> str:
+    """Get the CSS custom property declarations for a theme."""
+    return f"""
+        --dashboard-bg-color: {theme.bg_color};
+        --dashboard-text-color: {theme.text_color};
+        --dashboard-sidebar-bg: {theme.sidebar_bg};
+        --dashboard-sidebar-text-color: {theme.sidebar_text_color};
+        --dashboard-header-color: {theme.header_color};
+        --dashboard-border-color: {theme.border_color};
+        --dashboard-grid-color: {theme.grid_color};
+        --dashboard-land-color: {theme.land_color};
+        --dashboard-coastline-color: {theme.coastline_color};
+        --dashboard-toggle-bg: {theme.toggle_bg};
+        --dashboard-toggle-border: {theme.toggle_border};
+        --dashboard-toggle-icon: {theme.toggle_icon};
+    """
+
+
+def _generate_light_toggle_css(scope: str = "") -> str:
+    """
+    Generate the Light theme overrides for the sidebar toggle icon.
+    
+    Args:
+        scope: Selector prefix limiting the rules to the Light theme.
+    """
+    return f'''
         /* Light Theme: Force sidebar toggle icon visibility */
-        [data-testid="collapsedControl"] span,
-        [data-testid="stSidebarCollapsedControl"] span,
-        button[kind="header"] span {{
-            color: {theme.toggle_icon} !important;
+        {scope}[data-testid="collapsedControl"] span,
+        {scope}[data-testid="stSidebarCollapsedControl"] span,
+        {scope}button[kind="header"] span {{
+            color: var(--dashboard-toggle-icon) !important;
         }}
-        [data-testid="collapsedControl"]:hover span,
-        [data-testid="stSidebarCollapsedControl"]:hover span,
-        button[kind="header"]:hover span {{
+        {scope}[data-testid="collapsedControl"]:hover span,
+        {scope}[data-testid="stSidebarCollapsedControl"]:hover span,
+        {scope}button[kind="header"]:hover span {{
             color: #ff4b4b !important;
         }}
-        [data-testid="collapsedControl"] [class*="st-emotion-cache"],
-        [data-testid="stSidebarCollapsedControl"] [class*="st-emotion-cache"],
-        button[kind="header"] [class*="st-emotion-cache"] {{
-            color: {theme.toggle_icon} !important;
+        {scope}[data-testid="collapsedControl"] [class*="st-emotion-cache"],
+        {scope}[data-testid="stSidebarCollapsedControl"] [class*="st-emotion-cache"],
+        {scope}button[kind="header"] [class*="st-emotion-cache"] {{
+            color: var(--dashboard-toggle-icon) !important;
         }}
-        [data-testid="collapsedControl"]:hover [class*="st-emotion-cache"],
-        [data-testid="stSidebarCollapsedControl"]:hover [class*="st-emotion-cache"],
-        button[kind="header"]:hover [class*="st-emotion-cache"] {{
+        {scope}[data-testid="collapsedControl"]:hover [class*="st-emotion-cache"],
+        {scope}[data-testid="stSidebarCollapsedControl"]:hover [class*="st-emotion-cache"],
+        {scope}button[kind="header"]:hover [class*="st-emotion-cache"] {{
             color: #ff4b4b !important;
         }}
         '''
-    
-    return f'''
-    /* ===== THEME: {theme.name} ===== */
-    
+
+
+def _generate_theme_css() -> str:
+    """Generate the theme rules, colored through the CSS custom properties."""
+    return """
     /* Main App Background and Text */
-    .stApp {{
-        background-color: {theme.bg_color};
-        color: {theme.text_color};
-    }}
+    .stApp {
+        background-color: var(--dashboard-bg-color);
+        color: var(--dashboard-text-color);
+    }
     
     /* Content container padding */
-    .block-container {{
+    .block-container {
         padding-top: 1rem;
         padding-bottom: 1rem;
-    }}
+    }
 
     /* Sidebar Styling */
-    [data-testid="stSidebar"] {{
-        background-color: {theme.sidebar_bg};
-    }}
+    [data-testid="stSidebar"] {
+        background-color: var(--dashboard-sidebar-bg);
+    }
     
     /* Force Text Color in Sidebar */
-    [data-testid="stSidebar"] * {{
-        color: {theme.sidebar_text_color} !important;
-    }}
+    [data-testid="stSidebar"] * {
+        color: var(--dashboard-sidebar-text-color) !important;
+    }
     
-    [data-testid="stSidebar"] label {{
-        color: {theme.sidebar_text_color} !important;
-    }}
+    [data-testid="stSidebar"] label {
+        color: var(--dashboard-sidebar-text-color) !important;
+    }
 
     /* Expanders in Sidebar */
-    [data-testid="stSidebar"] details {{
+    [data-testid="stSidebar"] details {
         background-color: transparent !important;
-        color: {theme.sidebar_text_color} !important;
-        border-color: {theme.border_color};
-    }}
-    [data-testid="stSidebar"] details > summary {{
-        background-color: {theme.sidebar_bg} !important;
-        color: {theme.sidebar_text_color} !important;
-    }}
+        color: var(--dashboard-sidebar-text-color) !important;
+        border-color: var(--dashboard-border-color);
+    }
+    [data-testid="stSidebar"] details > summary {
+        background-color: var(--dashboard-sidebar-bg) !important;
+        color: var(--dashboard-sidebar-text-color) !important;
+    }
     
     /* Sidebar Buttons */
-    [data-testid="stSidebar"] button {{
-        background-color: {theme.bg_color} !important;
-        color: {theme.text_color} !important;
-        border: 1px solid {theme.border_color} !important;
-    }}
-    [data-testid="stSidebar"] button:hover {{
+    [data-testid="stSidebar"] button {
+        background-color: var(--dashboard-bg-color) !important;
+        color: var(--dashboard-text-color) !important;
+        border: 1px solid var(--dashboard-border-color) !important;
+    }
+    [data-testid="stSidebar"] button:hover {
         border-color: #ff4b4b !important;
         color: #ff4b4b !important;
-    }}
+    }
     
     /* Sidebar Dividers */
-    [data-testid="stSidebar"] hr {{
-        border-color: {theme.border_color} !important;
-        background-color: {theme.border_color} !important;
-    }}
+    [data-testid="stSidebar"] hr {
+        border-color: var(--dashboard-border-color) !important;
+        background-color: var(--dashboard-border-color) !important;
+    }
 
     
     /* Headers in Main Area */
-    h1, h2, h3, .chart-header {{
-        color: {theme.header_color} !important;
-    }}
+    h1, h2, h3, .chart-header {
+        color: var(--dashboard-header-color) !important;
+    }
     
-    .chart-header {{
+    .chart-header {
         font-size: 16px; 
         font-weight: bold;
         margin-bottom: 10px;
-    }}
+    }
 
     /* Header transparency */
-    header {{
+    header {
         background-color: transparent !important;
-    }}
+    }
     
     /* Sidebar Toggle Button */
     [data-testid="collapsedControl"],
     [data-testid="stSidebarCollapsedControl"],
-    button[kind="header"] {{
-        background-color: {theme.toggle_bg} !important;
-        border: 1px solid {theme.toggle_border} !important;
-        color: {theme.toggle_icon} !important;
+    button[kind="header"] {
+        background-color: var(--dashboard-toggle-bg) !important;
+        border: 1px solid var(--dashboard-toggle-border) !important;
+        color: var(--dashboard-toggle-icon) !important;
         border-radius: 0.25rem !important;
         padding: 0.25rem !important;
         opacity: 1 !important;
@@ -136,46 +165,113 @@ def _generate_theme_css(theme: "ThemeColors") -> str:
         align-items: center !important;
         justify-content: center !important;
         transition: border-color 0.2s, color 0.2s !important;
-    }}
+    }
     
     [data-testid="collapsedControl"]:hover,
     [data-testid="stSidebarCollapsedControl"]:hover,
-    button[kind="header"]:hover {{
+    button[kind="header"]:hover {
         border-color: #ff4b4b !important;
         color: #ff4b4b !important;
-    }}
+    }
     
     /* Header button icons inherit color */
     [data-testid="collapsedControl"] *,
     [data-testid="stSidebarCollapsedControl"] *,
-    button[kind="header"] * {{
+    button[kind="header"] * {
         color: inherit !important;
         fill: currentColor !important;
         stroke: currentColor !important;
-    }}
+    }
     
     [data-testid="collapsedControl"]:hover *,
     [data-testid="stSidebarCollapsedControl"]:hover *,
-    button[kind="header"]:hover * {{
+    button[kind="header"]:hover * {
         color: inherit !important;
         fill: currentColor !important;
         stroke: currentColor !important;
-    }}
-    
-    {light_toggle_override}
+    }
     
     /* Global override for header icons */
-    header [class*="emotion-cache"] {{
-        color: {theme.toggle_icon} !important;
-    }}
-    header:hover [class*="emotion-cache"] {{
-        color: {theme.toggle_icon} !important;
-    }}
+    header [class*="emotion-cache"] {
+        color: var(--dashboard-toggle-icon) !important;
+    }
+    header:hover [class*="emotion-cache"] {
+        color: var(--dashboard-toggle-icon) !important;
+    }
     
     /* Hide Streamlit branding */
-    #MainMenu {{visibility: hidden;}}
-    footer {{visibility: hidden;}}
-    '''
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    """
+
+
+def _get_chart_css() -> str:
+    """
+    Get rules that color theme-neutral Plotly charts from the custom properties.
+    
+    Scoped to screen media so the print styles keep forcing black text.
+    """
+    return """
+    /* ===== CHART THEME ===== */
+    @media screen {
+        .stPlotlyChart .xtick text,
+        .stPlotlyChart .ytick text,
+        .stPlotlyChart .g-xtitle text,
+        .stPlotlyChart .g-ytitle text,
+        .stPlotlyChart .cbtitle text,
+        .stPlotlyChart text.slicetext {
+            fill: var(--dashboard-text-color) !important;
+        }
+        .stPlotlyChart .gridlayer path,
+        .stPlotlyChart .zerolinelayer path {
+            stroke: var(--dashboard-grid-color) !important;
+        }
+        .stPlotlyChart .layer.land path {
+            fill: var(--dashboard-land-color) !important;
+        }
+        .stPlotlyChart .layer.coastlines path {
+            stroke: var(--dashboard-coastline-color) !important;
+        }
+    }
+    """
+
+
+def _generate_stylesheet(theme: "ThemeColors") -> str:
+    """
+    Generate the full stylesheet for a single, server-selected theme.
+    
+    Args:
+        theme: The theme configuration to apply.
+    """
+    light_toggle_css = _generate_light_toggle_css() if theme.name == "Light" else ""
+    return (
+        f"/* ===== THEME: {theme.name} ===== */\n"
+        f":root {{{_theme_variables(theme)}}}\n"
+        f"{_generate_theme_css()}\n{light_toggle_css}\n{_get_print_css()}"
+    )
+
+
+def _generate_switchable_stylesheet(themes: Tuple["ThemeColors", ...]) -> str:
+    """
+    Generate one stylesheet holding every theme, selected by THEME_ATTRIBUTE.
+    
+    The first theme also applies when the attribute is not set yet.
+    
+    Args:
+        themes: All theme configurations the user can switch between.
+    """
+    variables = [
+        f':root[{THEME_ATTRIBUTE}="{theme.name}"] {{{_theme_variables(theme)}}}'
+        for theme in themes
+    ]
+    variables[0] = f":root, {variables[0]}"
+    light_scope = f':root[{THEME_ATTRIBUTE}="Light"] '
+    return (
+        "/* ===== THEMES: " + ", ".join(theme.name for theme in themes) + " ===== */\n"
+        + "\n".join(variables)
+        + f"\n{_generate_theme_css()}\n{_generate_light_toggle_css(light_scope)}\n"
+        + f"{_get_chart_css()}\n{_get_print_css()}"
+    )
 
 
 def _get_print_css() -> str:
@@ -249,6 +345,46 @@ def _get_print_css() -> str:
     '''
 
 
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_WHITESPACE = re.compile(r"\s+")
+_CSS_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet."""
+    css = _CSS_COMMENT.sub("", css)
+    css = _CSS_WHITESPACE.sub(" ", css)
+    css = _CSS_PUNCTUATION.sub(r"\1", css)
+    css = css.replace(": ", ":").replace(";}", "}")
+    return css.strip()
+
+
+@lru_cache(maxsize=None)
+def compile_stylesheet(theme: "ThemeColors") -> str:
+    """
+    Get the minified <style> block for a theme.
+    
+    Compiled once per ThemeColors instance and cached for the process lifetime.
+    
+    Args:
+        theme: The theme configuration to apply.
+    """
+    return f"<style>{_minify_css(_generate_stylesheet(theme))}</style>"
+
+
+@lru_cache(maxsize=None)
+def compile_switchable_stylesheet(themes: Tuple["ThemeColors", ...]) -> str:
+    """
+    Get the minified <style> block covering every theme.
+    
+    Compiled once per set of themes and cached for the process lifetime.
+    
+    Args:
+        themes: All theme configurations the user can switch between.
+    """
+    return f"<style>{_minify_css(_generate_switchable_stylesheet(themes))}</style>"
+
+
 def inject_styles(theme: "ThemeColors") -> None:
     """
     Inject all CSS styles into the Streamlit app.
@@ -256,8 +392,32 @@ def inject_styles(theme: "ThemeColors") -> None:
     Args:
         theme: The theme configuration to apply.
     """
-    theme_css = _generate_theme_css(theme)
-    print_css = _get_print_css()
+    st.markdown(compile_stylesheet(theme), unsafe_allow_html=True)
+
+
+def inject_switchable_styles(themes: Tuple["ThemeColors", ...]) -> None:
+    """
+    Inject one stylesheet covering every theme, switched client-side.
     
-    full_css = f"<style>{theme_css}\n{print_css}</style>"
-    st.markdown(full_css, unsafe_allow_html=True)
+    Args:
+        themes: All theme configurations the user can switch between.
+    """
+    st.markdown(compile_switchable_stylesheet(themes), unsafe_allow_html=True)
+
+
+def apply_theme_client_side(theme: "ThemeColors") -> None:
+    """
+    Switch the active theme in the browser without restyling on the server.
+    
+    Sets THEME_ATTRIBUTE on the page's root element, which selects the
+    matching custom properties from the switchable stylesheet. st.html runs
+    the script in the page itself rather than in an iframe.
+    
+    Args:
+        theme: The theme to activate.
+    """
+    script = (
+        "<script>document.documentElement"
+        f".setAttribute({json.dumps(THEME_ATTRIBUTE)}, {json.dumps(theme.name)});</script>"
+    )
+    st.html(script, width="content", unsafe_allow_javascript=True)
@@ -61,6 +61,9 @@ LIGHT_THEME = ThemeColors(
     toggle_icon="#31333F",
 )
 
+# All selectable themes; the first one is the default
+THEMES = (DARK_THEME, LIGHT_THEME)
+
 
 def get_theme(theme_name: ThemeType) -> ThemeColors:
     """Get theme configuration by name."""
@@ -0,0 +1,58 @@
+"""
+Tests for folding the tail of chart aggregates into "Other".
+"""
+import pandas as pd
+
+from src.services.aggregation import OTHER_LABEL, TailPolicy, fold_tail
+
+BY_STAGE = pd.DataFrame({"Stage": ["Phase I", "Phase II", "Phase III", "Approved"], "Candidates": [50, 30, 15, 5]})
+
+BY_COUNTRY_STAGE = pd.DataFrame(
+    {
+        "Country": ["USA", "USA", "China", "UK", "UK", "Brazil"],
+        "Stage": ["Phase I", "Phase II", "Phase I", "Phase I", "Phase II", "Phase II"],
+        "Candidates": [10, 5, 8, 2, 1, 3],
+    }
+)
+
+
+def _as_dict(frame: pd.DataFrame, column: str) -> dict:
+    return dict(zip(frame[column], frame["Candidates"]))
+
+
+def test_no_policy_returns_input():
+    assert fold_tail(BY_STAGE, "Stage", TailPolicy()) is BY_STAGE
+    assert fold_tail(BY_STAGE, "Stage", TailPolicy(top_n=4)) is BY_STAGE
+
+
+def test_top_n_keeps_largest_in_order_and_other_last():
+    folded = fold_tail(BY_STAGE, "Stage", TailPolicy(top_n=2))
+    assert list(folded["Stage"]) == ["Phase I", "Phase II", OTHER_LABEL]
+    assert list(folded["Candidates"]) == [50, 30, 20]
+
+
+def test_min_share_folds_small_values():
+    folded = fold_tail(BY_STAGE, "Stage", TailPolicy(min_share=0.1))
+    assert _as_dict(folded, "Stage") == {"Phase I": 50, "Phase II": 30, "Phase III": 15, OTHER_LABEL: 5}
+
+
+def test_total_is_preserved_per_remaining_dimension():
+    # China 8, USA 15, UK 3, Brazil 3: UK and Brazil are folded per stage
+    folded = fold_tail(BY_COUNTRY_STAGE, "Country", TailPolicy(top_n=2))
+    other = folded[folded["Country"] == OTHER_LABEL]
+    assert _as_dict(other, "Stage") == {"Phase I": 2, "Phase II": 4}
+    assert folded["Candidates"].sum() == BY_COUNTRY_STAGE["Candidates"].sum()
+    assert set(folded["Country"]) == {"USA", "China", OTHER_LABEL}
+
+
+def test_real_other_value_absorbs_the_tail():
+    totals = pd.DataFrame({"Stage": [OTHER_LABEL, "Phase I", "Phase II"], "Candidates": [40, 30, 5]})
+    folded = fold_tail(totals, "Stage", TailPolicy(top_n=2))
+    assert _as_dict(folded, "Stage") == {OTHER_LABEL: 45, "Phase I": 30}
+
+
+def test_categorical_column_is_returned_as_strings():
+    totals = BY_STAGE.astype({"Stage": "category"})
+    folded = fold_tail(totals, "Stage", TailPolicy(top_n=1))
+    assert list(folded["Stage"]) == ["Phase I", OTHER_LABEL]
+    assert not isinstance(folded["Stage"].dtype, pd.CategoricalDtype)
@@ -0,0 +1,27 @@
+"""
+Tests for the chart figures built from the dashboard aggregates.
+"""
+import pandas as pd
+
+from src.services.aggregation import OTHER_LABEL, TailPolicy, fold_tail
+from src.ui.components import _build_map_figure, _get_chart_config
+
+CODES = {"USA": "USA", "China": "CHN", "UK": "GBR"}
+BY_COUNTRY = pd.DataFrame({"Country": ["USA", "China", "UK", OTHER_LABEL], "Candidates": [10, 8, 3, 4]})
+
+
+def _notes(fig) -> str:
+    return "<br>".join(annotation.text for annotation in fig.layout.annotations)
+
+
+def test_real_other_country_is_not_a_folded_tail():
+    fig = _build_map_figure(BY_COUNTRY, _get_chart_config("Dark"), CODES)
+    assert "smaller countries" not in _notes(fig)
+    assert "4 candidates in countries that could not be placed" in _notes(fig)
+
+
+def test_folded_tail_is_noted():
+    folded = fold_tail(BY_COUNTRY, "Country", TailPolicy(top_n=2))
+    fig = _build_map_figure(folded, _get_chart_config("Dark"), CODES, tail_folded=True)
+    assert _notes(fig) == f"{OTHER_LABEL}: 7 candidates in smaller countries"
+    assert list(fig.data[0].locations) == ["USA", "CHN"]
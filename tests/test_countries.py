@@ -0,0 +1,49 @@
+"""
+Tests for resolving dataset Country values to ISO-3 codes.
+"""
+import pandas as pd
+import pytest
+
+from src.services.countries import ISO3_COUNTRIES, CountryIndex, iso3_code
+
+
+@pytest.mark.parametrize(
+    "name, code",
+    [
+        ("United States", "USA"),
+        ("USA", "USA"),
+        ("U.S.", "USA"),
+        ("the united kingdom", "GBR"),
+        ("UK", "GBR"),
+        ("Cote d'Ivoire", "CIV"),
+        ("Ivory Coast", "CIV"),
+        ("Korea, Republic of", "KOR"),
+        ("Trinidad & Tobago", "TTO"),
+        ("deu", "DEU"),
+    ],
+)
+def test_names_aliases_and_codes_resolve(name, code):
+    assert iso3_code(name) == code
+
+
+def test_every_iso_name_resolves_to_its_code():
+    assert all(iso3_code(name) == code for name, code in ISO3_COUNTRIES)
+
+
+def test_index_splits_matched_and_unmatched_values():
+    index = CountryIndex.from_values(["USA", "United States", "Atlantis", "Global", "UK"])
+    assert index.codes == {"USA": "USA", "United States": "USA", "UK": "GBR"}
+    assert index.unmatched == ("Atlantis", "Global")
+
+
+def test_index_from_frame_uses_categories():
+    df = pd.DataFrame({"Country": pd.Categorical(["Brazil", "Brazil", "Japan"], categories=["Brazil", "Japan", "Mars"])})
+    index = CountryIndex.from_frame(df)
+    assert index.codes == {"Brazil": "BRA", "Japan": "JPN"}
+    assert index.unmatched == ("Mars",)
+
+
+def test_index_from_frame_with_strings():
+    index = CountryIndex.from_frame(pd.DataFrame({"Country": ["China", "China", "Nowhere"]}))
+    assert index.codes == {"China": "CHN"}
+    assert index.unmatched == ("Nowhere",)
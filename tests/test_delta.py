@@ -0,0 +1,96 @@
+"""
+Tests for merging incremental changes into a loaded dataset.
+Every merge is checked against normalizing and rolling up the changed rows from scratch.
+"""
+import pandas as pd
+import pytest
+
+from src.services.base_data import DIMENSIONS, MEASURE, DataDelta
+from src.services.delta import merge_delta
+from src.services.normalize import normalize_vaccine_data
+from src.services.rollup import RollupCube
+
+ROWS = pd.DataFrame(
+    {
+        "Country": ["USA", "China", "UK", "USA", "Brazil"],
+        "Approach": ["mRNA", "Inactivated", "Viral Vector", "DNA", "Inactivated"],
+        "Stage": ["Phase III", "Phase III", "Phase II", "Pre-clinical", "Phase I"],
+        "Candidates": [5, 3, 2, 10, 1],
+    },
+    index=pd.Index([1, 2, 3, 4, 5], name="id"),
+)
+
+
+def _apply(rows: pd.DataFrame, upserts: pd.DataFrame, deleted_ids: list) -> pd.DataFrame:
+    """The raw rows a full reload would return after the changes."""
+    kept = rows.drop(index=deleted_ids + list(upserts.index), errors="ignore")
+    return pd.concat([kept, upserts]).sort_index()
+
+
+def _cells(cube: RollupCube) -> pd.DataFrame:
+    """Cube cells as plain values, in a stable order."""
+    cells = cube.cells.astype({dim: str for dim in DIMENSIONS}).astype({MEASURE: "int64"})
+    return cells.sort_values(list(DIMENSIONS)).reset_index(drop=True)
+
+
+def _assert_matches_rebuild(upserts: pd.DataFrame, deleted_ids: list) -> pd.DataFrame:
+    data, _ = normalize_vaccine_data(ROWS)
+    normalized_upserts, _ = normalize_vaccine_data(upserts)
+    merged, cube = merge_delta(
+        data, RollupCube.from_frame(data), DataDelta(normalized_upserts, pd.Index(deleted_ids)),
+    )
+
+    rebuilt, _ = normalize_vaccine_data(_apply(ROWS, upserts, deleted_ids))
+    pd.testing.assert_frame_equal(merged.sort_index(), rebuilt, check_dtype=False, check_names=False)
+    for dim in DIMENSIONS:
+        assert list(merged[dim].cat.categories) == list(rebuilt[dim].cat.categories)
+    pd.testing.assert_frame_equal(_cells(cube), _cells(RollupCube.from_frame(rebuilt)))
+    return merged
+
+
+def _upserts(rows: list) -> pd.DataFrame:
+    return pd.DataFrame(
+        [values for _, values in rows], columns=list(ROWS.columns), index=pd.Index([row_id for row_id, _ in rows]),
+    )
+
+
+def test_deletes_only():
+    _assert_matches_rebuild(_upserts([]).astype(ROWS.dtypes), [2, 4])
+
+
+def test_update_and_insert():
+    _assert_matches_rebuild(
+        _upserts([(1, ("USA", "mRNA", "Phase III", 7)), (6, ("UK", "mRNA", "Phase I", 4))]), [],
+    )
+
+
+def test_new_categories_are_added():
+    merged = _assert_matches_rebuild(_upserts([(6, ("India", "Live Attenuated", "Approved", 2))]), [])
+    assert "India" in merged["Country"].cat.categories
+    assert "Approved" in merged["Stage"].cat.categories
+
+
+def test_removed_categories_are_dropped():
+    # Brazil's only row is deleted and the UK row moves to another country
+    merged = _assert_matches_rebuild(_upserts([(3, ("China", "Viral Vector", "Phase II", 2))]), [5])
+    assert "Brazil" not in merged["Country"].cat.categories
+    assert "UK" not in merged["Country"].cat.categories
+
+
+def test_counts_outgrowing_the_downcast_dtype():
+    data, _ = normalize_vaccine_data(ROWS)
+    assert data[MEASURE].dtype == "int8"
+    merged = _assert_matches_rebuild(_upserts([(2, ("China", "Inactivated", "Phase III", 40_000))]), [])
+    assert merged.loc[2, MEASURE] == 40_000
+
+
+@pytest.mark.parametrize("deleted_ids", [[1], [1, 99]])
+def test_repeated_changes_are_idempotent(deleted_ids):
+    data, _ = normalize_vaccine_data(ROWS)
+    upserts, _ = normalize_vaccine_data(_upserts([(3, ("UK", "Viral Vector", "Phase III", 2))]))
+    delta = DataDelta(upserts, pd.Index(deleted_ids))
+
+    once = merge_delta(data, RollupCube.from_frame(data), delta)
+    twice = merge_delta(*once, delta)
+    pd.testing.assert_frame_equal(twice[0].sort_index(), once[0].sort_index())
+    pd.testing.assert_frame_equal(_cells(twice[1]), _cells(once[1]))
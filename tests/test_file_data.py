@@ -0,0 +1,102 @@
+"""
+Tests for reading the dataset from Parquet, Arrow and CSV files.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from src.services.dataset_cache import DatasetCache
+from src.services.file_data import FileDataProvider
+from src.services.normalize import SchemaError
+
+ROWS = pd.DataFrame(
+    {
+        "Country": ["USA", "China", "UK"],
+        "Approach": ["mRNA", "Inactivated", "Viral Vector"],
+        "Stage": ["Phase III", "Phase I", "Phase II"],
+        "Candidates": [3, 1, 2],
+    }
+)
+# File column names as the fields of VaccineCandidate, in mixed case, plus an extra column
+FIELD_NAMED = ROWS.rename(
+    columns={"Country": "COUNTRY", "Approach": "approach", "Stage": "Stage", "Candidates": "candidate_count"},
+).assign(notes=["a", "b", "c"])
+
+
+def _write(frame: pd.DataFrame, path) -> str:
+    path = str(path)
+    if path.endswith(".csv"):
+        frame.to_csv(path, index=False)
+    elif path.endswith(".parquet"):
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_feather(path)
+    return path
+
+
+@pytest.mark.parametrize("name", ["data.csv", "data.parquet", "data.arrow"])
+def test_columns_are_mapped_to_dataset_names(tmp_path, name):
+    provider = FileDataProvider(_write(FIELD_NAMED, tmp_path / name))
+    data = provider.get_vaccine_data()
+    assert list(data.columns) == list(ROWS.columns)
+    pd.testing.assert_frame_equal(data, ROWS, check_dtype=False)
+
+
+@pytest.mark.parametrize("name", ["data.csv", "data.parquet"])
+def test_small_chunks_are_streamed(tmp_path, name):
+    provider = FileDataProvider(_write(ROWS, tmp_path / name), chunk_size=1)
+    chunks = list(provider.iter_vaccine_data())
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), ROWS, check_dtype=False)
+
+
+@pytest.mark.parametrize("name", ["data.csv", "data.parquet"])
+def test_missing_column_raises_schema_error(tmp_path, name):
+    provider = FileDataProvider(_write(ROWS.drop(columns="Stage"), tmp_path / name))
+    with pytest.raises(SchemaError, match="Missing column"):
+        provider.get_vaccine_data()
+
+
+@pytest.mark.parametrize("name", ["data.csv", "data.parquet"])
+def test_duplicate_mapping_raises_schema_error(tmp_path, name):
+    provider = FileDataProvider(_write(ROWS.assign(stage=ROWS["Stage"]), tmp_path / name))
+    with pytest.raises(SchemaError, match="both map to 'Stage'"):
+        provider.get_vaccine_data()
+
+
+def test_file_without_rows_yields_empty_frame(tmp_path):
+    provider = FileDataProvider(_write(ROWS.iloc[:0], tmp_path / "data.parquet"))
+    data = provider.get_vaccine_data()
+    assert data.empty
+    assert list(data.columns) == list(ROWS.columns)
+
+
+def test_unsupported_extension_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        FileDataProvider(str(tmp_path / "data.xlsx"))
+
+
+def test_missing_file_raises_runtime_error(tmp_path):
+    provider = FileDataProvider(str(tmp_path / "absent.csv"))
+    with pytest.raises(RuntimeError):
+        provider.get_watermark()
+    with pytest.raises(RuntimeError):
+        provider.get_vaccine_data()
+
+
+def test_unchanged_file_keeps_the_snapshot(tmp_path):
+    path = _write(ROWS, tmp_path / "data.csv")
+    cache = DatasetCache(lambda: FileDataProvider(path), ttl_seconds=0)
+
+    first = cache.get()
+    second = cache.refresh()
+    assert second.version == first.version
+    assert second.data is first.data
+    assert cache.stats().unchanged_refreshes == 1
+
+    # A new drop changes the watermark and is reloaded
+    _write(pd.concat([ROWS, ROWS], ignore_index=True), path)
+    os.utime(path, ns=(first.watermark[0] + 1, first.watermark[0] + 1))
+    third = cache.refresh()
+    assert third.version == first.version + 1
+    assert len(third.data) == 6
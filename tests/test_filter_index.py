@@ -0,0 +1,73 @@
+"""
+Tests for the bitmap filter index against the isin-based filter_frame.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services.aggregation import filter_frame
+from src.services.base_data import DIMENSIONS
+from src.services.filter_index import BitmapIndex
+from src.services.mock_data import MockDataProvider
+from src.services.normalize import normalize_vaccine_data
+
+
+@pytest.fixture(scope="module", params=["mock", "odd-sized"])
+def dataset(request):
+    if request.param == "mock":
+        data, _ = normalize_vaccine_data(MockDataProvider().get_vaccine_data())
+        return data
+    # A row count that is not a multiple of 8 exercises the packed tail
+    rng = np.random.default_rng(7)
+    raw = pd.DataFrame(
+        {
+            "Country": rng.choice([f"Country {i}" for i in range(13)], 1001),
+            "Approach": rng.choice(["mRNA", "DNA", "Inactivated", "Viral Vector"], 1001),
+            "Stage": rng.choice(["Phase I", "Phase II", "Phase III"], 1001),
+            "Candidates": rng.integers(0, 50, 1001),
+        }
+    )
+    data, _ = normalize_vaccine_data(raw)
+    return data
+
+
+def _expected(data: pd.DataFrame, filters) -> np.ndarray:
+    return data.index.isin(filter_frame(data, filters).index)
+
+
+def _random_filters(data: pd.DataFrame, rng: np.random.Generator) -> dict:
+    filters = {}
+    for dim in rng.permutation(DIMENSIONS)[: rng.integers(1, len(DIMENSIONS) + 1)]:
+        values = list(data[dim].cat.categories)
+        # Anything from no values to all of them, sometimes with an unknown one
+        chosen = list(rng.choice(values, rng.integers(0, len(values) + 1), replace=False))
+        if rng.random() < 0.2:
+            chosen.append("Unknown")
+        filters[str(dim)] = chosen
+    return filters
+
+
+def test_random_selections_match_filter_frame(dataset):
+    index = BitmapIndex(dataset)
+    rng = np.random.default_rng(42)
+    for _ in range(200):
+        filters = _random_filters(dataset, rng)
+        np.testing.assert_array_equal(index.mask(filters), _expected(dataset, filters), err_msg=str(filters))
+
+
+def test_full_and_empty_selections(dataset):
+    index = BitmapIndex(dataset)
+    full = {dim: list(dataset[dim].cat.categories) for dim in DIMENSIONS}
+    assert index.mask(full).all()
+    assert index.mask(None).all() and len(index.mask({})) == len(dataset)
+
+    for dim in DIMENSIONS:
+        assert not index.mask({**full, dim: []}).any()
+        assert not index.mask({dim: ["Unknown"]}).any()
+
+
+def test_apply_matches_filter_frame(dataset):
+    index = BitmapIndex(dataset)
+    filters = {"Stage": list(dataset["Stage"].cat.categories[:1])}
+    pd.testing.assert_frame_equal(index.apply(dataset, filters), filter_frame(dataset, filters))
+    assert index.apply(dataset, None) is dataset
@@ -0,0 +1,89 @@
+"""
+Tests for validating provider output and converting it to compact dtypes.
+"""
+import re
+
+import pandas as pd
+import pytest
+
+from src.services.normalize import SchemaError, normalize_vaccine_chunks, normalize_vaccine_data
+
+RAW = pd.DataFrame(
+    {
+        "Country": ["USA", "China", "USA", "Brazil"],
+        "Approach": ["mRNA", "Inactivated", "mRNA", "Viral Vector"],
+        "Stage": ["Phase III", "Phase I", "Phase II", "Phase III"],
+        "Candidates": [3, 1, 2, 5],
+        "Sponsor": ["a", "b", "c", "d"],
+    }
+)
+
+
+def test_dimensions_become_ordered_sorted_categories():
+    normalized, _ = normalize_vaccine_data(RAW)
+    assert list(normalized.columns) == ["Country", "Approach", "Stage", "Candidates"]
+    for column in ("Country", "Approach", "Stage"):
+        dtype = normalized[column].dtype
+        assert isinstance(dtype, pd.CategoricalDtype) and dtype.ordered
+        assert list(dtype.categories) == sorted(RAW[column].unique())
+        assert list(normalized[column].astype(str)) == list(RAW[column])
+
+
+def test_counts_use_the_smallest_integer_dtype():
+    normalized, _ = normalize_vaccine_data(RAW)
+    assert normalized["Candidates"].dtype == "int8"
+    assert list(normalized["Candidates"]) == [3, 1, 2, 5]
+
+    large, _ = normalize_vaccine_data(RAW.assign(Candidates=[3, 1, 2, 70_000]))
+    assert large["Candidates"].dtype == "int32"
+
+
+def test_report_measures_the_saving():
+    _, report = normalize_vaccine_data(pd.concat([RAW] * 1000, ignore_index=True))
+    assert report.rows == 4000
+    assert report.bytes_after < report.bytes_before / 4
+
+
+def test_whole_float_and_string_counts_are_accepted():
+    normalized, _ = normalize_vaccine_data(RAW.assign(Candidates=["3", "1", 2.0, 5]))
+    assert list(normalized["Candidates"]) == [3, 1, 2, 5]
+
+
+def test_categorical_input_drops_unused_categories():
+    country = pd.Categorical(["USA", "China", "USA", "Brazil"], categories=["USA", "Mars", "China", "Brazil"])
+    normalized, _ = normalize_vaccine_data(RAW.assign(Country=country))
+    assert list(normalized["Country"].cat.categories) == ["Brazil", "China", "USA"]
+    assert list(normalized["Country"].astype(str)) == list(RAW["Country"])
+
+
+def test_index_is_kept():
+    normalized, _ = normalize_vaccine_data(RAW.set_axis([10, 11, 12, 13]))
+    assert list(normalized.index) == [10, 11, 12, 13]
+
+
+def test_chunks_share_aligned_categories():
+    normalized, report = normalize_vaccine_chunks([RAW.iloc[:2], RAW.iloc[2:]])
+    expected, _ = normalize_vaccine_data(RAW)
+    pd.testing.assert_frame_equal(normalized, expected)
+    assert report.rows == 4
+
+
+@pytest.mark.parametrize(
+    "raw, message",
+    [
+        (RAW.drop(columns=["Stage", "Candidates"]), "Missing column(s): Stage, Candidates"),
+        (RAW.assign(Country=["USA", None, "USA", "Brazil"]), "'Country' contains missing values"),
+        (RAW.assign(Candidates=[3, None, 2, 5]), "'Candidates' must contain whole numbers only"),
+        (RAW.assign(Candidates=[3, "many", 2, 5]), "'Candidates' must contain whole numbers only"),
+        (RAW.assign(Candidates=[3, 1.5, 2, 5]), "'Candidates' must contain whole numbers only"),
+        (RAW.assign(Candidates=[3, -1, 2, 5]), "'Candidates' contains negative counts"),
+    ],
+)
+def test_invalid_frames_raise_schema_error(raw, message):
+    with pytest.raises(SchemaError, match=re.escape(message)):
+        normalize_vaccine_data(raw)
+
+
+def test_no_chunks_raise_schema_error():
+    with pytest.raises(SchemaError):
+        normalize_vaccine_chunks([])
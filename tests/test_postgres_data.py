@@ -0,0 +1,60 @@
+"""
+Tests for the aggregates pushed down to SQL by the PostgreSQL provider.
+The generated queries run on SQLite and must match the in-memory aggregates.
+"""
+from contextlib import contextmanager
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from src.services import postgres_data
+from src.services.mock_data import MockDataProvider
+from src.services.postgres_data import COLUMN_MAP, PostgresDataProvider, build_aggregate_query
+
+CASES = [
+    ([], None),
+    (["Stage"], None),
+    (["Country", "Stage"], None),
+    (["Approach"], {"Country": ["USA", "China"]}),
+    (["Country"], {"Stage": ["Phase III"], "Approach": ["mRNA", "Inactivated", "DNA"]}),
+    (["Stage"], {"Country": []}),
+]
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """A Postgres provider whose connections go to SQLite holding the mock rows."""
+    engine = create_engine("sqlite://")
+    MockDataProvider().get_vaccine_data().rename(columns=COLUMN_MAP).to_sql(
+        "vaccine_candidates", engine, index=False,
+    )
+
+    @contextmanager
+    def connection():
+        with engine.connect() as conn:
+            yield conn
+
+    monkeypatch.setattr(postgres_data, "get_engine", lambda: engine)
+    monkeypatch.setattr(postgres_data, "connection", connection)
+    return PostgresDataProvider()
+
+
+@pytest.mark.parametrize("group_by, filters", CASES)
+def test_pushdown_matches_in_memory_aggregates(provider, group_by, filters):
+    expected = MockDataProvider().get_aggregated_data(group_by, filters).reset_index(drop=True)
+    actual = provider.get_aggregated_data(group_by, filters)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_values_are_bound_not_interpolated():
+    query = build_aggregate_query(["Stage"], {"Country": ["USA'; DROP TABLE vaccine_candidates; --"]})
+    assert "DROP" not in query.text
+    assert "country IN :f0" in query.text
+
+
+def test_unknown_dimensions_are_rejected():
+    with pytest.raises(ValueError):
+        build_aggregate_query(["candidate_count"])
+    with pytest.raises(ValueError):
+        build_aggregate_query(["Stage"], {"1=1 OR country": ["USA"]})
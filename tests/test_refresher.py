@@ -0,0 +1,91 @@
+"""
+Tests for the circuit breaker guarding background reloads and the refresher.
+"""
+import pytest
+
+from src.services import refresher
+from src.services.dataset_cache import DatasetCache
+from src.services.mock_data import MockDataProvider
+from src.services.refresher import BackgroundRefresher, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the breaker's monotonic clock with one the test advances."""
+    now = {"value": 1000.0}
+    monkeypatch.setattr(refresher.time, "monotonic", lambda: now["value"])
+    return now
+
+
+def _breaker() -> CircuitBreaker:
+    return CircuitBreaker(failure_threshold=3, retry_base_seconds=5, retry_max_seconds=30)
+
+
+def test_opens_after_threshold_failures(clock):
+    breaker = _breaker()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_half_open_after_retry_delay(clock):
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock["value"] += 4.9
+    assert breaker.state == "open"
+    clock["value"] += 0.1
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+
+
+def test_failed_trial_doubles_delay_up_to_max(clock):
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    delays = [breaker.retry_delay()]
+    for _ in range(4):
+        clock["value"] += breaker.retry_delay()
+        assert breaker.state == "half-open"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        delays.append(breaker.retry_delay())
+    assert delays == [5, 10, 20, 30, 30]
+
+
+def test_success_closes_and_resets(clock):
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock["value"] += breaker.retry_delay()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_threshold_is_at_least_one(clock):
+    breaker = CircuitBreaker(failure_threshold=0, retry_base_seconds=1, retry_max_seconds=1)
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_fresh_snapshot_is_not_reloaded_when_stale_only():
+    cache = DatasetCache(MockDataProvider, ttl_seconds=1e9)
+    loaded = cache.get()
+    background = BackgroundRefresher(cache, interval_seconds=60, breaker=_breaker())
+
+    assert background.refresh_once(if_stale=True)
+    assert cache.snapshot is loaded
+    assert background.status().last_success_at is not None
+
+    assert background.refresh_once()
+    assert cache.snapshot.version == loaded.version + 1
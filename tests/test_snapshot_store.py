@@ -0,0 +1,101 @@
+"""
+Tests for the on-disk Arrow snapshot of the dataset and restoring from it.
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.services.dataset_cache import DatasetCache
+from src.services.mock_data import MockDataProvider
+from src.services.normalize import normalize_vaccine_data
+from src.services.rollup import RollupCube
+from src.services.snapshot_store import SnapshotStore
+
+WATERMARK = (datetime(2026, 1, 2, 3, 4, 5), None)
+
+
+@pytest.fixture
+def dataset():
+    data, _ = normalize_vaccine_data(MockDataProvider().get_vaccine_data())
+    return data, RollupCube.from_frame(data)
+
+
+def _save(store: SnapshotStore, dataset, version: int = 3) -> None:
+    data, cube = dataset
+    store.save(data, cube.cells, version=version, loaded_at=1234.5, watermark=WATERMARK)
+
+
+def test_round_trip(tmp_path, dataset):
+    store = SnapshotStore(str(tmp_path), "MOCK", "MOCK|0")
+    _save(store, dataset)
+
+    stored = store.load()
+    data, cube = dataset
+    pd.testing.assert_frame_equal(stored.data, data)
+    pd.testing.assert_frame_equal(stored.cube_cells, cube.cells)
+    assert (stored.version, stored.loaded_at, stored.watermark) == (3, 1234.5, WATERMARK)
+
+
+def test_restored_frame_is_usable(tmp_path, dataset):
+    store = SnapshotStore(str(tmp_path), "MOCK")
+    _save(store, dataset)
+    stored = SnapshotStore(str(tmp_path), "MOCK").load()
+
+    # Columns are read-only views of the mapped file, but derived frames are not
+    cube = RollupCube.from_frame(stored.data)
+    assert cube.total == int(dataset[0]["Candidates"].sum())
+    assert not stored.data["Candidates"].to_numpy().flags.writeable
+
+
+def test_missing_snapshot(tmp_path):
+    assert SnapshotStore(str(tmp_path / "absent"), "MOCK").load() is None
+
+
+def test_other_source_is_ignored(tmp_path, dataset):
+    _save(SnapshotStore(str(tmp_path), "MOCK", "MOCK|1000"), dataset)
+    assert SnapshotStore(str(tmp_path), "MOCK", "MOCK|2000").load() is None
+
+
+def test_other_format_is_ignored(tmp_path, dataset, monkeypatch):
+    from src.services import snapshot_store
+
+    monkeypatch.setattr(snapshot_store, "SNAPSHOT_FORMAT", 0)
+    _save(SnapshotStore(str(tmp_path), "MOCK"), dataset)
+    monkeypatch.undo()
+    assert SnapshotStore(str(tmp_path), "MOCK").load() is None
+
+
+def test_corrupt_file_is_ignored(tmp_path, dataset):
+    store = SnapshotStore(str(tmp_path), "MOCK")
+    _save(store, dataset)
+    with open(store.path, "r+b") as f:
+        f.truncate(100)
+    assert store.load() is None
+
+
+def test_cube_of_another_save_is_dropped(tmp_path, dataset):
+    store = SnapshotStore(str(tmp_path), "MOCK")
+    _save(store, dataset, version=1)
+    with open(store.cube_path, "rb") as f:
+        older_cube = f.read()
+    _save(store, dataset, version=2)
+    with open(store.cube_path, "wb") as f:
+        f.write(older_cube)
+
+    stored = store.load()
+    assert stored.version == 2
+    assert stored.cube_cells is None
+
+
+def test_restored_snapshot_is_revalidated_on_first_get(tmp_path, dataset):
+    store = SnapshotStore(str(tmp_path), "MOCK")
+    _save(store, dataset, version=7)
+    cache = DatasetCache(MockDataProvider, ttl_seconds=1e9, store=store)
+
+    restored = cache.restore()
+    assert restored.restored
+    snapshot = cache.get()
+    assert not snapshot.restored
+    assert snapshot.version == 8
+    assert cache.stats().misses == 1